@@ -6,7 +6,7 @@ import argparse
 import sys
 from pathlib import Path
 
-from src.preprocessing.deduplicate import deduplicate_frames
+from src.preprocessing.deduplicate import MATERIALIZE_MODES, SELECT_MODES, deduplicate_frames
 
 
 def main() -> int:
@@ -21,6 +21,27 @@ def main() -> int:
         default=8,
         help="Hash distance threshold (default: 8)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Threads used to decode frames for hashing (default: CPU count)",
+    )
+    parser.add_argument(
+        "--materialize",
+        choices=MATERIALIZE_MODES,
+        default="encode",
+        help=(
+            "How unique pages are stored: encode (re-encode PNG), copy, hardlink, reflink, "
+            "or manifest (pages.json only) (default: encode)"
+        ),
+    )
+    parser.add_argument(
+        "--select",
+        choices=SELECT_MODES,
+        default="sharpest",
+        help="Frame kept from each run of duplicates: first or sharpest (default: sharpest)",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -33,6 +54,11 @@ def main() -> int:
         print("Error: --limit must be a positive integer", file=sys.stderr)
         return 1
 
+    # Validate --workers
+    if args.workers is not None and args.workers <= 0:
+        print("Error: --workers must be a positive integer", file=sys.stderr)
+        return 1
+
     # Validate input
     input_path = Path(args.input_dir)
     if not input_path.exists():
@@ -50,7 +76,15 @@ def main() -> int:
 
     # Call existing function
     try:
-        deduplicate_frames(args.input_dir, args.output, args.threshold, limit=args.limit)
+        deduplicate_frames(
+            args.input_dir,
+            args.output,
+            args.threshold,
+            limit=args.limit,
+            workers=args.workers,
+            materialize=args.materialize,
+            select=args.select,
+        )
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,98 @@
+"""Estimate global trim values from a sample of pages.
+
+Prints the proposed global_trim_* values with a confidence score, or
+writes them into config.yaml with --write-config.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from src.preprocessing.pages import list_pages
+from src.preprocessing.trim_estimate import SIDES, TRIM_SAMPLES, estimate_trim
+
+
+def write_config(config_path: str | Path, values: dict[str, float]) -> None:
+    """Replace values in config.yaml, keeping alignment and comments.
+
+    Args:
+        config_path: Path to config.yaml.
+        values: Mapping of top-level key to new value.
+
+    Raises:
+        KeyError: If a key is not present in the config file.
+    """
+    path = Path(config_path)
+    text = path.read_text(encoding="utf-8")
+    for key, value in values.items():
+        pattern = re.compile(rf"^({re.escape(key)}:[ \t]*)(\S+)([ \t]*)(#.*)?$", re.MULTILINE)
+        match = pattern.search(text)
+        if match is None:
+            raise KeyError(f"{key} not found in {config_path}")
+        prefix, old, spacing, comment = match.groups()
+        new = str(value)
+        if comment:
+            # Keep the comment column when the value width changes
+            new += " " * max(1, len(old) + len(spacing) - len(new)) + comment
+        text = text[: match.start()] + prefix + new + text[match.end() :]
+    path.write_text(text, encoding="utf-8")
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Estimate global trim values from sampled pages")
+    parser.add_argument("input_dir", help="Directory with page or frame images")
+    parser.add_argument(
+        "-k",
+        "--samples",
+        type=int,
+        default=TRIM_SAMPLES,
+        help=f"Number of pages to sample (default: {TRIM_SAMPLES})",
+    )
+    parser.add_argument(
+        "--write-config",
+        metavar="CONFIG",
+        help="Write the proposed values into this config.yaml",
+    )
+    args = parser.parse_args()
+
+    if args.samples <= 0:
+        print("Error: --samples must be a positive integer", file=sys.stderr)
+        return 1
+
+    input_path = Path(args.input_dir)
+    if not input_path.is_dir():
+        print(f"Error: Input directory not found: {args.input_dir}", file=sys.stderr)
+        return 1
+
+    pages = list_pages(input_path)
+    if not pages:
+        print(f"Error: No images found in: {args.input_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        estimate = estimate_trim(pages, samples=args.samples)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Sampled {estimate.pages} pages, confidence {estimate.confidence:.2f}")
+    for side in SIDES:
+        key = f"global_trim_{side}"
+        print(f"{key + ':':<20} {getattr(estimate, side):.3f}  (agreement {estimate.side_confidence[side]:.2f})")
+
+    if args.write_config:
+        try:
+            write_config(args.write_config, estimate.config_values())
+        except (OSError, KeyError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote global trim values to {args.write_config}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ import sys
 from pathlib import Path
 
 from src.preprocessing.frames import extract_frames
+from src.preprocessing.scene import extract_scene_frames
+from src.preprocessing.stream import stream_unique_pages
 
 
 def main() -> int:
@@ -21,8 +23,63 @@ def main() -> int:
         default=1.5,
         help="Frame extraction interval in seconds (default: 1.5)",
     )
+    parser.add_argument(
+        "--mode",
+        choices=["interval", "scene"],
+        default="interval",
+        help="Sampling mode: fixed 'interval' or 'scene' (emit once the image settles after a change)",
+    )
+    parser.add_argument(
+        "--sample-fps",
+        type=float,
+        default=4.0,
+        help="Decode rate for change detection in scene mode (default: 4.0)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel FFmpeg processes over time segments, interval mode only (default: 1)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream frames through a pipe and write only unique pages to OUTPUT (skips deduplicate)",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=int,
+        default=8,
+        help="Hash distance threshold for --stream (default: 8)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Process only first N frames with --stream (for testing)",
+    )
     args = parser.parse_args()
 
+    # Validate --workers
+    if args.workers <= 0:
+        print("Error: --workers must be a positive integer", file=sys.stderr)
+        return 1
+
+    if args.workers > 1 and (args.stream or args.mode == "scene"):
+        print("Error: --workers cannot be combined with --stream or --mode scene", file=sys.stderr)
+        return 1
+
+    # Validate --sample-fps
+    if args.sample_fps <= 0:
+        print("Error: --sample-fps must be positive", file=sys.stderr)
+        return 1
+
+    # Validate --limit
+    if args.limit is not None and args.limit <= 0:
+        print("Error: --limit must be a positive integer", file=sys.stderr)
+        return 1
+
     # Validate input
     if not Path(args.video).exists():
         print(f"Error: Input not found: {args.video}", file=sys.stderr)
@@ -30,7 +87,12 @@ def main() -> int:
 
     # Call existing function
     try:
-        extract_frames(args.video, args.output, args.interval)
+        if args.stream:
+            stream_unique_pages(args.video, args.output, args.interval, args.threshold, limit=args.limit)
+        elif args.mode == "scene":
+            extract_scene_frames(args.video, args.output, args.sample_fps)
+        else:
+            extract_frames(args.video, args.output, args.interval, workers=args.workers)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,50 @@
+"""CLI wrapper for the OCR daemon.
+
+Loads the OCR engines once and serves run-ocr requests over a Unix socket
+until interrupted. run_ocr uses the daemon automatically while it is running.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from src.rover.engines.daemon import DEFAULT_SOCKET, OCRDaemonClient, serve
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Serve OCR engines from a long-lived daemon")
+    parser.add_argument(
+        "--socket",
+        default=str(DEFAULT_SOCKET),
+        help=f"Unix socket path (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--engines",
+        default="yomitoku,paddleocr,easyocr",
+        help="Comma-separated engines to preload (default: yomitoku,paddleocr,easyocr)",
+    )
+    parser.add_argument(
+        "--device",
+        choices=["cpu", "cuda"],
+        default="cpu",
+        help="Device to use (default: cpu)",
+    )
+    args = parser.parse_args()
+
+    if OCRDaemonClient(args.socket).ping():
+        print(f"Error: An OCR daemon is already running on {args.socket}", file=sys.stderr)
+        return 1
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    try:
+        serve(args.socket, engines, device=args.device)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
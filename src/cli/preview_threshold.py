@@ -0,0 +1,73 @@
+"""Preview how many pages each deduplication threshold would keep.
+
+Uses the persistent frame-hash index, so after the first run no frame
+images are decoded and candidate thresholds can be compared instantly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.preprocessing.hash_index import preview_thresholds
+
+
+def parse_thresholds(value: str) -> list[int]:
+    """Parse a comma-separated list of thresholds (e.g. "4,6,8,10")."""
+    try:
+        thresholds = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid threshold list: {value}") from e
+    if not thresholds or any(t <= 0 for t in thresholds):
+        raise argparse.ArgumentTypeError("thresholds must be positive integers")
+    return thresholds
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Preview kept page counts per dedup threshold")
+    parser.add_argument("input_dir", help="Input directory with frames")
+    parser.add_argument(
+        "-t",
+        "--thresholds",
+        type=parse_thresholds,
+        default=[4, 6, 8, 10, 12, 16],
+        help="Comma-separated candidate thresholds (default: 4,6,8,10,12,16)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Consider only first N files (for testing)",
+    )
+    args = parser.parse_args()
+
+    # Validate --limit
+    if args.limit is not None and args.limit <= 0:
+        print("Error: --limit must be a positive integer", file=sys.stderr)
+        return 1
+
+    # Validate input
+    input_path = Path(args.input_dir)
+    if not input_path.is_dir():
+        print(f"Error: Input directory not found: {args.input_dir}", file=sys.stderr)
+        return 1
+
+    if not list(input_path.glob("frame_*.png")):
+        print(f"Error: No frames found in: {args.input_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        counts = preview_thresholds(args.input_dir, args.thresholds, limit=args.limit)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print("threshold  pages")
+    for threshold, count in counts.items():
+        print(f"{threshold:>9}  {count:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
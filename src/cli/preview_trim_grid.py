@@ -12,10 +12,13 @@ from __future__ import annotations
 
 import argparse
 import sys
+from functools import partial
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from src.preprocessing.preview_cache import CACHE_DIRNAME, load_preview, preview_key, render_incremental
+
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments.
@@ -76,6 +79,13 @@ Example:
         help="Spread mode (default: single)",
     )
 
+    parser.add_argument(
+        "--max-side",
+        type=int,
+        default=None,
+        help="Downscale images to this longest side in pixels before drawing (default: full resolution)",
+    )
+
     return parser.parse_args(argv)
 
 
@@ -103,6 +113,11 @@ def validate_args(args: argparse.Namespace) -> None:
         print("Error: --step must be less than or equal to --max", file=sys.stderr)
         sys.exit(1)
 
+    # Validate max-side > 0
+    if args.max_side is not None and args.max_side <= 0:
+        print("Error: --max-side must be a positive integer", file=sys.stderr)
+        sys.exit(1)
+
     # Validate max < 0.5
     if args.max >= 0.5:
         print("Error: --max must be less than 0.5", file=sys.stderr)
@@ -173,36 +188,45 @@ def draw_grid(
     return img
 
 
+def _render_grid(png_file: Path, cache_dir: Path, step: float, max_ratio: float, max_side: int | None) -> Image.Image:
+    """Draw the grid on a cached preview of png_file."""
+    return draw_grid(load_preview(png_file, cache_dir, max_side), step, max_ratio)
+
+
 def process_images(
     input_dir: Path,
     output_dir: Path,
     step: float,
     max_ratio: float,
+    max_side: int | None = None,
 ) -> None:
     """Process all PNG images in input directory.
 
+    Images are decoded once into a thumbnail cache (input_dir/.preview_cache/)
+    and only outputs whose image, step or max changed are redrawn.
+
     Args:
         input_dir: Input directory path
         output_dir: Output directory path
         step: Grid line step size
         max_ratio: Maximum trim ratio
+        max_side: Downscale images to this longest side (default: full resolution)
     """
-    # Create output directory if it doesn't exist
-    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir = input_dir / CACHE_DIRNAME
 
     # Process all PNG files
     png_files = sorted(input_dir.glob("*.png"))
+    jobs = [
+        (
+            png_file.name,
+            f"{preview_key(png_file)}:{step}:{max_ratio}:{max_side}",
+            partial(_render_grid, png_file, cache_dir, step, max_ratio, max_side),
+        )
+        for png_file in png_files
+    ]
 
-    for png_file in png_files:
-        # Load image
-        img = Image.open(png_file)
-
-        # Draw grid
-        img_with_grid = draw_grid(img, step, max_ratio)
-
-        # Save output
-        output_path = output_dir / png_file.name
-        img_with_grid.save(output_path)
+    _, rendered = render_incremental(output_dir, jobs)
+    print(f"Rendered {rendered} of {len(jobs)} grid images")
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -223,6 +247,7 @@ def main(argv: list[str] | None = None) -> int:
             output_dir=args.output,
             step=args.step,
             max_ratio=args.max,
+            max_side=args.max_side,
         )
 
         return 0
@@ -6,7 +6,12 @@ import argparse
 import sys
 from pathlib import Path
 
+from src.rover.engines import EngineResultCache, OCRDaemonClient
+from src.rover.engines.cache import DEFAULT_CACHE_DIR
+from src.rover.engines.daemon import DEFAULT_SOCKET
+from src.rover.engines.regions import FIGURE_MODES
 from src.rover.ensemble import run_rover_batch
+from src.rover.page_engines import ADAPTIVE_MIN_CONFIDENCE, ADAPTIVE_MIN_LINES, BatchOptions
 
 
 def main() -> int:
@@ -16,7 +21,7 @@ def main() -> int:
     parser.add_argument("-o", "--output", required=True, help="Output directory")
     parser.add_argument(
         "--layout-dir",
-        help="Layout directory (optional)",
+        help="Layout directory; Yomitoku results cached by detect-layout are reused (optional)",
     )
     parser.add_argument(
         "--device",
@@ -24,6 +29,89 @@ def main() -> int:
         default="cpu",
         help="Device to use (default: cpu)",
     )
+    parser.add_argument(
+        "--figure-mode",
+        choices=FIGURE_MODES,
+        default="filter",
+        help="How PaddleOCR/EasyOCR skip Yomitoku's figures: filter results afterwards, "
+        "mask figures white, or crop figure bands out of the page (default: filter)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        nargs="?",
+        type=float,
+        const=ADAPTIVE_MIN_CONFIDENCE,
+        metavar="CONFIDENCE",
+        help="Run PaddleOCR/EasyOCR only on Yomitoku lines below this normalized confidence "
+        f"or flagged as garbage (default when given: {ADAPTIVE_MIN_CONFIDENCE}). Text Yomitoku missed "
+        f"is only recovered on pages where it found fewer than {ADAPTIVE_MIN_LINES} lines, "
+        "so output can differ from a full run",
+    )
+    parser.add_argument(
+        "--recognize-lines",
+        action="store_true",
+        help="Skip PaddleOCR/EasyOCR text detection and recognize only Yomitoku's line boxes, in batches",
+    )
+    parser.add_argument(
+        "--engine-workers",
+        type=int,
+        default=0,
+        help="Persistent worker processes per engine, pipelining pages across engines (default: 0 = in-process)",
+    )
+    parser.add_argument(
+        "--engine-timeout",
+        type=float,
+        help="Seconds an engine may spend on one page; engines then run in supervised workers "
+        "that are restarted after a crash or timeout (default: no limit)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes to shard pages across, each with its own engines (default: 1)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Intra-op threads per job for torch/paddle/OpenMP (default: CPU count / jobs)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        help="Memory in GiB for all jobs; caps --jobs (default: available memory)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run every engine even if its result for an identical page is cached",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Engine result cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=2048,
+        help="Engine result cache size limit in MB (default: 2048)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages the output checkpoint records as finished from the same input",
+    )
+    parser.add_argument(
+        "--daemon-socket",
+        default=str(DEFAULT_SOCKET),
+        help=f"OCR daemon socket, used when a daemon is running (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run engines in this process even if an OCR daemon is running",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -36,17 +124,72 @@ def main() -> int:
         print("Error: --limit must be a positive integer", file=sys.stderr)
         return 1
 
+    if args.engine_workers < 0:
+        print("Error: --engine-workers must be 0 or a positive integer", file=sys.stderr)
+        return 1
+
+    if args.jobs <= 0:
+        print("Error: --jobs must be a positive integer", file=sys.stderr)
+        return 1
+
+    if args.threads is not None and args.threads <= 0:
+        print("Error: --threads must be a positive integer", file=sys.stderr)
+        return 1
+
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        print("Error: --memory-budget must be positive", file=sys.stderr)
+        return 1
+
+    if args.cache_size <= 0:
+        print("Error: --cache-size must be a positive integer", file=sys.stderr)
+        return 1
+
+    if args.engine_timeout is not None and args.engine_timeout < 0:
+        print("Error: --engine-timeout must not be negative", file=sys.stderr)
+        return 1
+
+    if args.adaptive is not None and not 0 <= args.adaptive <= 1:
+        print("Error: --adaptive must be between 0 and 1", file=sys.stderr)
+        return 1
+
+    if args.jobs > 1 and (args.engine_workers > 0 or args.engine_timeout):
+        print("Error: --jobs and --engine-workers/--engine-timeout cannot be combined", file=sys.stderr)
+        return 1
+
     # Validate input
     if not Path(args.pages_dir).exists():
         print(f"Error: Input not found: {args.pages_dir}", file=sys.stderr)
         return 1
 
+    cache = None if args.no_cache else EngineResultCache(args.cache_dir, max_bytes=args.cache_size * 1024**2)
+
+    # Client mode: use a running daemon unless a multi-process backend was requested
+    daemon = None
+    if not (args.no_daemon or args.jobs > 1 or args.engine_workers > 0 or args.engine_timeout):
+        client = OCRDaemonClient(args.daemon_socket)
+        if client.ping():
+            daemon = client
+
     # Call existing function
     try:
         run_rover_batch(
             args.pages_dir,
             args.output,
-            device=args.device,
+            options=BatchOptions(
+                device=args.device,
+                layout_dir=args.layout_dir,
+                figure_mode=args.figure_mode,
+                adaptive_confidence=args.adaptive,
+                recognize_lines=args.recognize_lines,
+                engine_workers=args.engine_workers,
+                jobs=args.jobs,
+                threads=args.threads,
+                memory_budget_gb=args.memory_budget,
+                engine_timeout=args.engine_timeout or None,
+                daemon=daemon,
+                cache=cache,
+                resume=args.resume,
+            ),
             limit=args.limit,
         )
         return 0
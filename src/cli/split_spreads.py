@@ -3,16 +3,26 @@
 from __future__ import annotations
 
 import argparse
-import shutil
 import sys
-import tempfile
+from functools import partial
 from pathlib import Path
 
+from PIL import Image
+
+from src.preprocessing.preview_cache import (
+    CACHE_DIRNAME,
+    load_preview,
+    preview_key,
+    preview_size,
+    render_incremental,
+)
 from src.preprocessing.split_spread import (
     SpreadMode,
     TrimConfig,
     get_spread_mode,
+    global_trim_box,
     renumber_pages,
+    split_spread_boxes,
     split_spread_pages,
 )
 
@@ -82,6 +92,23 @@ def main() -> int:
         default=0.0,
         help="Percentage to trim from right before splitting (default: 0.0)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for cropping and saving pages (default: 1)",
+    )
+    parser.add_argument(
+        "--virtual",
+        action="store_true",
+        help="Write a pages.json manifest of crop boxes instead of re-encoding page images",
+    )
+    parser.add_argument(
+        "--auto-gutter",
+        action="store_true",
+        help="Spread mode: split at the gutter detected on sampled pages instead of the center",
+    )
     args = parser.parse_args()
 
     # Validate input
@@ -89,6 +116,11 @@ def main() -> int:
         print(f"Error: Input not found: {args.pages_dir}", file=sys.stderr)
         return 1
 
+    # Validate --workers
+    if args.workers <= 0:
+        print("Error: --workers must be a positive integer", file=sys.stderr)
+        return 1
+
     # Get mode (CLI argument > env var > default)
     try:
         mode = get_spread_mode(args.mode)
@@ -132,6 +164,9 @@ def main() -> int:
             aspect_ratio_threshold=args.aspect_ratio,
             mode=mode,
             trim_config=trim_config,
+            workers=args.workers,
+            virtual=args.virtual,
+            auto_gutter=args.auto_gutter,
         )
         renumber_pages(args.pages_dir)
         return 0
@@ -176,16 +211,23 @@ def preview_trim(
     preview_dir: str,
     mode: SpreadMode,
     trim_config: TrimConfig | None = None,
+    max_side: int | None = None,
 ) -> None:
     """Apply trim to preview frames and output to preview/trimmed/.
 
     This function processes frames from preview/frames/ and outputs trimmed images
     to preview/trimmed/. It does NOT extract new frames from video.
 
+    Frames are decoded once into a thumbnail cache (frames/.preview_cache/),
+    and only outputs whose frame or crop box changed since the last run are
+    re-rendered, so iterating on trim values is fast.
+
     Args:
         preview_dir: Path to preview directory (e.g., "output/abc123/preview")
         mode: Processing mode (SINGLE or SPREAD)
         trim_config: Trim configuration (global + split trim)
+        max_side: Downscale frames to this longest side before trimming
+            (default: full resolution)
 
     Raises:
         FileNotFoundError: If frames directory doesn't exist
@@ -197,37 +239,48 @@ def preview_trim(
     preview_path = Path(preview_dir)
     frames_dir = preview_path / "frames"
     trimmed_dir = preview_path / "trimmed"
+    cache_dir = frames_dir / CACHE_DIRNAME
 
-    # Create trimmed directory if it doesn't exist
-    trimmed_dir.mkdir(parents=True, exist_ok=True)
-
-    # Use temporary directory to avoid modifying original frames
-    # split_spread_pages moves input files to originals/, so we copy to temp first
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir) / "pages"
-        temp_path.mkdir(parents=True)
-
-        # Copy frames to temp directory, renaming frame_*.png to page_*.png
-        # (split_spread_pages expects page_*.png naming)
-        for frame in sorted(frames_dir.glob("*.png")):
-            # Extract number from frame_NNNN.png or page_NNNN.png
-            stem = frame.stem
-            if stem.startswith("frame_"):
-                new_name = f"page_{stem[6:]}.png"
-            else:
-                new_name = frame.name
-            shutil.copy2(frame, temp_path / new_name)
-
-        # Process from temp directory to trimmed directory
-        split_spread_pages(
-            str(temp_path),
-            mode=mode,
-            trim_config=trim_config,
-            output_dir=str(trimmed_dir),
+    split_trims = (0.0, 0.0, 0.0, 0.0)
+    if trim_config is not None:
+        split_trims = (
+            trim_config.left_page_outer,
+            trim_config.right_page_outer,
+            trim_config.left_page_inner,
+            trim_config.right_page_inner,
         )
 
+    jobs = []
+    for frame in sorted(frames_dir.glob("*.png")):
+        # Name outputs like split_spread_pages: frame_NNNN.png → page_NNNN.png
+        stem = frame.stem
+        if stem.startswith("frame_"):
+            stem = f"page_{stem[6:]}"
+
+        # Boxes are computed in cached preview coordinates
+        size = preview_size(frame, cache_dir, max_side)
+        box = global_trim_box(size, trim_config) if trim_config is not None else (0, 0, *size)
+        trimmed_size = (box[2] - box[0], box[3] - box[1])
+        if mode == SpreadMode.SPREAD:
+            left_box, right_box = split_spread_boxes(trimmed_size, 0, *split_trims)
+            outputs = [(f"{stem}_L.png", left_box), (f"{stem}_R.png", right_box)]
+        else:
+            outputs = [(f"{stem}.png", (0, 0, *trimmed_size))]
+
+        for name, sub_box in outputs:
+            crop = (box[0] + sub_box[0], box[1] + sub_box[1], box[0] + sub_box[2], box[1] + sub_box[3])
+            render = partial(_render_crop, frame, cache_dir, crop, max_side)
+            jobs.append((name, f"{preview_key(frame)}:{max_side}:{crop}", render))
+
+    _, rendered = render_incremental(trimmed_dir, jobs)
+    print(f"Rendered {rendered} of {len(jobs)} preview pages")
     print(f"Preview trim complete. Output: {trimmed_dir}")
 
 
+def _render_crop(frame: Path, cache_dir: Path, box: tuple[int, int, int, int], max_side: int | None) -> Image.Image:
+    """Crop a cached preview image."""
+    return load_preview(frame, cache_dir, max_side).crop(box)
+
+
 if __name__ == "__main__":
     sys.exit(main())
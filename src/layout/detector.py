@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import cv2
+import numpy as np
+
+from src.preprocessing.pages import list_pages
 
 if TYPE_CHECKING:
     from yomitoku import DocumentAnalyzer
@@ -99,6 +102,7 @@ def visualize_layout(
     paragraphs: list,
     figures: list,
     output_path: str,
+    image: np.ndarray | None = None,
 ) -> None:
     """Draw bounding boxes on image and save to output_path.
 
@@ -107,10 +111,11 @@ def visualize_layout(
         paragraphs: List of yomitoku ParagraphSchema objects
         figures: List of yomitoku FigureSchema objects
         output_path: Path to save visualized image
+        image: Already loaded BGR image (used instead of reading img_path)
     """
     import cv2
 
-    img = cv2.imread(img_path)
+    img = image.copy() if image is not None else cv2.imread(img_path)
     if img is None:
         return
 
@@ -165,13 +170,15 @@ def visualize_layout(
     cv2.imwrite(output_path, img)
 
 
-def save_yomitoku_results(output_dir: str, page_stem: str, results) -> None:
+def save_yomitoku_results(output_dir: str, page_stem: str, results, box=None) -> None:
     """Save yomitoku analysis results to cache.
 
     Args:
         output_dir: Output directory
         page_stem: Page filename stem (e.g., "page_0024")
         results: DocumentAnalyzerSchema from yomitoku
+        box: Crop box of a virtual page within its source (None = whole
+            image), recorded next to the results
     """
     import pickle
 
@@ -181,6 +188,25 @@ def save_yomitoku_results(output_dir: str, page_stem: str, results) -> None:
 
     with open(cache_file, "wb") as f:
         pickle.dump(results, f)
+    (cache_dir / f"{page_stem}.box.json").write_text(json.dumps({"box": box}), encoding="utf-8")
+
+
+def load_yomitoku_box(output_dir: str, page_stem: str):
+    """Load the crop box recorded with cached yomitoku results.
+
+    Args:
+        output_dir: Output directory
+        page_stem: Page filename stem (e.g., "page_0024")
+
+    Returns:
+        (left, upper, right, lower), or None for a whole image or a cache
+        written without a box
+    """
+    box_file = Path(output_dir) / "yomitoku_cache" / f"{page_stem}.box.json"
+    if not box_file.exists():
+        return None
+    box = json.loads(box_file.read_text(encoding="utf-8"))["box"]
+    return tuple(box) if box is not None else None
 
 
 def load_yomitoku_results(output_dir: str, page_stem: str):
@@ -234,7 +260,7 @@ def detect_layout_yomitoku(
     lay_dir = Path(layouts_dir) if layouts_dir else out_path / "layouts"
     lay_dir.mkdir(parents=True, exist_ok=True)
 
-    pages = sorted(pages_path.glob("*.png"))
+    pages = list_pages(pages_path)
     if limit:
         print(f"Processing first {limit} of {len(pages)} files", file=sys.stderr)
         pages = pages[:limit]
@@ -247,21 +273,25 @@ def detect_layout_yomitoku(
 
     layout_data = {}
 
-    for i, page_path in enumerate(pages, 1):
-        page_name = page_path.name
+    for i, page in enumerate(pages, 1):
+        page_name = page.name
+        page_path = page.source
         print(f"Analyzing layout: page {i}/{len(pages)} ({page_name})")
 
-        # Load and analyze
+        # Load and analyze (virtual pages are cropped from their source)
         cv_img = cv2.imread(str(page_path))
         if cv_img is None:
             print("  → Failed to load image")
             continue
+        if page.box is not None:
+            left, upper, right, lower = page.box
+            cv_img = cv_img[upper:lower, left:right]
 
         results, _, _ = analyzer(cv_img)
         page_height, page_width = cv_img.shape[:2]
 
         # Save results to cache
-        save_yomitoku_results(output_dir, page_path.stem, results)
+        save_yomitoku_results(output_dir, page.stem, results, box=page.box)
 
         # Convert to layout format
         page_layout = paragraphs_to_layout(results.paragraphs, results.figures, (page_width, page_height))
@@ -274,7 +304,7 @@ def detect_layout_yomitoku(
 
         # Visualize (box反映)
         vis_path = lay_dir / page_name
-        visualize_layout(str(page_path), results.paragraphs, results.figures, str(vis_path))
+        visualize_layout(str(page_path), results.paragraphs, results.figures, str(vis_path), image=cv_img)
 
     # Save layout.json
     layout_file = out_path / "layout.json"
@@ -4,9 +4,46 @@ Modules:
 - frames: Frame extraction from video files
 - deduplicate: Duplicate frame removal
 - split_spread: Spread page splitting
+- page_boxes: Trim and split crop boxes, virtual pages
+- gutter: Automatic gutter detection for spreads
 - hash: Video file hashing
+- hash_index: Persistent per-frame pHash index
+- pages: Manifest-backed page listing
+- phash: Batched perceptual hashing
+- preview_cache: Thumbnail cache and incremental rendering for trim previews
+- scene: Scene-change driven frame sampling
+- stream: Streaming extraction with in-memory deduplication
+- trim_estimate: Global trim estimation from ink-density profiles
 """
 
-from src.preprocessing import deduplicate, frames, hash, split_spread
+from src.preprocessing import (
+    deduplicate,
+    frames,
+    gutter,
+    hash,
+    hash_index,
+    page_boxes,
+    pages,
+    phash,
+    preview_cache,
+    scene,
+    split_spread,
+    stream,
+    trim_estimate,
+)
 
-__all__ = ["frames", "deduplicate", "split_spread", "hash"]
+__all__ = [
+    "frames",
+    "deduplicate",
+    "split_spread",
+    "page_boxes",
+    "gutter",
+    "hash",
+    "hash_index",
+    "pages",
+    "phash",
+    "preview_cache",
+    "scene",
+    "stream",
+    "trim_estimate",
+]
@@ -1,10 +1,71 @@
 """Remove duplicate and transition frames using perceptual hashing."""
 
+import os
+import shutil
 from pathlib import Path
 
-import imagehash
 from PIL import Image
 
+from src.preprocessing.hash_index import frame_features, select_unique
+from src.preprocessing.pages import PageRef, remove_manifest, write_manifest
+
+# How unique frames are stored in the output directory:
+# - encode: decode and re-encode as PNG
+# - copy: byte copy of the source PNG
+# - hardlink: hard link to the source frame (copy across devices)
+# - reflink: copy-on-write clone where supported (copy otherwise)
+# - manifest: no image files, only pages.json pointing at the frames
+MATERIALIZE_MODES = ("encode", "copy", "hardlink", "reflink", "manifest")
+
+# Which frame of a run of near-identical frames becomes the page:
+# - first: the first frame of the run
+# - sharpest: the frame with the highest Laplacian variance (avoids frames
+#   caught mid page-turn or with motion blur)
+SELECT_MODES = ("first", "sharpest")
+
+# Linux FICLONE ioctl request number (copy-on-write file clone)
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone src to dst with FICLONE, falling back to a byte copy."""
+    try:
+        import fcntl
+
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+    except (ImportError, OSError):
+        shutil.copyfile(src, dst)
+
+
+def materialize_page(src: Path, dst: Path, mode: str = "encode") -> None:
+    """Store a unique frame as a page file.
+
+    Args:
+        src: Source frame path.
+        dst: Destination page path.
+        mode: One of "encode", "copy", "hardlink", "reflink".
+
+    Raises:
+        ValueError: If mode does not produce a page file.
+    """
+    if mode not in MATERIALIZE_MODES or mode == "manifest":
+        raise ValueError(f"Invalid materialize mode for page files: {mode}")
+
+    dst.unlink(missing_ok=True)
+    if mode == "encode":
+        with Image.open(src) as img:
+            img.save(dst)
+    elif mode == "copy":
+        shutil.copyfile(src, dst)
+    elif mode == "hardlink":
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+    else:
+        _reflink(src, dst)
+
 
 def deduplicate_frames(
     frame_dir: str,
@@ -12,11 +73,15 @@ def deduplicate_frames(
     hash_threshold: int = 8,
     *,
     limit: int | None = None,
+    workers: int | None = None,
+    materialize: str = "encode",
+    select: str = "sharpest",
 ) -> list[Path]:
     """Remove duplicate frames based on perceptual hash similarity.
 
-    Frames that are too similar to the previous unique frame are discarded.
-    This handles page-turn animations and static duplicate frames.
+    Consecutive frames within hash_threshold of the first frame of their
+    run are grouped, and one frame per run is kept. This handles page-turn
+    animations and static duplicate frames.
 
     Args:
         frame_dir: Directory containing extracted frames.
@@ -24,12 +89,24 @@ def deduplicate_frames(
         hash_threshold: Max hamming distance to consider frames as duplicates.
             Lower = stricter (fewer kept). 8 is a good default.
         limit: Process only first N files (for testing).
+        workers: Threads used to decode frames for hashing (default: CPU count).
+        materialize: How pages are stored (see MATERIALIZE_MODES). "hardlink"
+            shares storage with frames/, so frames must not be rewritten in
+            place afterwards. "manifest" writes only pages.json.
+        select: Frame kept per run (see SELECT_MODES). The page count is the
+            same for every mode; only which frame is kept differs.
 
     Returns:
-        Sorted list of unique frame paths.
+        Sorted list of unique page paths (for "manifest", the page names
+        inside output_dir that the manifest defines).
     """
     import sys
 
+    if materialize not in MATERIALIZE_MODES:
+        raise ValueError(f"Invalid materialize mode '{materialize}': must be one of {', '.join(MATERIALIZE_MODES)}")
+    if select not in SELECT_MODES:
+        raise ValueError(f"Invalid select mode '{select}': must be one of {', '.join(SELECT_MODES)}")
+
     src = Path(frame_dir)
     dst = Path(output_dir)
     dst.mkdir(parents=True, exist_ok=True)
@@ -42,24 +119,27 @@ def deduplicate_frames(
         print("No frames found")
         return []
 
+    # Hash and score all frames up front (reuses the on-disk index; new
+    # frames use threaded decode + vectorized DCT)
+    hashes, sharpness = frame_features(frames, workers=workers)
+    keep = select_unique(hashes, hash_threshold, sharpness if select == "sharpest" else None)
+
     unique_frames: list[Path] = []
-    prev_hash = None
-    page_num = 1
-
-    for frame_path in frames:
-        with Image.open(frame_path) as img:
-            current_hash = imagehash.phash(img)
-
-            if prev_hash is not None:
-                distance = current_hash - prev_hash
-                if distance < hash_threshold:
-                    continue
-
-            out_path = dst / f"page_{page_num:04d}.png"
-            img.save(out_path)
-            unique_frames.append(out_path)
-            prev_hash = current_hash
-            page_num += 1
+    manifest: list[PageRef] = []
+    for page_num, index in enumerate(keep, 1):
+        out_path = dst / f"page_{page_num:04d}.png"
+        if materialize == "manifest":
+            manifest.append(PageRef(name=out_path.name, source=frames[index]))
+        else:
+            materialize_page(frames[index], out_path, materialize)
+        unique_frames.append(out_path)
+
+    if materialize == "manifest":
+        for stale in dst.glob("page_*.png"):
+            stale.unlink()
+        write_manifest(dst, manifest)
+    else:
+        remove_manifest(dst)
 
     removed = len(frames) - len(unique_frames)
     print(f"Kept {len(unique_frames)} unique pages, removed {removed} duplicates")
@@ -1,14 +1,223 @@
 """Extract frames from video at specified intervals."""
 
+import bisect
+import math
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from PIL import Image
+
+SEGMENTS_DIRNAME = ".segments"
+
+
+def _run_ffmpeg(cmd: list[str]) -> None:
+    """Run an FFmpeg command, raising RuntimeError on failure."""
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"FFmpeg error: {result.stderr}", file=sys.stderr)
+        raise RuntimeError("FFmpeg frame extraction failed")
+
+
+def _build_extract_command(
+    video_path: str,
+    output_pattern: str,
+    interval_sec: float,
+    start_sec: float | None = None,
+    duration_sec: float | None = None,
+) -> list[str]:
+    """Build the FFmpeg command for fixed-interval frame extraction."""
+    fps = 1.0 / interval_sec
+    cmd = ["ffmpeg"]
+    if start_sec is not None:
+        # Input seeking: jumps to the preceding keyframe, then decodes accurately
+        cmd += ["-ss", f"{start_sec:.3f}"]
+    if duration_sec is not None:
+        cmd += ["-t", f"{duration_sec:.3f}"]
+    cmd += [
+        "-i",
+        video_path,
+        "-vf",
+        f"fps={fps}",
+        "-q:v",
+        "2",
+        "-y",
+        output_pattern,
+    ]
+    return cmd
+
+
+def probe_duration(video_path: str) -> float:
+    """Return the container duration of a video in seconds (via ffprobe).
+
+    Raises:
+        RuntimeError: If ffprobe fails or reports no duration.
+    """
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError as e:
+        raise RuntimeError(f"ffprobe could not read duration: {result.stderr.strip()}") from e
+
+
+def probe_keyframes(video_path: str) -> list[float]:
+    """Return sorted keyframe timestamps of the first video stream.
+
+    Only packets are demuxed (no decoding), so this is cheap even for long files.
+    Returns an empty list if ffprobe fails.
+    """
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags",
+        "-of",
+        "csv=p=0",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                keyframes.append(float(pts))
+            except ValueError:
+                continue
+    return sorted(keyframes)
+
+
+def plan_segments(
+    duration_sec: float,
+    interval_sec: float,
+    workers: int,
+    keyframes: list[float] | None = None,
+) -> list[tuple[float, float | None]]:
+    """Split a video timeline into (start, duration) segments for parallel extraction.
+
+    Boundaries are snapped to the nearest keyframe so each worker can start
+    decoding without a long pre-roll, then rounded to the sampling grid
+    (multiples of interval_sec) so the merged sequence matches a single pass.
+
+    Args:
+        duration_sec: Video duration in seconds.
+        interval_sec: Frame sampling interval in seconds.
+        workers: Number of segments to aim for.
+        keyframes: Sorted keyframe timestamps (optional).
+
+    Returns:
+        List of (start_sec, duration_sec) tuples covering the whole video.
+        The last segment has duration None (read to the end).
+    """
+    total_samples = max(1, math.ceil(duration_sec / interval_sec))
+    workers = max(1, min(workers, total_samples))
+
+    boundaries = [0]
+    for i in range(1, workers):
+        target = duration_sec * i / workers
+        if keyframes:
+            pos = bisect.bisect_left(keyframes, target)
+            candidates = keyframes[max(0, pos - 1) : pos + 1]
+            target = min(candidates, key=lambda k: abs(k - target))
+        sample = math.ceil(target / interval_sec)
+        if boundaries[-1] < sample < total_samples:
+            boundaries.append(sample)
+    boundaries.append(total_samples)
+
+    segments: list[tuple[float, float | None]] = [
+        (start * interval_sec, (end - start) * interval_sec) for start, end in zip(boundaries, boundaries[1:])
+    ]
+    # Leave the last segment open-ended so nothing at the tail is cut off
+    segments[-1] = (segments[-1][0], None)
+    return segments
+
+
+def _same_pixels(a: Path, b: Path) -> bool:
+    """Check whether two frame images have identical pixels."""
+    with Image.open(a) as img_a, Image.open(b) as img_b:
+        return img_a.size == img_b.size and img_a.tobytes() == img_b.tobytes()
+
+
+def _merge_segments(segment_dirs: list[Path], out: Path) -> list[Path]:
+    """Merge per-segment frames into one frame_%04d sequence.
+
+    A frame at the start of a segment that is pixel-identical to the last
+    frame of the previous segment is treated as a boundary duplicate.
+    """
+    frames: list[Path] = []
+    prev_last: Path | None = None
+    boundary_dups = 0
+
+    for seg_dir in segment_dirs:
+        seg_frames = sorted(seg_dir.glob("frame_*.png"))
+        if prev_last is not None and seg_frames and _same_pixels(prev_last, seg_frames[0]):
+            seg_frames = seg_frames[1:]
+            boundary_dups += 1
+        for frame in seg_frames:
+            dest = out / f"frame_{len(frames) + 1:04d}.png"
+            frame.replace(dest)
+            frames.append(dest)
+        if frames:
+            prev_last = frames[-1]
+
+    if boundary_dups:
+        print(f"Dropped {boundary_dups} duplicate frames at segment boundaries")
+    return frames
+
+
+def _extract_frames_parallel(
+    video_path: str,
+    out: Path,
+    interval_sec: float,
+    workers: int,
+) -> list[Path]:
+    """Extract frames with several FFmpeg processes over time segments."""
+    duration = probe_duration(video_path)
+    segments = plan_segments(duration, interval_sec, workers, probe_keyframes(video_path))
+    print(f"Extracting {len(segments)} segments with {min(workers, len(segments))} workers")
+
+    seg_root = out / SEGMENTS_DIRNAME
+    shutil.rmtree(seg_root, ignore_errors=True)
+    segment_dirs = [seg_root / f"seg_{i:03d}" for i in range(len(segments))]
+    commands = []
+    for seg_dir, (start, length) in zip(segment_dirs, segments):
+        seg_dir.mkdir(parents=True)
+        commands.append(
+            _build_extract_command(video_path, str(seg_dir / "frame_%04d.png"), interval_sec, start, length)
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_run_ffmpeg, commands))
+        return _merge_segments(segment_dirs, out)
+    finally:
+        shutil.rmtree(seg_root, ignore_errors=True)
+
 
 def extract_frames(
     video_path: str,
     output_dir: str,
     interval_sec: float = 2.0,
+    *,
+    workers: int = 1,
 ) -> list[Path]:
     """Extract frames from video using FFmpeg.
 
@@ -16,6 +225,8 @@ def extract_frames(
         video_path: Path to input video file.
         output_dir: Directory to save extracted frames.
         interval_sec: Interval between frames in seconds.
+        workers: Number of parallel FFmpeg processes. With 2 or more, the
+            video is split into time segments extracted concurrently.
 
     Returns:
         Sorted list of extracted frame paths.
@@ -23,25 +234,12 @@ def extract_frames(
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
-    fps = 1.0 / interval_sec
-    cmd = [
-        "ffmpeg",
-        "-i",
-        video_path,
-        "-vf",
-        f"fps={fps}",
-        "-q:v",
-        "2",
-        "-y",
-        str(out / "frame_%04d.png"),
-    ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"FFmpeg error: {result.stderr}", file=sys.stderr)
-        raise RuntimeError("FFmpeg frame extraction failed")
+    if workers > 1:
+        frames = _extract_frames_parallel(video_path, out, interval_sec, workers)
+    else:
+        _run_ffmpeg(_build_extract_command(video_path, str(out / "frame_%04d.png"), interval_sec))
+        frames = sorted(out.glob("frame_*.png"))
 
-    frames = sorted(out.glob("frame_*.png"))
     print(f"Extracted {len(frames)} frames to {out}")
     return frames
 
@@ -53,6 +251,7 @@ if __name__ == "__main__":
     parser.add_argument("video", help="Input video file path")
     parser.add_argument("-o", "--output", default="output/frames", help="Output directory")
     parser.add_argument("-i", "--interval", type=float, default=2.0, help="Interval in seconds")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Parallel FFmpeg processes")
     args = parser.parse_args()
 
-    extract_frames(args.video, args.output, args.interval)
+    extract_frames(args.video, args.output, args.interval, workers=args.workers)
@@ -0,0 +1,121 @@
+"""Automatic gutter (spine) detection for spread images.
+
+The gutter is found from a column profile over the middle band of a
+spread: text columns vary strongly from top to bottom, while the blank
+strip or fold shadow between the pages is nearly uniform. The column with
+the lowest vertical variation (refined to the darkest column of the run if
+there is a fold shadow) is taken as the split line.
+
+Detection runs on a downscaled grayscale copy of a sample of pages; the
+median position is cached next to the source pages and reused for every
+page of the book.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.preprocessing.pages import PageRef, sample_pages
+
+GUTTER_CACHE = "gutter.json"
+GUTTER_BAND = 0.15  # Search x within 0.5 ± GUTTER_BAND of the width
+GUTTER_SAMPLES = 8  # Pages sampled per book
+PROFILE_WIDTH = 1000  # Spreads are downscaled to about this width
+SHADOW_CONTRAST = 12.0  # Min mean-intensity dip treated as a fold shadow
+
+
+def find_gutter(gray: np.ndarray, band: float = GUTTER_BAND) -> float | None:
+    """Locate the gutter in a grayscale spread.
+
+    Args:
+        gray: 2-D grayscale array (height, width).
+        band: Half-width of the searched middle band, as a fraction of width.
+
+    Returns:
+        Gutter x as a fraction of width, or None if no column stands out.
+    """
+    height, width = gray.shape
+    lo, hi = int(width * (0.5 - band)), int(width * (0.5 + band))
+    # Ignore running heads/footers, which often span the gutter
+    region = gray[int(height * 0.1) : int(height * 0.9), lo:hi].astype(np.float32)
+    if region.size == 0 or hi - lo < 3:
+        return None
+
+    kernel = np.ones(max(1, width // 200), dtype=np.float32)
+    kernel /= kernel.size
+    std = np.convolve(region.std(axis=0), kernel, mode="same")
+    mean = np.convolve(region.mean(axis=0), kernel, mode="same")
+
+    floor = float(std.min())
+    median = float(np.median(std))
+    if median > 0 and floor > 0.5 * median:
+        return None
+
+    # Contiguous run of near-minimal columns around the minimum
+    flat = std <= floor + 0.25 * (median - floor)
+    center = int(np.argmin(std))
+    left, right = center, center
+    while left > 0 and flat[left - 1]:
+        left -= 1
+    while right < len(flat) - 1 and flat[right + 1]:
+        right += 1
+
+    # A fold shadow is darker than both ends of the run; text edges at the
+    # ends of the run are not
+    run = mean[left : right + 1]
+    if float(min(run[0], run[-1]) - run.min()) > SHADOW_CONTRAST:
+        x = left + int(np.argmin(run))
+    else:
+        x = (left + right) // 2
+    return (lo + x + 0.5) / width
+
+
+def _page_gray(page: PageRef) -> np.ndarray:
+    """Downscaled grayscale pixels of a page."""
+    with page.open() as img:
+        gray = img.convert("L")
+    factor = max(1, gray.width // PROFILE_WIDTH)
+    if factor > 1:
+        gray = gray.reduce(factor)
+    return np.asarray(gray)
+
+
+def estimate_gutter(
+    pages: Sequence[PageRef],
+    cache_dir: str | Path,
+    samples: int = GUTTER_SAMPLES,
+) -> float | None:
+    """Estimate the gutter position for a book, reusing the cached estimate.
+
+    Args:
+        pages: Spreads in order, already cropped by the global trim (the
+            crop box and source mtime are part of the cache key).
+        cache_dir: Directory for the gutter cache (typically originals/).
+        samples: Number of pages to analyze.
+
+    Returns:
+        Median gutter x as a fraction of the page width, or None if no
+        sampled page has a detectable gutter.
+    """
+    sampled = sample_pages(pages, samples)
+    key = [[p.name, list(p.box) if p.box else None, p.source.stat().st_mtime_ns] for p in sampled]
+
+    cache_path = Path(cache_dir) / GUTTER_CACHE
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return cached["ratio"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    found = [r for r in (find_gutter(_page_gray(p)) for p in sampled) if r is not None]
+    ratio = float(np.median(found)) if found else None
+    try:
+        cache_path.write_text(json.dumps({"key": key, "ratio": ratio, "found": found}, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"Warning: could not write gutter cache: {e}")
+    return ratio
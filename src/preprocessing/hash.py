@@ -1,60 +1,253 @@
-"""Compute video file hash for output directory management."""
+"""Compute video file hash for output directory management.
+
+Full SHA-256 digests are cached in a JSON file keyed by the video's resolved
+path, size, mtime and inode, so repeated runs on an unchanged video do not
+re-read it. On a cache miss the file is hashed through mmap, which lets the
+digest run over the page cache without per-chunk read() copies.
+
+The --fast fingerprint hashes only the file size and a fixed number of
+blocks (head, tail and evenly spaced offsets), so naming an output
+directory costs a few MB of reads regardless of file size. The full
+SHA-256 is then computed in a detached background process and recorded in
+source_info.json.
+"""
 
 import hashlib
 import json
+import mmap
+import os
+import subprocess
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 HASH_PREFIX_LEN = 16
 CHUNK_SIZE = 8 * 1024 * 1024  # 8MB chunks for large files
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "ebook-ocr" / "sha256.json"
+CACHE_VERSION = 1
+FAST_BLOCK_SIZE = 1024 * 1024  # Bytes read per sampled block
+FAST_SAMPLES = 16  # Sampled blocks, including head and tail
+SOURCE_INFO_NAME = "source_info.json"
 
 
-def compute_video_hash(video_path: str, prefix_len: int = HASH_PREFIX_LEN) -> str:
-    """Compute SHA-256 hash of a video file and return a prefix.
+def _file_key(video_path: str | Path) -> tuple[str, dict[str, int]]:
+    """Return (resolved path, stat fields) identifying a video file version."""
+    path = Path(video_path).resolve()
+    st = path.stat()
+    return str(path), {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def _load_cache(cache_path: Path) -> dict[str, dict]:
+    """Load cache entries (empty if missing, unreadable or another version)."""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _save_cache(cache_path: Path, entries: dict[str, dict]) -> None:
+    """Atomically write cache entries."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}, indent=2), encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def lookup_cached_hash(
+    video_path: str | Path,
+    field: str = "sha256",
+    cache_path: str | Path | None = None,
+) -> str | None:
+    """Return a cached digest for the video if its size/mtime/inode still match.
 
     Args:
         video_path: Path to the video file.
-        prefix_len: Number of hex characters to return.
+        field: Digest field to look up.
+        cache_path: Cache file (default: DEFAULT_CACHE_PATH).
 
     Returns:
-        Hex string prefix of the SHA-256 hash.
+        Cached hex digest, or None on a miss.
+    """
+    path, stat = _file_key(video_path)
+    entry = _load_cache(Path(cache_path or DEFAULT_CACHE_PATH)).get(path)
+    if entry is None or any(entry.get(k) != v for k, v in stat.items()):
+        return None
+    return entry.get(field)
+
+
+def store_cached_hash(
+    video_path: str | Path,
+    digest: str,
+    field: str = "sha256",
+    cache_path: str | Path | None = None,
+) -> None:
+    """Record a digest for the video's current size/mtime/inode.
+
+    Other fields of a still-valid entry are kept. Write failures are reported
+    and otherwise ignored; the cache is only an optimization.
+
+    Args:
+        video_path: Path to the video file.
+        digest: Hex digest to store.
+        field: Digest field name.
+        cache_path: Cache file (default: DEFAULT_CACHE_PATH).
+    """
+    cache_file = Path(cache_path or DEFAULT_CACHE_PATH)
+    path, stat = _file_key(video_path)
+    entries = _load_cache(cache_file)
+    entry = entries.get(path, {})
+    if any(entry.get(k) != v for k, v in stat.items()):
+        entry = {}
+    entries[path] = {**entry, **stat, field: digest}
+    try:
+        _save_cache(cache_file, entries)
+    except OSError as e:
+        print(f"Warning: could not write hash cache: {e}", file=sys.stderr)
+
+
+def sha256_file(video_path: str | Path) -> str:
+    """Hash a file with SHA-256, reading through mmap where possible.
+
+    Args:
+        video_path: Path to the file.
+
+    Returns:
+        Full hex string of the SHA-256 hash.
     """
     sha256 = hashlib.sha256()
     with open(video_path, "rb") as f:
-        while chunk := f.read(CHUNK_SIZE):
-            sha256.update(chunk)
-    return sha256.hexdigest()[:prefix_len]
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and non-mappable files (pipes, some network mounts)
+            while chunk := f.read(CHUNK_SIZE):
+                sha256.update(chunk)
+            return sha256.hexdigest()
+
+        with mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(view), CHUNK_SIZE):
+                    sha256.update(view[start : start + CHUNK_SIZE])
+            finally:
+                view.release()
+    return sha256.hexdigest()
 
 
-def compute_full_hash(video_path: str) -> str:
+def compute_full_hash(video_path: str, *, use_cache: bool = True, cache_path: str | Path | None = None) -> str:
     """Compute full SHA-256 hash of a video file.
 
     Args:
         video_path: Path to the video file.
+        use_cache: Reuse and update the hash cache.
+        cache_path: Cache file (default: DEFAULT_CACHE_PATH).
 
     Returns:
         Full hex string of the SHA-256 hash.
     """
-    sha256 = hashlib.sha256()
+    if use_cache:
+        cached = lookup_cached_hash(video_path, cache_path=cache_path)
+        if cached is not None:
+            return cached
+
+    full_hash = sha256_file(video_path)
+    if use_cache:
+        store_cached_hash(video_path, full_hash, cache_path=cache_path)
+    return full_hash
+
+
+def compute_video_hash(
+    video_path: str,
+    prefix_len: int = HASH_PREFIX_LEN,
+    *,
+    use_cache: bool = True,
+    cache_path: str | Path | None = None,
+) -> str:
+    """Compute SHA-256 hash of a video file and return a prefix.
+
+    Args:
+        video_path: Path to the video file.
+        prefix_len: Number of hex characters to return.
+        use_cache: Reuse and update the hash cache.
+        cache_path: Cache file (default: DEFAULT_CACHE_PATH).
+
+    Returns:
+        Hex string prefix of the SHA-256 hash.
+    """
+    return compute_full_hash(video_path, use_cache=use_cache, cache_path=cache_path)[:prefix_len]
+
+
+def compute_fast_fingerprint(
+    video_path: str | Path,
+    prefix_len: int = HASH_PREFIX_LEN,
+    *,
+    block_size: int = FAST_BLOCK_SIZE,
+    samples: int = FAST_SAMPLES,
+) -> str:
+    """Fingerprint a video from its size and sampled blocks.
+
+    Files no larger than samples * block_size are hashed in full. The
+    fingerprint is not a SHA-256 of the file; it names a different output
+    directory than compute_video_hash() for the same video.
+
+    Args:
+        video_path: Path to the video file.
+        prefix_len: Number of hex characters to return.
+        block_size: Bytes read per sampled block.
+        samples: Number of blocks (head, tail and evenly spaced offsets);
+            at least 2.
+
+    Returns:
+        Hex string prefix of the fingerprint.
+
+    Raises:
+        ValueError: If samples is less than 2.
+    """
+    if samples < 2:
+        raise ValueError(f"samples must be at least 2 (head and tail blocks), got {samples}")
+    size = Path(video_path).stat().st_size
+    digest = hashlib.sha256(b"fast-v1:" + size.to_bytes(8, "little"))
     with open(video_path, "rb") as f:
-        while chunk := f.read(CHUNK_SIZE):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        if size <= samples * block_size:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        else:
+            last = size - block_size
+            for i in range(samples):
+                f.seek(last * i // (samples - 1))
+                digest.update(f.read(block_size))
+    return digest.hexdigest()[:prefix_len]
 
 
-def write_source_info(output_dir: str, video_path: str, full_hash: str) -> Path:
+def write_source_info(
+    output_dir: str,
+    video_path: str,
+    full_hash: str | None,
+    *,
+    fingerprint: str | None = None,
+) -> Path:
     """Write source video metadata to source_info.json.
 
     Args:
         output_dir: Hash-based output directory.
         video_path: Original video file path.
-        full_hash: Full SHA-256 hash of the video.
+        full_hash: Full SHA-256 hash of the video, or None if it is still
+            being computed (see start_background_verify()). In that case
+            the previously verified hash is kept as "previous_sha256" for
+            verify_source_info() to compare against.
+        fingerprint: Fast fingerprint used as the directory name, if any.
 
     Returns:
         Path to the created source_info.json.
     """
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
+    info_path = out / SOURCE_INFO_NAME
 
     video = Path(video_path)
     info = {
@@ -64,30 +257,123 @@ def write_source_info(output_dir: str, video_path: str, full_hash: str) -> Path:
         "sha256": full_hash,
         "processed_at": datetime.now(timezone.utc).isoformat(),
     }
+    if fingerprint is not None:
+        info["fast_fingerprint"] = fingerprint
+        info["sha256_verified"] = full_hash is not None
+    if full_hash is None:
+        known = _known_sha256(info_path)
+        if known:
+            info["previous_sha256"] = known
 
-    info_path = out / "source_info.json"
-    info_path.write_text(json.dumps(info, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp_path = info_path.with_name(f"{info_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(info, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, info_path)
     print(f"Source info saved to {info_path}")
     return info_path
 
 
+def _known_sha256(info_path: Path) -> str | None:
+    """SHA-256 last verified for an output directory, if any."""
+    try:
+        previous = json.loads(info_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return previous.get("sha256") or previous.get("previous_sha256")
+
+
+def verify_source_info(output_dir: str, video_path: str) -> str:
+    """Compute the full hash and record it in an existing source_info.json.
+
+    Warns if the directory was previously verified against a different
+    SHA-256 (a fingerprint collision or a replaced file).
+
+    Args:
+        output_dir: Hash-based output directory.
+        video_path: Original video file path.
+
+    Returns:
+        Full hex string of the SHA-256 hash.
+    """
+    info_path = Path(output_dir) / SOURCE_INFO_NAME
+    try:
+        previous = json.loads(info_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+
+    full_hash = compute_full_hash(video_path)
+    known = previous.get("sha256") or previous.get("previous_sha256")
+    if known and known != full_hash:
+        print(f"Warning: {video_path} does not match the video previously processed in {output_dir}", file=sys.stderr)
+    write_source_info(output_dir, video_path, full_hash, fingerprint=previous.get("fast_fingerprint"))
+    return full_hash
+
+
+def start_background_verify(output_dir: str, video_path: str) -> subprocess.Popen:
+    """Run verify_source_info() in a detached process.
+
+    The process outlives the caller (e.g. a make recipe) and writes the full
+    SHA-256 to source_info.json when done.
+
+    Args:
+        output_dir: Hash-based output directory.
+        video_path: Original video file path.
+
+    Returns:
+        The started process.
+    """
+    cmd = [sys.executable, "-m", "src.preprocessing.hash", video_path, "--verify", output_dir]
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        stdin=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
 if __name__ == "__main__":
     import argparse
-    import sys
 
     parser = argparse.ArgumentParser(description="Compute video file hash")
     parser.add_argument("video", help="Input video file path")
     parser.add_argument("--prefix-only", action="store_true", help="Output only the hash prefix")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-read the file (ignore the hash cache)")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Use the sampled fingerprint instead of the full SHA-256 (full hash is verified in the background)",
+    )
+    parser.add_argument("--source-info", metavar="DIR", help="Write source_info.json to DIR")
+    parser.add_argument("--verify", metavar="DIR", help="Compute the full hash and record it in DIR/source_info.json")
     args = parser.parse_args()
 
     if not Path(args.video).exists():
         print(f"Error: File not found: {args.video}", file=sys.stderr)
         sys.exit(1)
 
-    full = compute_full_hash(args.video)
+    if args.verify:
+        verify_source_info(args.verify, args.video)
+        sys.exit(0)
+
+    if args.fast:
+        prefix = compute_fast_fingerprint(args.video)
+        if args.source_info:
+            cached = lookup_cached_hash(args.video)
+            write_source_info(args.source_info, args.video, cached, fingerprint=prefix)
+            if cached is None:
+                start_background_verify(args.source_info, args.video)
+        elif args.prefix_only:
+            print(prefix)
+        else:
+            print(f"Fingerprint: {prefix}")
+        sys.exit(0)
+
+    full = compute_full_hash(args.video, use_cache=not args.no_cache)
     prefix = full[:HASH_PREFIX_LEN]
 
-    if args.prefix_only:
+    if args.source_info:
+        write_source_info(args.source_info, args.video, full)
+    elif args.prefix_only:
         print(prefix)
     else:
         print(f"SHA-256: {full}")
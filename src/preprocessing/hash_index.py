@@ -0,0 +1,238 @@
+"""Persistent per-frame pHash index.
+
+Stores the pHash (and sharpness score) of every frame in frames/ so
+deduplication can be re-run with a different threshold without decoding a
+single image. The index is three files next to the frames:
+
+- .phash_index.npy: uint64 array of hashes
+- .phash_sharpness.npy: float32 array of Laplacian-variance sharpness
+- .phash_index.json: frame name table with file size and mtime
+
+An entry is reused only while the frame's size and mtime are unchanged;
+new or modified frames are re-hashed and the index is rewritten.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.preprocessing.phash import hamming_distance, phash_files_with_sharpness
+
+INDEX_HASHES = ".phash_index.npy"
+INDEX_SHARPNESS = ".phash_sharpness.npy"
+INDEX_TABLE = ".phash_index.json"
+INDEX_VERSION = 2
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def load_hash_index(frame_dir: str | Path) -> dict[str, tuple[int, int, int, float]]:
+    """Load the stored index for a frame directory.
+
+    Args:
+        frame_dir: Directory containing frames and the index files.
+
+    Returns:
+        Dict mapping frame name to (size, mtime_ns, hash, sharpness). Empty
+        if the index is missing, unreadable or from another version.
+    """
+    src = Path(frame_dir)
+    table_path = src / INDEX_TABLE
+    hashes_path = src / INDEX_HASHES
+    sharpness_path = src / INDEX_SHARPNESS
+    if not table_path.exists() or not hashes_path.exists() or not sharpness_path.exists():
+        return {}
+
+    try:
+        table = json.loads(table_path.read_text(encoding="utf-8"))
+        hashes = np.load(hashes_path)
+        sharpness = np.load(sharpness_path)
+    except (OSError, ValueError):
+        return {}
+    entries = table.get("frames", [])
+    if table.get("version") != INDEX_VERSION or not len(entries) == len(hashes) == len(sharpness):
+        return {}
+
+    return {
+        entry["name"]: (entry["size"], entry["mtime_ns"], int(h), float(sh))
+        for entry, h, sh in zip(entries, hashes, sharpness)
+    }
+
+
+def save_hash_index(
+    frame_dir: str | Path,
+    frames: Sequence[Path],
+    hashes: np.ndarray,
+    sharpness: np.ndarray,
+) -> None:
+    """Write the index for the given frames.
+
+    Args:
+        frame_dir: Directory containing frames.
+        frames: Frame paths, aligned with hashes.
+        hashes: uint64 hash array.
+        sharpness: float32 sharpness array, aligned with hashes.
+    """
+    src = Path(frame_dir)
+    entries = []
+    for frame in frames:
+        size, mtime_ns = _stat_key(frame)
+        entries.append({"name": frame.name, "size": size, "mtime_ns": mtime_ns})
+
+    np.save(src / INDEX_HASHES, np.asarray(hashes, dtype=np.uint64))
+    np.save(src / INDEX_SHARPNESS, np.asarray(sharpness, dtype=np.float32))
+    (src / INDEX_TABLE).write_text(
+        json.dumps({"version": INDEX_VERSION, "frames": entries}),
+        encoding="utf-8",
+    )
+
+
+def frame_features(
+    frames: Sequence[Path],
+    workers: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return pHashes and sharpness for frames, reusing the on-disk index.
+
+    All frames must live in the same directory. Only frames that are new or
+    whose size/mtime changed are decoded; the index is rewritten when any
+    entry was (re)computed.
+
+    Args:
+        frames: Frame paths (same directory).
+        workers: Decode threads for frames that need hashing.
+
+    Returns:
+        Tuple of (uint64 hashes, float32 sharpness) aligned with frames.
+    """
+    if not frames:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.float32)
+
+    frame_dir = frames[0].parent
+    index = load_hash_index(frame_dir)
+
+    hashes = np.empty(len(frames), dtype=np.uint64)
+    sharpness = np.empty(len(frames), dtype=np.float32)
+    stale: list[int] = []
+    for i, frame in enumerate(frames):
+        cached = index.get(frame.name)
+        if cached is not None and cached[:2] == _stat_key(frame):
+            hashes[i], sharpness[i] = cached[2], cached[3]
+        else:
+            stale.append(i)
+
+    if stale:
+        hashes[stale], sharpness[stale] = phash_files_with_sharpness([frames[i] for i in stale], workers=workers)
+        # Merge with entries for frames outside this call (e.g. beyond --limit)
+        all_frames = sorted(frame_dir.glob("frame_*.png"))
+        known = {f.name: (h, sh) for f, h, sh in zip(frames, hashes, sharpness)}
+        for f in all_frames:
+            cached = index.get(f.name)
+            if f.name not in known and cached is not None and cached[:2] == _stat_key(f):
+                known[f.name] = (cached[2], cached[3])
+        keep = [f for f in all_frames if f.name in known]
+        try:
+            save_hash_index(
+                frame_dir,
+                keep,
+                np.array([known[f.name][0] for f in keep], dtype=np.uint64),
+                np.array([known[f.name][1] for f in keep], dtype=np.float32),
+            )
+        except OSError as e:
+            print(f"Warning: could not write hash index: {e}")
+
+    return hashes, sharpness
+
+
+def frame_hashes(
+    frames: Sequence[Path],
+    workers: int | None = None,
+) -> np.ndarray:
+    """Return pHashes for frames, reusing the on-disk index where valid.
+
+    Args:
+        frames: Frame paths (same directory).
+        workers: Decode threads for frames that need hashing.
+
+    Returns:
+        uint64 array of hashes aligned with frames.
+    """
+    return frame_features(frames, workers=workers)[0]
+
+
+def group_runs(hashes: Sequence[int] | np.ndarray, hash_threshold: int) -> list[list[int]]:
+    """Group consecutive near-identical frames into runs.
+
+    A frame joins the current run when its distance to the run's first
+    frame is below hash_threshold (the deduplicate_frames() rule);
+    otherwise it starts a new run.
+
+    Args:
+        hashes: Frame hashes in order.
+        hash_threshold: Max hamming distance to consider frames as duplicates.
+
+    Returns:
+        Lists of frame indices, one per run.
+    """
+    runs: list[list[int]] = []
+    anchor = None
+    for i, current_hash in enumerate(hashes):
+        if anchor is not None and hamming_distance(current_hash, anchor) < hash_threshold:
+            runs[-1].append(i)
+            continue
+        runs.append([i])
+        anchor = current_hash
+    return runs
+
+
+def select_unique(
+    hashes: Sequence[int] | np.ndarray,
+    hash_threshold: int,
+    sharpness: Sequence[float] | np.ndarray | None = None,
+) -> list[int]:
+    """Pick one frame index per run of near-identical frames.
+
+    Args:
+        hashes: Frame hashes in order.
+        hash_threshold: Max hamming distance to consider frames as duplicates.
+        sharpness: Per-frame sharpness scores. If given, the sharpest frame
+            of each run is kept; otherwise the first.
+
+    Returns:
+        Indices of kept frames.
+    """
+    runs = group_runs(hashes, hash_threshold)
+    if sharpness is None:
+        return [run[0] for run in runs]
+    return [max(run, key=lambda i: sharpness[i]) for run in runs]
+
+
+def preview_thresholds(
+    frame_dir: str,
+    thresholds: Sequence[int],
+    *,
+    limit: int | None = None,
+    workers: int | None = None,
+) -> dict[int, int]:
+    """Count how many pages each candidate threshold would keep.
+
+    Args:
+        frame_dir: Directory containing extracted frames.
+        thresholds: Candidate hash_threshold values.
+        limit: Consider only first N frames.
+        workers: Decode threads for frames missing from the index.
+
+    Returns:
+        Dict mapping threshold to number of kept pages.
+    """
+    frames = sorted(Path(frame_dir).glob("frame_*.png"))
+    if limit:
+        frames = frames[:limit]
+    hashes = frame_hashes(frames, workers=workers)
+    return {t: len(select_unique(hashes, t)) for t in thresholds}
@@ -0,0 +1,180 @@
+"""Crop boxes for trimming and splitting pages, and virtual pages built from them.
+
+Everything here works from image sizes alone: split_spread crops these
+boxes out of decoded images, and split-spreads --virtual records them in a
+pages.json manifest without decoding any page (see PageRef).
+"""
+
+from dataclasses import dataclass
+
+from src.preprocessing.pages import Box, PageRef
+
+
+@dataclass
+class TrimConfig:
+    """Configuration for image trimming operations.
+
+    Supports two-stage trimming:
+    1. Global trim: Applied before splitting (all 4 sides)
+    2. Split trim: Applied after splitting (all 4 edges, spread mode only)
+       - left_page_outer: Left page's left edge (outer edge)
+       - left_page_inner: Left page's right edge (binding/inner edge)
+       - right_page_inner: Right page's left edge (binding/inner edge)
+       - right_page_outer: Right page's right edge (outer edge)
+
+    All trim values are percentages (0.0-0.5) of the image dimension.
+    Values >= 0.5 are invalid (would remove half or more of the image).
+    """
+
+    # Global trim (applied before splitting)
+    global_top: float = 0.0
+    global_bottom: float = 0.0
+    global_left: float = 0.0
+    global_right: float = 0.0
+
+    # Split trim (applied after splitting, spread mode only)
+    left_page_outer: float = 0.0
+    left_page_inner: float = 0.0
+    right_page_inner: float = 0.0
+    right_page_outer: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Validate all trim values are in valid range [0.0, 0.5)."""
+        validate_trim_value(self.global_top, "global_top")
+        validate_trim_value(self.global_bottom, "global_bottom")
+        validate_trim_value(self.global_left, "global_left")
+        validate_trim_value(self.global_right, "global_right")
+        validate_trim_value(self.left_page_outer, "left_page_outer")
+        validate_trim_value(self.left_page_inner, "left_page_inner")
+        validate_trim_value(self.right_page_inner, "right_page_inner")
+        validate_trim_value(self.right_page_outer, "right_page_outer")
+
+
+def validate_trim_value(value: float, field_name: str) -> None:
+    """Validate that a trim value is within acceptable range.
+
+    Args:
+        value: Trim percentage (0.0-0.5).
+        field_name: Name of the field being validated (for error messages).
+
+    Raises:
+        ValueError: If value is outside [0.0, 0.5) range.
+    """
+    if not (0.0 <= value < 0.5):
+        raise ValueError(
+            f"Invalid trim value for {field_name}: {value}. Must be between 0.0 (inclusive) and 0.5 (exclusive)."
+        )
+
+
+def global_trim_box(size: tuple[int, int], trim_config: TrimConfig) -> Box:
+    """Compute the global-trim crop box for an image size.
+
+    Args:
+        size: Image (width, height).
+        trim_config: Trim configuration with global trim values.
+
+    Returns:
+        Crop box (left, upper, right, lower).
+    """
+    width, height = size
+
+    # Calculate trim pixels
+    top_px = int(height * trim_config.global_top)
+    bottom_px = int(height * trim_config.global_bottom)
+    left_px = int(width * trim_config.global_left)
+    right_px = int(width * trim_config.global_right)
+
+    return (
+        left_px,
+        top_px,
+        width - right_px,
+        height - bottom_px,
+    )
+
+
+def split_spread_boxes(
+    size: tuple[int, int],
+    overlap_px: int = 0,
+    left_trim_pct: float = 0.0,
+    right_trim_pct: float = 0.0,
+    left_inner_trim_pct: float = 0.0,
+    right_inner_trim_pct: float = 0.0,
+    gutter_x: int | None = None,
+) -> tuple[Box, Box]:
+    """Compute the left and right page crop boxes for a spread.
+
+    Args:
+        size: Spread image (width, height).
+        overlap_px: Pixels of overlap to include from center.
+        left_trim_pct: Percentage to trim from left edge of left page (outer edge).
+        right_trim_pct: Percentage to trim from right edge of right page (outer edge).
+        left_inner_trim_pct: Percentage to trim from right edge of left page (inner edge).
+        right_inner_trim_pct: Percentage to trim from left edge of right page (inner edge).
+        gutter_x: Split position in pixels. Defaults to the center. Trims
+            are then relative to each page's own width.
+
+    Returns:
+        Tuple of (left_box, right_box).
+    """
+    width, height = size
+    mid_x = width // 2 if gutter_x is None else gutter_x
+    half_width = mid_x
+    right_half_width = mid_x if gutter_x is None else width - gutter_x
+
+    # Calculate trim pixels for outer edges
+    left_outer_trim_px = int(half_width * left_trim_pct)
+    right_outer_trim_px = int(right_half_width * right_trim_pct)
+
+    # Calculate trim pixels for inner edges
+    left_inner_trim_px = int(half_width * left_inner_trim_pct)
+    right_inner_trim_px = int(right_half_width * right_inner_trim_pct)
+
+    # Left page: from left_outer_trim to mid_x - left_inner_trim + overlap
+    left_box = (left_outer_trim_px, 0, mid_x + overlap_px - left_inner_trim_px, height)
+
+    # Right page: from mid_x + right_inner_trim - overlap to width - right_outer_trim
+    right_box = (mid_x - overlap_px + right_inner_trim_px, 0, width - right_outer_trim_px, height)
+
+    return left_box, right_box
+
+
+def gutter_x(width: int, gutter_ratio: float | None) -> int | None:
+    """Gutter position in pixels, or None to split at the center."""
+    return None if gutter_ratio is None else round(width * gutter_ratio)
+
+
+def virtual_pages(
+    page: PageRef,
+    spread: bool,
+    trim_config: TrimConfig | None,
+    overlap_px: int,
+    split_trims: tuple[float, float, float, float],
+    gutter_ratio: float | None = None,
+) -> list[PageRef]:
+    """Compute the crop-on-read pages for one source page without decoding it.
+
+    Boxes are identical to what split_spread_pages() crops when it encodes
+    page files, expressed in the coordinates of page.source.
+
+    Args:
+        page: Source page.
+        spread: Split the page into left and right pages (spread mode).
+        trim_config: Global trim configuration, if any.
+        overlap_px: Pixels of overlap from center.
+        split_trims: (left outer, right outer, left inner, right inner) trim.
+        gutter_ratio: Split position as a fraction of the trimmed width
+            (default: center).
+
+    Returns:
+        One page (single mode) or the left and right pages (spread mode).
+    """
+    trimmed = page
+    if trim_config is not None:
+        trimmed = page.crop(page.name, global_trim_box(page.size(), trim_config))
+
+    if not spread:
+        return [trimmed]
+
+    size = trimmed.size()
+    left_box, right_box = split_spread_boxes(size, overlap_px, *split_trims, gutter_x(size[0], gutter_ratio))
+    return [trimmed.crop(f"{page.stem}_L.png", left_box), trimmed.crop(f"{page.stem}_R.png", right_box)]
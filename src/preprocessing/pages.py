@@ -0,0 +1,167 @@
+"""Manifest-backed page listing.
+
+A pages directory either holds real page_NNNN.png files or a pages.json
+manifest mapping page names to source images elsewhere (e.g. frames/).
+Manifest entries may carry a crop box, making them "virtual pages": the
+page is cropped from its source when read, so trimming and splitting never
+re-encode images. Later stages call list_pages() and PageRef.open(), which
+transparently read either form.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeAlias, TypeVar
+
+from PIL import Image
+
+MANIFEST_NAME = "pages.json"
+
+# Crop box in source pixel coordinates: (left, upper, right, lower)
+Box: TypeAlias = tuple[int, int, int, int]
+
+T = TypeVar("T")
+
+
+@dataclass
+class PageRef:
+    """A page image, either a real file or a manifest entry."""
+
+    name: str  # Page filename, e.g. "page_0001.png"
+    source: Path  # File holding the pixels
+    box: Box | None = None  # Crop box within source (None = whole image)
+
+    @property
+    def stem(self) -> str:
+        """Page name without extension."""
+        return Path(self.name).stem
+
+    def open(self) -> Image.Image:
+        """Open the page image, cropping it from the source if needed."""
+        if self.box is None:
+            return Image.open(self.source)
+        with Image.open(self.source) as img:
+            return img.crop(self.box)
+
+    def size(self) -> tuple[int, int]:
+        """Page (width, height) without decoding pixels."""
+        if self.box is not None:
+            return self.box[2] - self.box[0], self.box[3] - self.box[1]
+        with Image.open(self.source) as img:
+            return img.size
+
+    def crop(self, name: str, box: Box) -> PageRef:
+        """Return a virtual page for a box given in this page's coordinates."""
+        left, upper = (self.box[0], self.box[1]) if self.box is not None else (0, 0)
+        return PageRef(
+            name=name,
+            source=self.source,
+            box=(box[0] + left, box[1] + upper, box[2] + left, box[3] + upper),
+        )
+
+
+def write_manifest(pages_dir: str | Path, pages: list[PageRef]) -> Path:
+    """Write a page manifest; sources are stored relative to pages_dir.
+
+    Args:
+        pages_dir: Directory the manifest describes.
+        pages: Pages in order.
+
+    Returns:
+        Path to the manifest file.
+    """
+    base = Path(pages_dir)
+    base.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for p in pages:
+        entry = {"name": p.name, "source": os.path.relpath(p.source.resolve(), base.resolve())}
+        if p.box is not None:
+            entry["box"] = list(p.box)
+        entries.append(entry)
+    manifest_path = base / MANIFEST_NAME
+    manifest_path.write_text(json.dumps({"pages": entries}, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest_path
+
+
+def read_manifest(pages_dir: str | Path) -> list[PageRef] | None:
+    """Read a page manifest.
+
+    Args:
+        pages_dir: Directory that may contain a manifest.
+
+    Returns:
+        Pages in manifest order, or None if there is no manifest.
+    """
+    base = Path(pages_dir)
+    manifest_path = base / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    return [
+        PageRef(
+            name=e["name"],
+            source=(base / e["source"]).resolve(),
+            box=tuple(e["box"]) if e.get("box") else None,
+        )
+        for e in data.get("pages", [])
+    ]
+
+
+def list_pages(pages_dir: str | Path, pattern: str = "*.png") -> list[PageRef]:
+    """List pages in a directory, preferring a manifest when present.
+
+    Args:
+        pages_dir: Pages directory.
+        pattern: Glob pattern for real page files.
+
+    Returns:
+        Pages sorted by name.
+    """
+    manifest = read_manifest(pages_dir)
+    if manifest is not None:
+        return sorted(manifest, key=lambda p: p.name)
+    return [PageRef(name=p.name, source=p) for p in sorted(Path(pages_dir).glob(pattern))]
+
+
+def remove_manifest(pages_dir: str | Path) -> None:
+    """Delete the manifest in pages_dir if present."""
+    (Path(pages_dir) / MANIFEST_NAME).unlink(missing_ok=True)
+
+
+def renumber_manifest(pages_dir: str | Path) -> list[PageRef] | None:
+    """Rename manifest pages to page_0001.png, page_0002.png, ... in order.
+
+    Args:
+        pages_dir: Directory that may contain a manifest.
+
+    Returns:
+        Renumbered pages, or None if there is no manifest.
+    """
+    pages = read_manifest(pages_dir)
+    if pages is None:
+        return None
+    renumbered = [
+        PageRef(name=f"page_{i:04d}.png", source=p.source, box=p.box)
+        for i, p in enumerate(sorted(pages, key=lambda p: p.name), 1)
+    ]
+    write_manifest(pages_dir, renumbered)
+    return renumbered
+
+
+def sample_pages(pages: Sequence[T], samples: int) -> list[T]:
+    """Pick up to samples pages evenly spread over the book.
+
+    The first and last pages are always included; a single sample is the
+    middle page.
+    """
+    if len(pages) <= samples:
+        return list(pages)
+    if samples <= 0:
+        return []
+    if samples == 1:
+        return [pages[(len(pages) - 1) // 2]]
+    return [pages[round(i * (len(pages) - 1) / (samples - 1))] for i in range(samples)]
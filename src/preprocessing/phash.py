@@ -0,0 +1,137 @@
+"""Batched perceptual hashing for frame deduplication.
+
+Frames are decoded and downscaled in a thread pool (PIL releases the GIL
+while decoding and resizing), then DCT-based pHashes for a whole batch are
+computed as one array operation. Hashes are packed into uint64 values and
+match imagehash.phash() bit for bit, so hamming distances keep the same
+hash_threshold semantics.
+
+The same decode pass can also score sharpness (variance of the Laplacian
+on a downscaled grayscale copy), used to pick the best frame of a run.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import scipy.fftpack
+from PIL import Image
+
+HASH_SIZE = 8
+HIGHFREQ_FACTOR = 4
+IMG_SIZE = HASH_SIZE * HIGHFREQ_FACTOR
+DEFAULT_BATCH_SIZE = 256
+SHARPNESS_SIZE = 512  # Longest side of the image used for sharpness scoring
+
+
+def phash_thumbnail(img: Image.Image) -> np.ndarray:
+    """Downscale an image to the 32x32 grayscale input used by pHash."""
+    small = img.convert("L").resize((IMG_SIZE, IMG_SIZE), Image.Resampling.LANCZOS)
+    return np.asarray(small)
+
+
+def load_thumbnail(path: str | Path) -> np.ndarray:
+    """Decode an image file and return its 32x32 grayscale pHash input."""
+    with Image.open(path) as img:
+        return phash_thumbnail(img)
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """Variance of the 4-neighbour Laplacian; higher means sharper."""
+    if gray.shape[0] < 3 or gray.shape[1] < 3:
+        return 0.0
+    lap = gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1] - 4.0 * gray[1:-1, 1:-1]
+    return float(lap.var())
+
+
+def load_features(path: str | Path) -> tuple[np.ndarray, float]:
+    """Decode an image file once and return (pHash input, sharpness score)."""
+    with Image.open(path) as img:
+        gray = img.convert("L")
+    thumb = np.asarray(gray.resize((IMG_SIZE, IMG_SIZE), Image.Resampling.LANCZOS))
+    gray.thumbnail((SHARPNESS_SIZE, SHARPNESS_SIZE))
+    return thumb, laplacian_variance(np.asarray(gray, dtype=np.float32))
+
+
+def phash_pixels(pixels: np.ndarray) -> np.ndarray:
+    """Compute pHashes for a stack of 32x32 grayscale thumbnails.
+
+    Args:
+        pixels: Array of shape (N, 32, 32).
+
+    Returns:
+        uint64 array of shape (N,), one packed 64-bit hash per image.
+    """
+    if len(pixels) == 0:
+        return np.empty(0, dtype=np.uint64)
+    dct = scipy.fftpack.dct(scipy.fftpack.dct(pixels, axis=1), axis=2)
+    lowfreq = dct[:, :HASH_SIZE, :HASH_SIZE].reshape(len(pixels), -1)
+    med = np.median(lowfreq, axis=1, keepdims=True)
+    bits = lowfreq > med
+    return np.packbits(bits, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def phash_image(img: Image.Image) -> int:
+    """Compute the pHash of a single image as a 64-bit integer."""
+    return int(phash_pixels(phash_thumbnail(img)[np.newaxis])[0])
+
+
+def phash_files(
+    paths: Sequence[str | Path],
+    workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> np.ndarray:
+    """Compute pHashes for image files using a thread pool for decoding.
+
+    Args:
+        paths: Image file paths.
+        workers: Decode threads (default: CPU count).
+        batch_size: Images per vectorized hashing batch.
+
+    Returns:
+        uint64 array of hashes, in the same order as paths.
+    """
+    workers = workers or os.cpu_count() or 1
+    hashes = np.empty(len(paths), dtype=np.uint64)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(paths), batch_size):
+            batch = paths[start : start + batch_size]
+            pixels = np.stack(list(pool.map(load_thumbnail, batch)))
+            hashes[start : start + len(batch)] = phash_pixels(pixels)
+    return hashes
+
+
+def phash_files_with_sharpness(
+    paths: Sequence[str | Path],
+    workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute pHashes and sharpness scores for image files in one decode pass.
+
+    Args:
+        paths: Image file paths.
+        workers: Decode threads (default: CPU count).
+        batch_size: Images per vectorized hashing batch.
+
+    Returns:
+        Tuple of (uint64 hashes, float32 sharpness), aligned with paths.
+    """
+    workers = workers or os.cpu_count() or 1
+    hashes = np.empty(len(paths), dtype=np.uint64)
+    sharpness = np.empty(len(paths), dtype=np.float32)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(paths), batch_size):
+            batch = paths[start : start + batch_size]
+            features = list(pool.map(load_features, batch))
+            hashes[start : start + len(batch)] = phash_pixels(np.stack([f[0] for f in features]))
+            sharpness[start : start + len(batch)] = [f[1] for f in features]
+    return hashes, sharpness
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Hamming distance between two packed 64-bit hashes."""
+    return (int(a) ^ int(b)).bit_count()
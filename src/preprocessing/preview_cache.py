@@ -0,0 +1,148 @@
+"""Decoded-frame cache and incremental rendering for trim previews.
+
+Each preview frame is decoded once into an RGB array stored as a .npy
+file in a hidden directory next to the frames. Previews are full
+resolution by default; a smaller level (longest side max_side) is only
+built when a caller asks for one, and is downscaled from the cached
+full-resolution array when there is one. Array files are named after the
+frame's size and mtime, so a replaced frame is re-decoded automatically.
+
+Rendered previews are written incrementally: a stamp file in the output
+directory records what each output was rendered from, and outputs whose
+inputs and parameters are unchanged are not re-rendered.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+CACHE_DIRNAME = ".preview_cache"
+RENDER_STAMP = ".render.json"
+FULL_LEVEL = "full"  # Level name of the full-resolution array
+
+
+def _source_key(frame: Path) -> str:
+    st = frame.stat()
+    return f"{st.st_size}-{st.st_mtime_ns}"
+
+
+def _resize(img: Image.Image, side: int) -> Image.Image:
+    if max(img.size) <= side:
+        return img
+    scale = side / max(img.size)
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    return img.resize(size, Image.Resampling.BILINEAR)
+
+
+def build_level(frame: str | Path, cache_dir: str | Path, max_side: int | None = None) -> Path:
+    """Store one cached level of a frame, decoding the frame only if needed.
+
+    Args:
+        frame: Source image path.
+        cache_dir: Directory for cached levels.
+        max_side: Longest side of the level (None: full resolution).
+
+    Returns:
+        Path of the level's .npy file.
+    """
+    src = Path(frame)
+    cache = Path(cache_dir)
+    cache.mkdir(parents=True, exist_ok=True)
+    prefix = f"{src.stem}.{_source_key(src)}."
+
+    # Drop levels of an older version of this frame
+    for stale in cache.glob(f"{src.stem}.*.npy"):
+        if not stale.name.startswith(prefix):
+            stale.unlink(missing_ok=True)
+
+    full = cache / f"{prefix}{FULL_LEVEL}.npy"
+    if full.exists():
+        level = Image.fromarray(np.load(full))
+    else:
+        with Image.open(src) as img:
+            level = img.convert("RGB")
+        np.save(full, np.asarray(level))
+    if max_side is None:
+        return full
+
+    path = cache / f"{prefix}{max_side}.npy"
+    np.save(path, np.asarray(_resize(level, max_side)))
+    return path
+
+
+def _cached_level(frame: Path, cache_dir: str | Path, max_side: int | None) -> Path:
+    """Path of the cached level for max_side, building it on a miss."""
+    level = FULL_LEVEL if max_side is None else str(max_side)
+    path = Path(cache_dir) / f"{frame.stem}.{_source_key(frame)}.{level}.npy"
+    return path if path.exists() else build_level(frame, cache_dir, max_side)
+
+
+def load_preview(frame: str | Path, cache_dir: str | Path, max_side: int | None = None) -> Image.Image:
+    """Return an RGB preview of a frame, decoding it only on a cache miss.
+
+    Args:
+        frame: Source image path.
+        cache_dir: Directory for cached levels.
+        max_side: Longest side of the preview (None: full resolution).
+
+    Returns:
+        Preview image (never larger than the source).
+    """
+    return Image.fromarray(np.load(_cached_level(Path(frame), cache_dir, max_side)))
+
+
+def preview_size(frame: str | Path, cache_dir: str | Path, max_side: int | None = None) -> tuple[int, int]:
+    """Return the (width, height) load_preview() would return, without loading pixels."""
+    height, width = np.load(_cached_level(Path(frame), cache_dir, max_side), mmap_mode="r").shape[:2]
+    return width, height
+
+
+def preview_key(frame: str | Path) -> str:
+    """Identity of a frame's current version, for render stamps."""
+    src = Path(frame)
+    return f"{src.name}:{_source_key(src)}"
+
+
+def render_incremental(
+    output_dir: str | Path,
+    jobs: Sequence[tuple[str, str, Callable[[], Image.Image]]],
+) -> tuple[list[Path], int]:
+    """Render outputs whose inputs changed and remove outputs no longer produced.
+
+    Args:
+        output_dir: Directory for rendered images.
+        jobs: (output name, render key, render function) per output. An
+            output is re-rendered only if its key differs from the last run.
+
+    Returns:
+        Tuple of (output paths in job order, number of outputs rendered).
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    stamp_path = out / RENDER_STAMP
+    try:
+        previous = json.loads(stamp_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+
+    stamp: dict[str, str] = {}
+    outputs: list[Path] = []
+    rendered = 0
+    for name, key, render in jobs:
+        path = out / name
+        if previous.get(name) != key or not path.exists():
+            # Previews are throwaway: favour encode speed over file size
+            render().save(path, compress_level=1)
+            rendered += 1
+        stamp[name] = key
+        outputs.append(path)
+
+    for name in previous.keys() - stamp.keys():
+        (out / name).unlink(missing_ok=True)
+    stamp_path.write_text(json.dumps(stamp, indent=2), encoding="utf-8")
+    return outputs, rendered
@@ -0,0 +1,144 @@
+"""Scene-change driven frame sampling.
+
+Instead of sampling at a fixed interval, the video is decoded at a modest
+rate through a pipe and a cheap frame-difference signal (mean absolute
+difference of small grayscale thumbnails) is tracked. A frame is written
+only once the image has settled after a change, so a page that sits still
+for 30 seconds yields one frame and a fast page flip is not skipped.
+
+Output follows the same frames/frame_NNNN.png contract as extract_frames().
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from src.preprocessing.stream import build_pipe_command, read_bmp_frames
+
+SIGNATURE_SIZE = (64, 48)
+
+
+def frame_signature(img: Image.Image) -> np.ndarray:
+    """Downscale a frame to a small grayscale float array for differencing."""
+    small = img.convert("L").resize(SIGNATURE_SIZE, Image.Resampling.BILINEAR)
+    return np.asarray(small, dtype=np.float32)
+
+
+def frame_difference(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean absolute difference between two signatures (0-255 scale)."""
+    return float(np.mean(np.abs(a - b)))
+
+
+def select_settled_frames(
+    frames: Iterator[Image.Image],
+    settle_threshold: float = 1.5,
+    change_threshold: float = 3.0,
+    settle_frames: int = 2,
+) -> Iterator[Image.Image]:
+    """Yield one frame per settled scene.
+
+    A frame counts as settled once the difference to its predecessor has
+    stayed below settle_threshold for settle_frames consecutive samples. A
+    settled frame is emitted if it differs from the last emitted frame by
+    more than change_threshold.
+
+    Args:
+        frames: Decoded frames in time order.
+        settle_threshold: Max frame-to-frame difference treated as "still".
+        change_threshold: Min difference from the last emitted frame to emit again.
+        settle_frames: Consecutive still samples required before emitting.
+
+    Yields:
+        Frames to keep, in time order.
+    """
+    prev: np.ndarray | None = None
+    last_emitted: np.ndarray | None = None
+    still_count = 0
+
+    for img in frames:
+        sig = frame_signature(img)
+        if prev is not None and frame_difference(sig, prev) <= settle_threshold:
+            still_count += 1
+        else:
+            still_count = 0
+        prev = sig
+
+        if still_count < settle_frames:
+            continue
+        if last_emitted is None or frame_difference(sig, last_emitted) > change_threshold:
+            last_emitted = sig
+            yield img
+
+
+def extract_scene_frames(
+    video_path: str,
+    output_dir: str,
+    sample_fps: float = 4.0,
+    settle_threshold: float = 1.5,
+    change_threshold: float = 3.0,
+    settle_frames: int = 2,
+) -> list[Path]:
+    """Extract one frame per settled scene from video.
+
+    Args:
+        video_path: Path to input video file.
+        output_dir: Directory to save extracted frames (frame_NNNN.png).
+        sample_fps: Rate at which frames are decoded for change detection.
+        settle_threshold: Max frame-to-frame difference treated as "still".
+        change_threshold: Min difference from the last emitted frame to emit again.
+        settle_frames: Consecutive still samples required before emitting.
+
+    Returns:
+        Sorted list of extracted frame paths.
+
+    Raises:
+        RuntimeError: If FFmpeg fails.
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    cmd = build_pipe_command(video_path, 1.0 / sample_fps)
+    # Not a pipe: FFmpeg must never block on unread stderr (see stream.py)
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log)
+
+    frames: list[Path] = []
+    try:
+        settled = select_settled_frames(read_bmp_frames(proc.stdout), settle_threshold, change_threshold, settle_frames)
+        for img in settled:
+            out_path = out / f"frame_{len(frames) + 1:04d}.png"
+            img.save(out_path)
+            frames.append(out_path)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+        log.seek(0)
+        stderr = log.read().decode(errors="replace")
+        log.close()
+
+    if returncode != 0:
+        print(f"FFmpeg error: {stderr}", file=sys.stderr)
+        raise RuntimeError("FFmpeg frame extraction failed")
+
+    print(f"Extracted {len(frames)} settled frames to {out}")
+    return frames
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract frames on scene changes")
+    parser.add_argument("video", help="Input video file path")
+    parser.add_argument("-o", "--output", default="output/frames", help="Output directory")
+    parser.add_argument("--sample-fps", type=float, default=4.0, help="Decode rate for change detection")
+    args = parser.parse_args()
+
+    extract_scene_frames(args.video, args.output, args.sample_fps)
@@ -6,12 +6,31 @@ It splits them into individual page images for proper OCR processing.
 
 import os
 import warnings
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import partial
 from pathlib import Path
 
 from PIL import Image
 
+from src.preprocessing.gutter import estimate_gutter
+from src.preprocessing.page_boxes import (
+    TrimConfig,
+    global_trim_box,
+    gutter_x,
+    split_spread_boxes,
+    validate_trim_value,  # noqa: F401 - re-exported
+    virtual_pages,
+)
+from src.preprocessing.pages import (
+    PageRef,
+    list_pages,
+    read_manifest,
+    remove_manifest,
+    renumber_manifest,
+    write_manifest,
+)
+
 
 class SpreadMode(Enum):
     """Processing mode for image splitting."""
@@ -20,62 +39,6 @@ class SpreadMode(Enum):
     SPREAD = "spread"
 
 
-@dataclass
-class TrimConfig:
-    """Configuration for image trimming operations.
-
-    Supports two-stage trimming:
-    1. Global trim: Applied before splitting (all 4 sides)
-    2. Split trim: Applied after splitting (all 4 edges, spread mode only)
-       - left_page_outer: Left page's left edge (outer edge)
-       - left_page_inner: Left page's right edge (binding/inner edge)
-       - right_page_inner: Right page's left edge (binding/inner edge)
-       - right_page_outer: Right page's right edge (outer edge)
-
-    All trim values are percentages (0.0-0.5) of the image dimension.
-    Values >= 0.5 are invalid (would remove half or more of the image).
-    """
-
-    # Global trim (applied before splitting)
-    global_top: float = 0.0
-    global_bottom: float = 0.0
-    global_left: float = 0.0
-    global_right: float = 0.0
-
-    # Split trim (applied after splitting, spread mode only)
-    left_page_outer: float = 0.0
-    left_page_inner: float = 0.0
-    right_page_inner: float = 0.0
-    right_page_outer: float = 0.0
-
-    def __post_init__(self) -> None:
-        """Validate all trim values are in valid range [0.0, 0.5)."""
-        validate_trim_value(self.global_top, "global_top")
-        validate_trim_value(self.global_bottom, "global_bottom")
-        validate_trim_value(self.global_left, "global_left")
-        validate_trim_value(self.global_right, "global_right")
-        validate_trim_value(self.left_page_outer, "left_page_outer")
-        validate_trim_value(self.left_page_inner, "left_page_inner")
-        validate_trim_value(self.right_page_inner, "right_page_inner")
-        validate_trim_value(self.right_page_outer, "right_page_outer")
-
-
-def validate_trim_value(value: float, field_name: str) -> None:
-    """Validate that a trim value is within acceptable range.
-
-    Args:
-        value: Trim percentage (0.0-0.5).
-        field_name: Name of the field being validated (for error messages).
-
-    Raises:
-        ValueError: If value is outside [0.0, 0.5) range.
-    """
-    if not (0.0 <= value < 0.5):
-        raise ValueError(
-            f"Invalid trim value for {field_name}: {value}. Must be between 0.0 (inclusive) and 0.5 (exclusive)."
-        )
-
-
 def apply_global_trim(img: Image.Image, trim_config: TrimConfig) -> Image.Image:
     """Apply global trim to image before splitting.
 
@@ -89,24 +52,7 @@ def apply_global_trim(img: Image.Image, trim_config: TrimConfig) -> Image.Image:
     Returns:
         New PIL Image with global trim applied.
     """
-    width, height = img.size
-
-    # Calculate trim pixels
-    top_px = int(height * trim_config.global_top)
-    bottom_px = int(height * trim_config.global_bottom)
-    left_px = int(width * trim_config.global_left)
-    right_px = int(width * trim_config.global_right)
-
-    # Calculate crop box (left, upper, right, lower)
-    crop_box = (
-        left_px,
-        top_px,
-        width - right_px,
-        height - bottom_px,
-    )
-
-    # Return cropped image
-    return img.crop(crop_box)
+    return img.crop(global_trim_box(img.size, trim_config))
 
 
 def get_spread_mode(cli_mode: str | None = None) -> SpreadMode:
@@ -178,6 +124,7 @@ def split_spread(
     right_trim_pct: float = 0.0,
     left_inner_trim_pct: float = 0.0,
     right_inner_trim_pct: float = 0.0,
+    gutter_x: int | None = None,
 ) -> tuple[Image.Image, Image.Image]:
     """Split a spread image into left and right pages.
 
@@ -191,29 +138,61 @@ def split_spread(
             E.g., 0.03 = 3% trimmed from outer edge.
         left_inner_trim_pct: Percentage to trim from right edge of left page (inner edge) (0.0-1.0).
         right_inner_trim_pct: Percentage to trim from left edge of right page (inner edge) (0.0-1.0).
+        gutter_x: Split position in pixels (default: center).
 
     Returns:
         Tuple of (left_page, right_page) as PIL Images.
     """
-    width, height = img.size
-    mid_x = width // 2
-    half_width = mid_x
+    left_box, right_box = split_spread_boxes(
+        img.size, overlap_px, left_trim_pct, right_trim_pct, left_inner_trim_pct, right_inner_trim_pct, gutter_x
+    )
+    return img.crop(left_box), img.crop(right_box)
+
 
-    # Calculate trim pixels for outer edges
-    left_outer_trim_px = int(half_width * left_trim_pct)
-    right_outer_trim_px = int(half_width * right_trim_pct)
+def _process_page(
+    page: PageRef,
+    out: Path,
+    mode: SpreadMode,
+    trim_config: TrimConfig | None,
+    overlap_px: int,
+    split_trims: tuple[float, float, float, float],
+    gutter_ratio: float | None = None,
+) -> tuple[list[Path], bool]:
+    """Trim, split and save one page (runs in a worker process).
 
-    # Calculate trim pixels for inner edges
-    left_inner_trim_px = int(half_width * left_inner_trim_pct)
-    right_inner_trim_px = int(half_width * right_inner_trim_pct)
+    Args:
+        page: Source page.
+        out: Output directory.
+        mode: Processing mode.
+        trim_config: Global trim configuration, if any.
+        overlap_px: Pixels of overlap from center.
+        split_trims: (left outer, right outer, left inner, right inner) trim.
+        gutter_ratio: Split position as a fraction of the trimmed width
+            (default: center).
+
+    Returns:
+        Tuple of (written paths, whether the page was split).
+    """
+    with page.open() as img:
+        # Apply global trim first (before splitting)
+        if trim_config is not None:
+            img = apply_global_trim(img, trim_config)
 
-    # Left page: from left_outer_trim to mid_x - left_inner_trim + overlap
-    left_page = img.crop((left_outer_trim_px, 0, mid_x + overlap_px - left_inner_trim_px, height))
+        if mode == SpreadMode.SPREAD:
+            # Always split in SPREAD mode
+            left_page, right_page = split_spread(img, overlap_px, *split_trims, gutter_x(img.width, gutter_ratio))
 
-    # Right page: from mid_x + right_inner_trim - overlap to width - right_outer_trim
-    right_page = img.crop((mid_x - overlap_px + right_inner_trim_px, 0, width - right_outer_trim_px, height))
+            # Generate output names: page_0001.png → page_0001_L.png, page_0001_R.png
+            left_path = out / f"{page.stem}_L.png"
+            right_path = out / f"{page.stem}_R.png"
+            left_page.save(left_path)
+            right_page.save(right_path)
+            return [left_path, right_path], True
 
-    return left_page, right_page
+        # Not a spread, copy as-is
+        dest = out / page.name
+        img.save(dest)
+        return [dest], False
 
 
 def split_spread_pages(
@@ -225,6 +204,9 @@ def split_spread_pages(
     right_trim_pct: float = 0.0,
     mode: SpreadMode | None = None,
     trim_config: TrimConfig | None = None,
+    workers: int = 1,
+    virtual: bool = False,
+    auto_gutter: bool = False,
 ) -> list[Path]:
     """Split all spread images in a directory into separate pages.
 
@@ -245,9 +227,17 @@ def split_spread_pages(
         right_trim_pct: Percentage to trim from right edge of right page (0.0-1.0).
         mode: Processing mode (SINGLE or SPREAD). If None, uses get_spread_mode().
         trim_config: Global trim configuration. If None, no global trim is applied.
+        workers: Worker processes for decoding, cropping and PNG encoding.
+        virtual: Write only a pages.json manifest of crop boxes into the
+            source images instead of encoding page files. Pages are cropped
+            when read (see PageRef.open()).
+        auto_gutter: In spread mode, split at the gutter detected on a sample
+            of pages (see src.preprocessing.gutter) instead of the center.
+            The estimate is cached in originals/.
 
     Returns:
         List of output file paths (includes both split and non-split pages).
+        For virtual pages these are the page names the manifest defines.
     """
     # Resolve mode
     if mode is None:
@@ -266,7 +256,7 @@ def split_spread_pages(
     originals_dir = pages_path.parent / "originals"
 
     # Determine source directory
-    if originals_dir.exists() and list(originals_dir.glob("page_*.png")):
+    if originals_dir.exists() and list_pages(originals_dir, "page_*.png"):
         # Use existing originals (re-run with new settings)
         src = originals_dir
         print(f"  Using originals from: {originals_dir}")
@@ -274,9 +264,10 @@ def split_spread_pages(
         # Clear existing split pages
         for existing in pages_path.glob("page_*.png"):
             existing.unlink()
+        remove_manifest(pages_path)
     else:
         # First run: check if pages exist
-        pages = sorted(pages_path.glob("page_*.png"))
+        pages = list_pages(pages_path, "page_*.png")
         if not pages:
             print("No page images found")
             return []
@@ -284,9 +275,13 @@ def split_spread_pages(
         # Move originals to originals/
         originals_dir.mkdir(parents=True, exist_ok=True)
         print(f"  Moving originals to: {originals_dir}")
-        for page_path in pages:
-            dest = originals_dir / page_path.name
-            page_path.rename(dest)
+        if read_manifest(pages_path) is not None:
+            # Manifest-only pages: move the manifest, not the source frames
+            write_manifest(originals_dir, pages)
+            remove_manifest(pages_path)
+        else:
+            for page in pages:
+                page.source.rename(originals_dir / page.name)
 
         src = originals_dir
 
@@ -294,60 +289,62 @@ def split_spread_pages(
         out.mkdir(parents=True, exist_ok=True)
 
     # Process from source (originals)
-    pages = sorted(src.glob("page_*.png"))
-    output_files: list[Path] = []
-    split_count = 0
-
-    for page_path in pages:
-        img = Image.open(page_path)
+    pages = list_pages(src, "page_*.png")
+
+    # Determine split-trim values (trim_config takes priority)
+    split_trims = (left_trim_pct, right_trim_pct, 0.0, 0.0)
+    if trim_config is not None:
+        split_trims = (
+            trim_config.left_page_outer,
+            trim_config.right_page_outer,
+            trim_config.left_page_inner,
+            trim_config.right_page_inner,
+        )
 
-        # Apply global trim first (before splitting)
+    gutter_ratio = None
+    if auto_gutter and mode == SpreadMode.SPREAD and pages:
+        trimmed = pages
         if trim_config is not None:
-            img = apply_global_trim(img, trim_config)
-
-        # Determine whether to split based on mode
-        should_split = False
-        if mode == SpreadMode.SPREAD:
-            # Always split in SPREAD mode
-            should_split = True
-        elif mode == SpreadMode.SINGLE:
-            # Never split in SINGLE mode
-            should_split = False
-
-        if should_split:
-            # Determine split-trim values (trim_config takes priority)
-            split_left_outer = left_trim_pct
-            split_right_outer = right_trim_pct
-            split_left_inner = 0.0
-            split_right_inner = 0.0
-            if trim_config is not None:
-                split_left_outer = trim_config.left_page_outer
-                split_right_outer = trim_config.right_page_outer
-                split_left_inner = trim_config.left_page_inner
-                split_right_inner = trim_config.right_page_inner
-
-            # Split into left and right
-            left_page, right_page = split_spread(
-                img, overlap_px, split_left_outer, split_right_outer, split_left_inner, split_right_inner
-            )
-
-            # Generate output names: page_0001.png → page_0001_L.png, page_0001_R.png
-            stem = page_path.stem
-            left_path = out / f"{stem}_L.png"
-            right_path = out / f"{stem}_R.png"
-
-            left_page.save(left_path)
-            right_page.save(right_path)
+            trimmed = [p.crop(p.name, global_trim_box(p.size(), trim_config)) for p in pages]
+        gutter_ratio = estimate_gutter(trimmed, src)
+        if gutter_ratio is None:
+            print("  Gutter: not detected, splitting at center")
+        else:
+            print(f"  Gutter: {gutter_ratio:.3f} of width")
+
+    process = partial(
+        _process_page,
+        out=out,
+        mode=mode,
+        trim_config=trim_config,
+        overlap_px=overlap_px,
+        split_trims=split_trims,
+        gutter_ratio=gutter_ratio,
+    )
 
-            output_files.extend([left_path, right_path])
-            split_count += 1
+    if virtual:
+        spread = mode == SpreadMode.SPREAD
+        output_pages = [
+            vp
+            for page in pages
+            for vp in virtual_pages(page, spread, trim_config, overlap_px, split_trims, gutter_ratio)
+        ]
+        for stale in out.glob("page_*.png"):
+            stale.unlink()
+        write_manifest(out, output_pages)
+        output_files = [out / p.name for p in output_pages]
+        split_count = len(pages) if mode == SpreadMode.SPREAD else 0
+    else:
+        if workers > 1 and len(pages) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(pages) // (workers * 4))
+                results = list(pool.map(process, pages, chunksize=chunksize))
         else:
-            # Not a spread, copy as-is
-            dest = out / page_path.name
-            img.save(dest)
-            output_files.append(dest)
+            results = [process(page) for page in pages]
+        remove_manifest(out)
 
-        img.close()
+        output_files = [path for paths, _ in results for path in paths]
+        split_count = sum(1 for _, was_split in results if was_split)
 
     print(f"Split complete: {split_count} spreads → {split_count * 2} pages")
     print(f"Total pages: {len(output_files)}")
@@ -361,6 +358,9 @@ def renumber_pages(pages_dir: str) -> list[Path]:
     Converts page_0001_L.png, page_0001_R.png, page_0002.png, ...
     to page_0001.png, page_0002.png, page_0003.png, ...
 
+    Virtual pages (pages.json) are renumbered in the manifest; no files are
+    renamed.
+
     Args:
         pages_dir: Directory containing page images.
 
@@ -368,6 +368,11 @@ def renumber_pages(pages_dir: str) -> list[Path]:
         List of renamed file paths.
     """
     src = Path(pages_dir)
+    renumbered = renumber_manifest(src)
+    if renumbered is not None:
+        print(f"Renumbered {len(renumbered)} pages")
+        return [src / p.name for p in renumbered]
+
     pages = sorted(src.glob("page_*.png"))
 
     if not pages:
@@ -0,0 +1,196 @@
+"""Stream frames from FFmpeg through a pipe and keep only unique pages.
+
+Instead of writing every sampled frame to frames/ and re-reading it in
+deduplicate_frames(), FFmpeg emits uncompressed BMP frames on stdout.
+Each frame is hashed in memory and only unique frames are encoded to disk
+as page_NNNN.png. Pages are yielded as soon as they are written, so later
+stages can start before extraction finishes.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+from PIL import Image
+
+from src.preprocessing.phash import hamming_distance, phash_image
+
+# BMP file header: "BM" magic followed by little-endian uint32 file size
+_BMP_HEADER_LEN = 6
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    """Read exactly size bytes from a stream (empty bytes on clean EOF)."""
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = stream.read(size - len(buf))
+        if not chunk:
+            break
+        buf.extend(chunk)
+    if buf and len(buf) < size:
+        raise RuntimeError("Truncated frame in FFmpeg output stream")
+    return bytes(buf)
+
+
+def read_bmp_frames(stream: IO[bytes]) -> Iterator[Image.Image]:
+    """Split a concatenated BMP byte stream into PIL Images.
+
+    Args:
+        stream: Binary stream of back-to-back BMP files (FFmpeg image2pipe).
+
+    Yields:
+        Decoded RGB images, in stream order.
+    """
+    while True:
+        header = _read_exact(stream, _BMP_HEADER_LEN)
+        if not header:
+            return
+        if header[:2] != b"BM":
+            raise RuntimeError("Unexpected data in FFmpeg output stream (expected BMP frame)")
+        (file_size,) = struct.unpack("<I", header[2:])
+        body = _read_exact(stream, file_size - _BMP_HEADER_LEN)
+        with Image.open(io.BytesIO(header + body)) as img:
+            yield img.convert("RGB")
+
+
+def build_pipe_command(video_path: str, interval_sec: float) -> list[str]:
+    """Build the FFmpeg command that writes sampled frames to stdout.
+
+    Args:
+        video_path: Path to input video file.
+        interval_sec: Interval between frames in seconds.
+
+    Returns:
+        FFmpeg argument list.
+    """
+    fps = 1.0 / interval_sec
+    return [
+        "ffmpeg",
+        "-loglevel",
+        "error",
+        "-i",
+        video_path,
+        "-vf",
+        f"fps={fps}",
+        "-pix_fmt",
+        "bgr24",
+        "-c:v",
+        "bmp",
+        "-f",
+        "image2pipe",
+        "-",
+    ]
+
+
+def iter_unique_pages(
+    video_path: str,
+    output_dir: str,
+    interval_sec: float = 2.0,
+    hash_threshold: int = 8,
+    *,
+    limit: int | None = None,
+) -> Iterator[Path]:
+    """Extract frames via a pipe and yield unique pages as they are written.
+
+    Uses the same rule as deduplicate_frames(): a frame is dropped when its
+    pHash distance to the previous unique frame is below hash_threshold.
+
+    Args:
+        video_path: Path to input video file.
+        output_dir: Directory to save unique pages (page_NNNN.png).
+        interval_sec: Interval between frames in seconds.
+        hash_threshold: Max hamming distance to consider frames as duplicates.
+        limit: Process only first N frames (for testing).
+
+    Yields:
+        Path of each unique page, in order.
+
+    Raises:
+        RuntimeError: If FFmpeg fails or emits malformed output.
+    """
+    dst = Path(output_dir)
+    dst.mkdir(parents=True, exist_ok=True)
+
+    cmd = build_pipe_command(video_path, interval_sec)
+    # FFmpeg's messages go to a file: a stderr pipe that is only read at the
+    # end can fill up and block FFmpeg while we wait on stdout
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log)
+
+    prev_hash = None
+    page_num = 1
+    total = 0
+    try:
+        for img in read_bmp_frames(proc.stdout):
+            total += 1
+            if limit and total > limit:
+                break
+            current_hash = phash_image(img)
+            if prev_hash is not None and hamming_distance(current_hash, prev_hash) < hash_threshold:
+                continue
+
+            out_path = dst / f"page_{page_num:04d}.png"
+            img.save(out_path)
+            prev_hash = current_hash
+            page_num += 1
+            yield out_path
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        returncode = proc.wait()
+        log.seek(0)
+        stderr = log.read().decode(errors="replace")
+        log.close()
+
+    if returncode != 0 and not (limit and total > limit):
+        print(f"FFmpeg error: {stderr}", file=sys.stderr)
+        raise RuntimeError("FFmpeg frame extraction failed")
+
+    frames_read = min(total, limit) if limit else total
+    print(f"Streamed {frames_read} frames, kept {page_num - 1} unique pages in {dst}")
+
+
+def stream_unique_pages(
+    video_path: str,
+    output_dir: str,
+    interval_sec: float = 2.0,
+    hash_threshold: int = 8,
+    *,
+    limit: int | None = None,
+) -> list[Path]:
+    """Extract and deduplicate frames in one streaming pass.
+
+    Equivalent to extract_frames() followed by deduplicate_frames(), without
+    writing intermediate frames to disk.
+
+    Args:
+        video_path: Path to input video file.
+        output_dir: Directory to save unique pages (page_NNNN.png).
+        interval_sec: Interval between frames in seconds.
+        hash_threshold: Max hamming distance to consider frames as duplicates.
+        limit: Process only first N frames (for testing).
+
+    Returns:
+        Sorted list of unique page paths.
+    """
+    return list(iter_unique_pages(video_path, output_dir, interval_sec, hash_threshold, limit=limit))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract unique pages from video (streaming)")
+    parser.add_argument("video", help="Input video file path")
+    parser.add_argument("-o", "--output", default="output/pages", help="Output directory")
+    parser.add_argument("-i", "--interval", type=float, default=2.0, help="Interval in seconds")
+    parser.add_argument("-t", "--threshold", type=int, default=8, help="Hash distance threshold")
+    args = parser.parse_args()
+
+    stream_unique_pages(args.video, args.output, args.interval, args.threshold)
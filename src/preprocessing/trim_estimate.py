@@ -0,0 +1,127 @@
+"""Estimate global trim values from ink-density profiles of sampled pages.
+
+A sample of pages is downscaled to a common grid and stacked, so ink
+detection and row/column profiles are computed for all pages in one NumPy
+pass. Rows and columns that are almost entirely dark (screen borders, desk,
+window chrome) are excluded from the profiles; what remains with some ink
+is page content. The proposed trim keeps the content of every sampled page,
+and the confidence is the share of pages whose content edges agree.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from src.preprocessing.pages import PageRef, sample_pages
+
+TRIM_SAMPLES = 16  # Pages sampled per book
+PROFILE_SIZE = 512  # Pages are resized to PROFILE_SIZE x PROFILE_SIZE
+INK_DELTA = 32  # Pixels this much darker than the paper count as ink
+MIN_INK = 0.01  # Min ink share for a row/column to hold content
+SOLID_INK = 0.9  # Rows/columns with more ink than this are borders, not content
+TRIM_PADDING = 0.01  # Margin left around the detected content
+AGREEMENT = 0.03  # Content edges within this of the median agree
+MAX_TRIM = 0.45  # Proposals stay below TrimConfig's 0.5 limit
+
+SIDES = ("top", "bottom", "left", "right")
+
+
+@dataclass
+class TrimEstimate:
+    """Proposed global trim ratios with per-side and overall confidence."""
+
+    top: float
+    bottom: float
+    left: float
+    right: float
+    confidence: float
+    side_confidence: dict[str, float]
+    pages: int
+
+    def config_values(self) -> dict[str, float]:
+        """Values keyed by their config.yaml names (global_trim_*)."""
+        return {f"global_trim_{side}": getattr(self, side) for side in SIDES}
+
+
+def _load_gray(page: PageRef) -> np.ndarray:
+    """Grayscale pixels of a page resized to the profile grid."""
+    with page.open() as img:
+        gray = img.convert("L")
+    factor = max(1, min(gray.size) // PROFILE_SIZE)
+    if factor > 1:
+        gray = gray.reduce(factor)
+    return np.asarray(gray.resize((PROFILE_SIZE, PROFILE_SIZE), Image.Resampling.BILINEAR))
+
+
+def content_bounds(stack: np.ndarray) -> np.ndarray:
+    """Content edges of a stack of grayscale pages.
+
+    Args:
+        stack: uint8 array (pages, height, width).
+
+    Returns:
+        Float array (pages, 4) of top, bottom, left, right edges as ratios
+        of the page size (bottom/right measured from the far edge), NaN for
+        pages without detectable content.
+    """
+    pages, height, width = stack.shape
+    # Paper tone per page; robust against dark borders covering part of the frame
+    paper = np.percentile(stack.reshape(pages, -1), 90, axis=1)
+    ink = stack.astype(np.int16) < (paper[:, None, None] - INK_DELTA)
+
+    solid_rows = ink.mean(axis=2) > SOLID_INK
+    solid_cols = ink.mean(axis=1) > SOLID_INK
+    ink &= ~solid_rows[:, :, None] & ~solid_cols[:, None, :]
+
+    bounds = np.full((pages, 4), np.nan)
+    for profile, (first, last), size in (
+        (ink.mean(axis=2), (0, 1), height),
+        (ink.mean(axis=1), (2, 3), width),
+    ):
+        content = profile > MIN_INK
+        has = content.any(axis=1)
+        bounds[has, first] = content.argmax(axis=1)[has] / size
+        bounds[has, last] = content[:, ::-1].argmax(axis=1)[has] / size
+    return bounds
+
+
+def estimate_trim(pages: Sequence[PageRef], samples: int = TRIM_SAMPLES) -> TrimEstimate:
+    """Propose global trim values for a book.
+
+    Args:
+        pages: Pages (or spreads) in order, before any global trim.
+        samples: Number of pages to analyze.
+
+    Returns:
+        Trim proposal. Every side keeps the content of all sampled pages;
+        with no detectable content all trims are 0.0 and confidence is 0.0.
+    """
+    sampled = sample_pages(pages, samples)
+    if not sampled:
+        return TrimEstimate(0.0, 0.0, 0.0, 0.0, 0.0, dict.fromkeys(SIDES, 0.0), 0)
+
+    bounds = content_bounds(np.stack([_load_gray(p) for p in sampled]))
+    found = bounds[~np.isnan(bounds).any(axis=1)]
+    if len(found) == 0:
+        return TrimEstimate(0.0, 0.0, 0.0, 0.0, 0.0, dict.fromkeys(SIDES, 0.0), len(sampled))
+
+    trims: dict[str, float] = {}
+    side_confidence: dict[str, float] = {}
+    for i, side in enumerate(SIDES):
+        edges = found[:, i]
+        # Round down so the proposal never cuts into content
+        trims[side] = math.floor(min(max(edges.min() - TRIM_PADDING, 0.0), MAX_TRIM) * 1000) / 1000
+        agree = np.abs(edges - np.median(edges)) <= AGREEMENT
+        side_confidence[side] = round(float(agree.sum()) / len(sampled), 3)
+
+    return TrimEstimate(
+        **trims,
+        confidence=min(side_confidence.values()),
+        side_confidence=side_confidence,
+        pages=len(sampled),
+    )
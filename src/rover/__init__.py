@@ -4,6 +4,7 @@ This package provides OCR ensemble functionality combining multiple engines.
 
 Modules:
 - ensemble: ROVER merge algorithm
+- page_engines: Engine runs per page (cached analyses, adaptive engines, workers)
 - engines: OCR engine wrappers
 - alignment: Character-level text alignment
 - output: Output directory management
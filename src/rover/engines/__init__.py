@@ -12,14 +12,22 @@ All engines return results with bounding box information.
 from __future__ import annotations
 
 # Re-export public API
+from .cache import EngineResultCache
 from .core import EngineResult, TextWithBox
+from .daemon import OCRDaemon, OCRDaemonClient
+from .line_runners import run_easyocr_lines, run_paddleocr_lines
+from .regions import FIGURE_MODES
 from .runners import (
+    DEFAULT_ENGINES,
+    filter_figure_items,
     run_all_engines,
     run_easyocr_with_boxes,
     run_paddleocr_with_boxes,
     run_tesseract_with_boxes,
     run_yomitoku_with_boxes,
+    yomitoku_result_from_analysis,
 )
+from .workers import EngineWorkerPool, map_pages, plan_jobs
 
 __all__ = [
     "TextWithBox",
@@ -28,5 +36,17 @@ __all__ = [
     "run_paddleocr_with_boxes",
     "run_easyocr_with_boxes",
     "run_tesseract_with_boxes",
+    "run_paddleocr_lines",
+    "run_easyocr_lines",
     "run_all_engines",
+    "yomitoku_result_from_analysis",
+    "filter_figure_items",
+    "DEFAULT_ENGINES",
+    "EngineWorkerPool",
+    "map_pages",
+    "plan_jobs",
+    "EngineResultCache",
+    "OCRDaemon",
+    "OCRDaemonClient",
+    "FIGURE_MODES",
 ]
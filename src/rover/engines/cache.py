@@ -0,0 +1,146 @@
+"""Content-addressed on-disk cache of engine results.
+
+Entries are keyed by the page's pixel hash, the engine name, the installed
+engine version and the engine parameters, so a byte-identical page is never
+recognized twice by the same engine configuration, whichever book or run
+it comes from. Results are stored as gzip-compressed JSON with items packed
+into arrays. The cache directory is size-limited: reads refresh an entry's
+mtime, and the least recently used entries are evicted on writes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from .core import EngineResult, TextWithBox
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ebook-ocr" / "ocr"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+CACHE_VERSION = 1
+EVICT_TO = 0.9  # Evict down to this share of max_bytes
+
+# Distribution providing each engine, for version keys
+ENGINE_PACKAGES = {
+    "yomitoku": "yomitoku",
+    "paddleocr": "paddleocr",
+    "easyocr": "easyocr",
+    "tesseract": "pytesseract",
+}
+
+
+def image_hash(image: Image.Image) -> str:
+    """SHA-256 of an image's decoded pixels (independent of file encoding)."""
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+@cache
+def engine_version(engine: str) -> str:
+    """Installed version of an engine's package, or "unknown"."""
+    try:
+        return metadata.version(ENGINE_PACKAGES.get(engine, engine))
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _encode(result: EngineResult) -> bytes:
+    data = {
+        "engine": result.engine,
+        "items": [[item.text, *item.bbox, item.confidence] for item in result.items],
+        "figures": result.figures,
+        "headings": result.headings,
+    }
+    return gzip.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), mtime=0)
+
+
+def _decode(blob: bytes) -> EngineResult:
+    data = json.loads(gzip.decompress(blob))
+    items = [TextWithBox(text=text, bbox=tuple(bbox), confidence=conf) for text, *bbox, conf in data["items"]]
+    figures = [tuple(f) for f in data["figures"]] if data["figures"] is not None else None
+    return EngineResult(
+        engine=data["engine"],
+        items=items,
+        success=True,
+        figures=figures,
+        headings=data["headings"],
+    )
+
+
+class EngineResultCache:
+    """Size-limited, content-addressed store of successful EngineResults."""
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Create a cache.
+
+        Args:
+            cache_dir: Directory for entries (default: DEFAULT_CACHE_DIR).
+            max_bytes: Total size above which old entries are evicted.
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    def key(self, pixel_hash: str, engine: str, params: dict[str, Any]) -> str:
+        """Cache key for an engine run on an image."""
+        ident = [CACHE_VERSION, pixel_hash, engine, engine_version(engine), params]
+        return hashlib.sha256(json.dumps(ident, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def get(self, key: str) -> EngineResult | None:
+        """Cached result for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            result = _decode(path.read_bytes())
+            os.utime(path)  # Mark as recently used
+            return result
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, result: EngineResult) -> None:
+        """Store a successful result (failures are never cached)."""
+        if not result.success:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(_encode(result))
+            os.replace(tmp_path, path)
+            self.evict()
+        except OSError as e:
+            print(f"Warning: could not write OCR cache: {e}")
+
+    def evict(self) -> int:
+        """Delete least recently used entries while the cache exceeds max_bytes.
+
+        Returns:
+            Number of entries deleted.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json.gz"):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        return deleted
@@ -1,4 +1,4 @@
-"""Core engine initialization, data classes, and filtering functions."""
+"""Core engine initialization, data classes, and result helper functions."""
 
 from __future__ import annotations
 
@@ -8,8 +8,14 @@ from dataclasses import dataclass
 _tesseract = None
 _easyocr_reader = None
 _paddleocr_reader = None
+_paddleocr_recognizer = None
 _yomitoku_analyzer = None
 
+# PaddleOCR 3.x recognition models by language (others use the library default)
+PADDLEOCR_REC_MODELS = {
+    "japan": "PP-OCRv5_server_rec",
+}
+
 
 def _get_tesseract():
     """Lazy import for pytesseract."""
@@ -51,6 +57,22 @@ def _get_paddleocr_reader(lang: str = "japan"):
     return _paddleocr_reader
 
 
+def _get_paddleocr_recognizer(lang: str = "japan"):
+    """Lazy import and initialization for the PaddleOCR 3.x text recognizer alone."""
+    global _paddleocr_recognizer
+    if _paddleocr_recognizer is None:
+        import logging
+
+        logging.getLogger("ppocr").setLevel(logging.WARNING)
+        from paddleocr import TextRecognition
+
+        _paddleocr_recognizer = TextRecognition(
+            model_name=PADDLEOCR_REC_MODELS.get(lang),
+            enable_mkldnn=False,
+        )
+    return _paddleocr_recognizer
+
+
 def _get_yomitoku_analyzer(device: str = "cpu"):
     """Lazy import and initialization for Yomitoku."""
     global _yomitoku_analyzer
@@ -194,3 +216,154 @@ def _filter_items_by_figures(
         error=result.error,
         figures=result.figures,
     )
+
+
+def _bbox_points_to_rect(bbox_points: list[list[float]]) -> tuple[int, int, int, int]:
+    """Convert EasyOCR bbox points to bounding rectangle.
+
+    Args:
+        bbox_points: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+
+    Returns:
+        Tuple of (x_min, y_min, x_max, y_max).
+    """
+    x_coords = [p[0] for p in bbox_points]
+    y_coords = [p[1] for p in bbox_points]
+    return (
+        int(min(x_coords)),
+        int(min(y_coords)),
+        int(max(x_coords)),
+        int(max(y_coords)),
+    )
+
+
+def _cluster_words_to_lines(
+    words: list,
+    y_tolerance: int = 15,
+) -> list[TextWithBox]:
+    """Cluster yomitoku words into lines by y-coordinate.
+
+    Args:
+        words: List of yomitoku word objects.
+        y_tolerance: Maximum y-distance to consider same line.
+
+    Returns:
+        List of TextWithBox, one per line.
+    """
+    if not words:
+        return []
+
+    # Extract word data
+    word_data = []
+    for word in words:
+        if not hasattr(word, "content") or not word.content:
+            continue
+
+        # Get y_center from points or box
+        y_center = 0.0
+        bbox = (0, 0, 0, 0)
+
+        if hasattr(word, "points") and word.points:
+            # points: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+            pts = word.points
+            x_coords = [p[0] for p in pts]
+            y_coords = [p[1] for p in pts]
+            bbox = (
+                int(min(x_coords)),
+                int(min(y_coords)),
+                int(max(x_coords)),
+                int(max(y_coords)),
+            )
+            y_center = (bbox[1] + bbox[3]) / 2.0
+        elif hasattr(word, "box") and word.box:
+            box = word.box
+            bbox = (int(box[0]), int(box[1]), int(box[2]), int(box[3]))
+            y_center = (bbox[1] + bbox[3]) / 2.0
+        else:
+            continue
+
+        confidence = getattr(word, "rec_score", 1.0)
+        word_data.append(
+            {
+                "text": word.content,
+                "bbox": bbox,
+                "y_center": y_center,
+                "x_left": bbox[0],
+                "confidence": confidence,
+            }
+        )
+
+    if not word_data:
+        return []
+
+    # Sort by y_center
+    word_data.sort(key=lambda w: w["y_center"])
+
+    # Cluster into lines
+    lines: list[list[dict]] = []
+    current_line = [word_data[0]]
+
+    for wd in word_data[1:]:
+        current_y = sum(w["y_center"] for w in current_line) / len(current_line)
+        if abs(wd["y_center"] - current_y) <= y_tolerance:
+            current_line.append(wd)
+        else:
+            lines.append(current_line)
+            current_line = [wd]
+
+    if current_line:
+        lines.append(current_line)
+
+    # Convert lines to TextWithBox
+    items: list[TextWithBox] = []
+    for line_words in lines:
+        # Sort words by x-coordinate
+        line_words.sort(key=lambda w: w["x_left"])
+
+        # Combine text
+        text = "".join(w["text"] for w in line_words)
+
+        # Combined bbox
+        x1 = min(w["bbox"][0] for w in line_words)
+        y1 = min(w["bbox"][1] for w in line_words)
+        x2 = max(w["bbox"][2] for w in line_words)
+        y2 = max(w["bbox"][3] for w in line_words)
+
+        # Average confidence
+        avg_conf = sum(w["confidence"] for w in line_words) / len(line_words)
+
+        items.append(
+            TextWithBox(
+                text=text,
+                bbox=(x1, y1, x2, y2),
+                confidence=avg_conf,
+            )
+        )
+
+    return items
+
+
+def _get_paragraph_confidence(paragraph, words) -> float:
+    """Get paragraph confidence from matching words.
+
+    Args:
+        paragraph: Yomitoku paragraph object
+        words: List of Yomitoku word objects
+
+    Returns:
+        Minimum rec_score from matching words, or 1.0 if no match found.
+    """
+    if not hasattr(paragraph, "contents") or not paragraph.contents:
+        return 1.0
+
+    para_text = paragraph.contents
+    matching_scores = []
+
+    for word in words:
+        if hasattr(word, "content") and hasattr(word, "rec_score"):
+            # Check if word is part of this paragraph
+            if word.content in para_text:
+                matching_scores.append(word.rec_score)
+
+    # Return minimum score (most conservative), or 1.0 if no matches
+    return min(matching_scores) if matching_scores else 1.0
@@ -0,0 +1,184 @@
+"""Long-lived local OCR daemon and its client.
+
+The daemon loads the engines once and serves run_all_engines requests over
+a Unix socket, so repeated run-ocr invocations (e.g. tuning runs with
+LIMIT) skip the import and model-load cost of torch, paddle, EasyOCR and
+Yomitoku. Requests are served one at a time; the engines of a page still
+run concurrently inside run_all_engines (or run_adaptive_engines when the
+request has an "adaptive_confidence" option).
+
+Messages are length-prefixed pickles. The socket is created with owner-only
+permissions and only ever accepts local connections from the same user.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import socket
+import socketserver
+import struct
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from src.preprocessing.pages import PageRef
+
+from .core import EngineResult
+
+DEFAULT_SOCKET = Path.home() / ".cache" / "ebook-ocr" / "daemon" / "ocr-daemon.sock"
+_HEADER = struct.Struct(">Q")
+
+
+def _send(sock: socket.socket, message: Any) -> None:
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock: socket.socket) -> Any:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return pickle.loads(_recv_exact(sock, size))
+
+
+def warm_up(engines: list[str], device: str = "cpu") -> None:
+    """Load engine models into this process."""
+    from . import core
+
+    loaders = {
+        "yomitoku": lambda: core._get_yomitoku_analyzer(device),
+        "paddleocr": core._get_paddleocr_reader,
+        "easyocr": core._get_easyocr_reader,
+        "tesseract": core._get_tesseract,
+    }
+    for engine in engines:
+        if engine in loaders:
+            print(f"Loading {engine}...")
+            loaders[engine]()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        from .runners import run_all_engines
+
+        try:
+            request = _recv(self.request)
+            if request.get("op") == "ping":
+                reply = {"ok": True, "engines": self.server.engines}
+            elif request.get("op") == "ocr":
+                page: PageRef = request["page"]
+                options = dict(request["options"])
+                adaptive_confidence = options.pop("adaptive_confidence", None)
+                with page.open() as img:
+                    if adaptive_confidence is not None:
+                        from src.rover.page_engines import run_adaptive_engines
+
+                        results = run_adaptive_engines(img, min_confidence=adaptive_confidence, **options)
+                    else:
+                        results = run_all_engines(img, **options)
+                reply = {"ok": True, "results": results}
+            else:
+                reply = {"ok": False, "error": f"unknown op: {request.get('op')}"}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        try:
+            _send(self.request, reply)
+        except OSError:
+            pass
+
+
+class OCRDaemon(socketserver.UnixStreamServer):
+    """Unix socket server running OCR engines for clients."""
+
+    def __init__(self, socket_path: str | Path = DEFAULT_SOCKET, engines: list[str] | None = None):
+        """Bind the socket (replacing a stale socket file).
+
+        Args:
+            socket_path: Path of the Unix socket.
+            engines: Engines loaded by warm_up(), reported to clients.
+        """
+        self.socket_path = Path(socket_path)
+        self.engines = list(engines or [])
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class OCRDaemonClient:
+    """Client for a running OCRDaemon."""
+
+    def __init__(self, socket_path: str | Path = DEFAULT_SOCKET, timeout: float | None = None):
+        """Create a client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket.
+            timeout: Socket timeout per request in seconds (None: no limit).
+        """
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+
+    def _call(self, request: dict[str, Any], timeout: float | None) -> dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(self.socket_path))
+            _send(sock, request)
+            reply = _recv(sock)
+        if not reply.get("ok"):
+            raise RuntimeError(f"OCR daemon error: {reply.get('error')}")
+        return reply
+
+    def ping(self) -> bool:
+        """True if a daemon is answering on the socket."""
+        try:
+            self._call({"op": "ping"}, timeout=2.0)
+            return True
+        except (OSError, ConnectionError, RuntimeError, EOFError, pickle.UnpicklingError):
+            return False
+
+    def run_page(self, page: PageRef, **options: Any) -> dict[str, EngineResult]:
+        """Run engines on a page in the daemon.
+
+        Args:
+            page: Page to recognize (opened by the daemon from the same
+                filesystem; its source path is made absolute, since the
+                daemon may run in another working directory).
+            **options: Keyword arguments for run_all_engines, plus
+                adaptive_confidence for run_adaptive_engines.
+
+        Returns:
+            Dict mapping engine name to EngineResult.
+        """
+        page = replace(page, source=page.source.resolve())
+        return self._call({"op": "ocr", "page": page, "options": options}, timeout=self.timeout)["results"]
+
+
+def serve(socket_path: str | Path = DEFAULT_SOCKET, engines: list[str] | None = None, device: str = "cpu") -> None:
+    """Load the engines and serve requests until interrupted."""
+    from .runners import DEFAULT_ENGINES
+
+    engines = engines or DEFAULT_ENGINES
+    warm_up(engines, device)
+    with OCRDaemon(socket_path, engines) as server:
+        print(f"OCR daemon listening on {server.socket_path} (engines: {', '.join(engines)})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("OCR daemon stopped")
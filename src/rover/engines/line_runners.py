@@ -0,0 +1,109 @@
+"""Recognition-only runners for given text lines.
+
+PaddleOCR and EasyOCR read only the line boxes they are given (usually
+Yomitoku's lines) and skip their own text detection. PaddleOCR gets line
+crops batched by regions.line_crops; EasyOCR crops and batches the boxes
+itself.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from PIL import Image
+
+from .core import EngineResult, TextWithBox, _bbox_points_to_rect, _get_easyocr_reader, _get_paddleocr_recognizer
+from .regions import LINE_BATCH, BBox, line_crops
+
+
+def run_paddleocr_lines(
+    image: Image.Image,
+    line_bboxes: Sequence[BBox],
+    lang: str = "japan",
+    batch_size: int = LINE_BATCH,
+) -> EngineResult:
+    """Run PaddleOCR's recognizer on given text lines, without detection.
+
+    Args:
+        image: PIL Image of the page.
+        line_bboxes: Line bboxes (x1, y1, x2, y2) in page coordinates,
+            e.g. Yomitoku's lines.
+        lang: Language code for PaddleOCR.
+        batch_size: Line crops per recognizer call.
+
+    Returns:
+        EngineResult with one item per recognized line, bboxed by its line.
+    """
+    try:
+        import numpy as np
+
+        batches = line_crops(image, line_bboxes, batch_size=batch_size)
+        if not batches:
+            return EngineResult(engine="paddleocr", items=[], success=True)
+
+        recognizer = _get_paddleocr_recognizer(lang)
+        texts: dict[int, tuple[str, float]] = {}
+        for batch in batches:
+            results = recognizer.predict([np.array(crop) for _, crop in batch], batch_size=len(batch))
+            for (i, _), res in zip(batch, results):
+                texts[i] = (res.get("rec_text", ""), float(res.get("rec_score", 0.0)))
+
+        items: list[TextWithBox] = []
+        for i, bbox in enumerate(line_bboxes):
+            text, confidence = texts.get(i, ("", 0.0))
+            if text:
+                items.append(TextWithBox(text=text, bbox=tuple(bbox), confidence=confidence))
+
+        return EngineResult(engine="paddleocr", items=items, success=True)
+    except Exception as e:
+        return EngineResult(engine="paddleocr", items=[], success=False, error=str(e))
+
+
+def run_easyocr_lines(
+    image: Image.Image,
+    line_bboxes: Sequence[BBox],
+    lang_list: list[str] | None = None,
+    apply_preprocessing: bool = True,
+    batch_size: int = LINE_BATCH,
+) -> EngineResult:
+    """Run EasyOCR's recognizer on given text lines, without detection.
+
+    EasyOCR crops the boxes itself, scales them to its model height and
+    pads each batch, so the page is passed with the boxes.
+
+    Args:
+        image: PIL Image of the page.
+        line_bboxes: Line bboxes (x1, y1, x2, y2) in page coordinates,
+            e.g. Yomitoku's lines.
+        lang_list: Language list for EasyOCR.
+        apply_preprocessing: Apply CLAHE preprocessing (default: True).
+        batch_size: Line crops per recognizer call.
+
+    Returns:
+        EngineResult with one item per recognized line, bboxed by its line.
+    """
+    try:
+        import numpy as np
+
+        boxes = [[x1, x2, y1, y2] for x1, y1, x2, y2 in line_bboxes if x2 > x1 and y2 > y1]
+        if not boxes:
+            return EngineResult(engine="easyocr", items=[], success=True)
+
+        reader = _get_easyocr_reader(lang_list)
+        img_array = np.array(image)
+        if apply_preprocessing:
+            from src.ocr_preprocess import apply_clahe
+
+            img_array = apply_clahe(img_array)
+
+        # Recognition only: [(bbox, text, confidence), ...] per given box
+        results = reader.recognize(img_array, horizontal_list=boxes, free_list=[], batch_size=batch_size, detail=1)
+
+        items = [
+            TextWithBox(text=text, bbox=_bbox_points_to_rect(bbox_points), confidence=float(confidence))
+            for bbox_points, text, confidence in results
+            if text
+        ]
+        return EngineResult(engine="easyocr", items=items, success=True)
+    except Exception as e:
+        return EngineResult(engine="easyocr", items=[], success=False, error=str(e))
@@ -0,0 +1,255 @@
+"""Figure-aware page regions for the secondary OCR engines.
+
+Text detection cost grows with the text-like area of the input, and the
+diagrams of technical books look a lot like text to a detector. Once
+Yomitoku has found the figures of a page, the secondary engines can be
+given a page without them:
+
+- filter: the full page; items inside figures are dropped afterwards.
+- mask: figure regions are filled white (as src.utils.mask_figures does).
+- crop: figures are masked and the horizontal bands they cover are cut
+  out wherever no Yomitoku text line shares the band; the remaining bands
+  are stacked into a shorter image. Item bboxes are mapped back to page
+  coordinates.
+
+The same bands also stack selected text lines (line_bands) into one small
+image, so an engine can recognize just those lines in a single call. For
+recognition without detection, line_crops cuts out line boxes scaled to
+the recognizer's input height and padded to a common width per batch.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+
+from PIL import Image
+
+from src.utils import mask_figures
+
+from .core import EngineResult, TextWithBox
+
+FIGURE_MODES = ("filter", "mask", "crop")
+BAND_GAP = 16  # White rows between stacked bands, so lines are not merged across a cut
+MIN_CUT = 32  # Bands shorter than this (px) are kept rather than cut
+LINE_PADDING = 6  # Rows kept above and below each selected line
+LINE_HEIGHT = 48  # Height of line crops for the recognizers (PP-OCR rec input)
+LINE_BATCH = 16  # Line crops per recognizer call
+
+BBox = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class Band:
+    """Rows [top, bottom) of the page placed at offset in the cropped image."""
+
+    top: int
+    bottom: int
+    offset: int
+
+
+def mask_figure_boxes(image: Image.Image, figure_bboxes: Sequence[BBox]) -> Image.Image:
+    """Copy of image with the figure bboxes filled white."""
+    return mask_figures(image, [{"type": "FIGURE", "bbox": list(bbox)} for bbox in figure_bboxes])
+
+
+def _merge_spans(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for top, bottom in sorted(spans):
+        if merged and top <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], bottom))
+        else:
+            merged.append((top, bottom))
+    return merged
+
+
+def figure_bands(
+    height: int,
+    figure_bboxes: Sequence[BBox],
+    text_bboxes: Sequence[BBox] = (),
+) -> list[Band]:
+    """Bands of the page kept after cutting out figure-only rows.
+
+    Args:
+        height: Page height in pixels.
+        figure_bboxes: Figure bboxes (x1, y1, x2, y2).
+        text_bboxes: Bboxes of text lines outside the figures; rows they
+            touch are always kept.
+
+    Returns:
+        Kept bands in page order. A single band covering the page when
+        nothing can be cut.
+    """
+    figure_rows = _merge_spans([(max(0, y1), min(height, y2 + 1)) for _, y1, _, y2 in figure_bboxes])
+    text_rows = _merge_spans([(max(0, y1), min(height, y2 + 1)) for _, y1, _, y2 in text_bboxes])
+
+    cuts: list[tuple[int, int]] = []
+    for top, bottom in figure_rows:
+        # Split the figure's rows around text lines that share them
+        for t_top, t_bottom in text_rows:
+            if t_bottom <= top or t_top >= bottom:
+                continue
+            if t_top - top >= MIN_CUT:
+                cuts.append((top, t_top))
+            top = max(top, t_bottom)
+        if bottom - top >= MIN_CUT:
+            cuts.append((top, bottom))
+
+    kept: list[tuple[int, int]] = []
+    position = 0
+    for top, bottom in [*cuts, (height, height)]:
+        if top > position:
+            kept.append((position, top))
+        position = bottom
+    return _place(kept) or [Band(0, height, 0)]
+
+
+def line_bands(height: int, line_bboxes: Sequence[BBox], padding: int = LINE_PADDING) -> list[Band]:
+    """Bands of the page holding the given text lines (full page width).
+
+    Args:
+        height: Page height in pixels.
+        line_bboxes: Line bboxes (x1, y1, x2, y2).
+        padding: Rows kept above and below each line; lines whose padded
+            rows overlap share a band.
+
+    Returns:
+        Bands in page order (empty without lines).
+    """
+    spans = [(max(0, y1 - padding), min(height, y2 + 1 + padding)) for _, y1, _, y2 in line_bboxes]
+    return _place(_merge_spans([(top, bottom) for top, bottom in spans if bottom > top]))
+
+
+def _place(spans: list[tuple[int, int]]) -> list[Band]:
+    bands: list[Band] = []
+    offset = 0
+    for top, bottom in spans:
+        bands.append(Band(top, bottom, offset))
+        offset += bottom - top + BAND_GAP
+    return bands
+
+
+def stack_bands(image: Image.Image, bands: Sequence[Band]) -> Image.Image:
+    """Image of the bands of a page stacked at their offsets on white."""
+    last = bands[-1]
+    stacked = Image.new(image.mode, (image.width, last.offset + last.bottom - last.top), "white")
+    for band in bands:
+        stacked.paste(image.crop((0, band.top, image.width, band.bottom)), (0, band.offset))
+    return stacked
+
+
+def line_crops(
+    image: Image.Image,
+    line_bboxes: Sequence[BBox],
+    height: int = LINE_HEIGHT,
+    batch_size: int = LINE_BATCH,
+) -> list[list[tuple[int, Image.Image]]]:
+    """Line crops of a page in batches of uniform size.
+
+    Each line box (with a small margin) is scaled to height. Crops are
+    batched by width, so little padding is needed, and padded white on
+    the right to the widest crop of their batch.
+
+    Args:
+        image: Page image.
+        line_bboxes: Line bboxes (x1, y1, x2, y2).
+        height: Height of every crop.
+        batch_size: Maximum crops per batch.
+
+    Returns:
+        Batches of (index into line_bboxes, crop).
+    """
+    margin = max(1, height // 16)
+    crops: list[tuple[int, Image.Image]] = []
+    for i, (x1, y1, x2, y2) in enumerate(line_bboxes):
+        box = (max(0, x1 - margin), max(0, y1 - margin), min(image.width, x2 + margin), min(image.height, y2 + margin))
+        if x2 <= x1 or y2 <= y1 or box[2] <= box[0] or box[3] <= box[1]:
+            continue
+        crop = image.crop(box).convert("RGB")
+        width = max(1, round(crop.width * height / crop.height))
+        crops.append((i, crop.resize((width, height), Image.Resampling.BILINEAR)))
+    crops.sort(key=lambda c: c[1].width)
+
+    batches: list[list[tuple[int, Image.Image]]] = []
+    for start in range(0, len(crops), batch_size):
+        batch = crops[start : start + batch_size]
+        width = batch[-1][1].width
+        padded = []
+        for i, crop in batch:
+            canvas = Image.new("RGB", (width, height), "white")
+            canvas.paste(crop, (0, 0))
+            padded.append((i, canvas))
+        batches.append(padded)
+    return batches
+
+
+def crop_figure_bands(
+    image: Image.Image,
+    figure_bboxes: Sequence[BBox],
+    text_bboxes: Sequence[BBox] = (),
+) -> tuple[Image.Image, list[Band]]:
+    """Mask figures and stack the bands of the page that hold text.
+
+    Args:
+        image: Page image.
+        figure_bboxes: Figure bboxes (x1, y1, x2, y2).
+        text_bboxes: Bboxes of text lines outside the figures.
+
+    Returns:
+        (cropped image, bands) for map_result_to_page().
+    """
+    masked = mask_figure_boxes(image, figure_bboxes)
+    bands = figure_bands(image.height, figure_bboxes, text_bboxes)
+    if len(bands) == 1 and bands[0] == Band(0, image.height, 0):
+        return masked, bands
+    return stack_bands(masked, bands), bands
+
+
+def _to_page_y(y: int, bands: list[Band]) -> int:
+    for band in reversed(bands):
+        if y >= band.offset:
+            return band.top + min(y - band.offset, band.bottom - band.top)
+    return y
+
+
+def map_result_to_page(result: EngineResult, bands: list[Band]) -> EngineResult:
+    """Map item bboxes of a result on a stacked image back to the page.
+
+    Each item moves with the band holding its vertical center.
+    """
+    items: list[TextWithBox] = []
+    for item in result.items:
+        x1, y1, x2, y2 = item.bbox
+        shift = _to_page_y(int(item.y_center), bands) - int(item.y_center)
+        items.append(replace(item, bbox=(x1, y1 + shift, x2, y2 + shift)))
+    return replace(result, items=items)
+
+
+def prepare_figure_input(
+    image: Image.Image,
+    mode: str,
+    figure_bboxes: Sequence[BBox] | None,
+    text_bboxes: Sequence[BBox] = (),
+) -> tuple[Image.Image, list[Band] | None]:
+    """Input image for the secondary engines under a figure mode.
+
+    Args:
+        image: Page image.
+        mode: One of FIGURE_MODES.
+        figure_bboxes: Yomitoku's figure bboxes for the page.
+        text_bboxes: Yomitoku's text line bboxes (used by "crop").
+
+    Returns:
+        (image, bands): bands is None when results are already in page
+        coordinates.
+
+    Raises:
+        ValueError: If mode is unknown.
+    """
+    if mode not in FIGURE_MODES:
+        raise ValueError(f"Unknown figure mode: {mode} (choose from {', '.join(FIGURE_MODES)})")
+    if mode == "filter" or not figure_bboxes:
+        return image, None
+    if mode == "mask":
+        return mask_figure_boxes(image, figure_bboxes), None
+    return crop_figure_bands(image, figure_bboxes, text_bboxes)
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
+from functools import partial
+
 from PIL import Image
 
+from .cache import EngineResultCache
 from .core import (
     EngineResult,
     TextWithBox,
+    _bbox_points_to_rect,
+    _cluster_words_to_lines,
     _filter_items_by_figures,
     _get_easyocr_reader,
     _get_paddleocr_reader,
@@ -14,208 +20,98 @@ from .core import (
     _get_yomitoku_analyzer,
     _is_word_inside_figures,
 )
+from .line_runners import run_easyocr_lines, run_paddleocr_lines
+from .regions import FIGURE_MODES, BBox
+from .scheduling import _EngineRunners, _figure_input, _line_jobs, _run_engines, _run_on, _yomitoku_first
 
+# Default ROVER engines (Tesseract excluded)
+DEFAULT_ENGINES = ["yomitoku", "paddleocr", "easyocr"]
 
-def run_yomitoku_with_boxes(
-    image: Image.Image,
-    device: str = "cpu",
-) -> EngineResult:
-    """Run Yomitoku OCR with bounding boxes.
+
+def yomitoku_result_from_analysis(results) -> EngineResult:
+    """Build the Yomitoku EngineResult from a DocumentAnalyzer result.
 
     Uses words instead of paragraphs to get accurate line-by-line output.
-    This prevents multi-line paragraphs from being returned as single items.
     Words inside figure regions are excluded from output.
 
     Args:
-        image: PIL Image to process.
-        device: Device to use ("cuda" or "cpu").
+        results: DocumentAnalyzerSchema, freshly computed or loaded from
+            the detect-layout cache.
 
     Returns:
         EngineResult with text and bboxes (one per physical line).
     """
-    try:
-        import cv2
-        import numpy as np
-
-        analyzer = _get_yomitoku_analyzer(device)
-
-        # Convert PIL to cv2 format (BGR)
-        img_array = np.array(image.convert("RGB"))
-        cv_img = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-
-        # Run OCR
-        results, _, _ = analyzer(cv_img)
-
-        # Extract figure bboxes
-        figure_bboxes: list[tuple[int, int, int, int]] = []
-        for fig in results.figures:
-            if hasattr(fig, "box") and fig.box:
-                figure_bboxes.append(
-                    (
-                        int(fig.box[0]),
-                        int(fig.box[1]),
-                        int(fig.box[2]),
-                        int(fig.box[3]),
-                    )
+    # Extract figure bboxes
+    figure_bboxes: list[tuple[int, int, int, int]] = []
+    for fig in results.figures:
+        if hasattr(fig, "box") and fig.box:
+            figure_bboxes.append(
+                (
+                    int(fig.box[0]),
+                    int(fig.box[1]),
+                    int(fig.box[2]),
+                    int(fig.box[3]),
                 )
-
-        # Extract section headings
-        headings: list[str] = []
-        for p in results.paragraphs:
-            if getattr(p, "role", None) == "section_headings":
-                contents = getattr(p, "contents", "")
-                if contents:
-                    # Normalize: remove newlines, strip whitespace
-                    heading_text = contents.replace("\n", " ").strip()
-                    headings.append(heading_text)
-
-        # Filter out words inside figures
-        filtered_words = [w for w in results.words if not _is_word_inside_figures(w, results.figures)]
-
-        # Use words for line-level output (not paragraphs)
-        items = _cluster_words_to_lines(filtered_words)
-
-        return EngineResult(
-            engine="yomitoku",
-            items=items,
-            success=True,
-            figures=figure_bboxes if figure_bboxes else None,
-            headings=headings if headings else None,
-        )
-    except Exception as e:
-        return EngineResult(engine="yomitoku", items=[], success=False, error=str(e))
-
-
-def _cluster_words_to_lines(
-    words: list,
-    y_tolerance: int = 15,
-) -> list[TextWithBox]:
-    """Cluster yomitoku words into lines by y-coordinate.
-
-    Args:
-        words: List of yomitoku word objects.
-        y_tolerance: Maximum y-distance to consider same line.
-
-    Returns:
-        List of TextWithBox, one per line.
-    """
-    if not words:
-        return []
-
-    # Extract word data
-    word_data = []
-    for word in words:
-        if not hasattr(word, "content") or not word.content:
-            continue
-
-        # Get y_center from points or box
-        y_center = 0.0
-        bbox = (0, 0, 0, 0)
-
-        if hasattr(word, "points") and word.points:
-            # points: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-            pts = word.points
-            x_coords = [p[0] for p in pts]
-            y_coords = [p[1] for p in pts]
-            bbox = (
-                int(min(x_coords)),
-                int(min(y_coords)),
-                int(max(x_coords)),
-                int(max(y_coords)),
-            )
-            y_center = (bbox[1] + bbox[3]) / 2.0
-        elif hasattr(word, "box") and word.box:
-            box = word.box
-            bbox = (int(box[0]), int(box[1]), int(box[2]), int(box[3]))
-            y_center = (bbox[1] + bbox[3]) / 2.0
-        else:
-            continue
-
-        confidence = getattr(word, "rec_score", 1.0)
-        word_data.append(
-            {
-                "text": word.content,
-                "bbox": bbox,
-                "y_center": y_center,
-                "x_left": bbox[0],
-                "confidence": confidence,
-            }
-        )
-
-    if not word_data:
-        return []
-
-    # Sort by y_center
-    word_data.sort(key=lambda w: w["y_center"])
-
-    # Cluster into lines
-    lines: list[list[dict]] = []
-    current_line = [word_data[0]]
-
-    for wd in word_data[1:]:
-        current_y = sum(w["y_center"] for w in current_line) / len(current_line)
-        if abs(wd["y_center"] - current_y) <= y_tolerance:
-            current_line.append(wd)
-        else:
-            lines.append(current_line)
-            current_line = [wd]
-
-    if current_line:
-        lines.append(current_line)
-
-    # Convert lines to TextWithBox
-    items: list[TextWithBox] = []
-    for line_words in lines:
-        # Sort words by x-coordinate
-        line_words.sort(key=lambda w: w["x_left"])
-
-        # Combine text
-        text = "".join(w["text"] for w in line_words)
-
-        # Combined bbox
-        x1 = min(w["bbox"][0] for w in line_words)
-        y1 = min(w["bbox"][1] for w in line_words)
-        x2 = max(w["bbox"][2] for w in line_words)
-        y2 = max(w["bbox"][3] for w in line_words)
-
-        # Average confidence
-        avg_conf = sum(w["confidence"] for w in line_words) / len(line_words)
-
-        items.append(
-            TextWithBox(
-                text=text,
-                bbox=(x1, y1, x2, y2),
-                confidence=avg_conf,
             )
-        )
 
-    return items
+    # Extract section headings
+    headings: list[str] = []
+    for p in results.paragraphs:
+        if getattr(p, "role", None) == "section_headings":
+            contents = getattr(p, "contents", "")
+            if contents:
+                # Normalize: remove newlines, strip whitespace
+                heading_text = contents.replace("\n", " ").strip()
+                headings.append(heading_text)
+
+    # Filter out words inside figures
+    filtered_words = [w for w in results.words if not _is_word_inside_figures(w, results.figures)]
+
+    # Use words for line-level output (not paragraphs)
+    items = _cluster_words_to_lines(filtered_words)
+
+    return EngineResult(
+        engine="yomitoku",
+        items=items,
+        success=True,
+        figures=figure_bboxes if figure_bboxes else None,
+        headings=headings if headings else None,
+    )
 
 
-def _get_paragraph_confidence(paragraph, words) -> float:
-    """Get paragraph confidence from matching words.
+def run_yomitoku_with_boxes(
+    image: Image.Image,
+    device: str = "cpu",
+    analysis=None,
+) -> EngineResult:
+    """Run Yomitoku OCR with bounding boxes.
 
     Args:
-        paragraph: Yomitoku paragraph object
-        words: List of Yomitoku word objects
+        image: PIL Image to process.
+        device: Device to use ("cuda" or "cpu").
+        analysis: Cached DocumentAnalyzerSchema for this image (from
+            detect-layout). When given, the analyzer is not run again.
 
     Returns:
-        Minimum rec_score from matching words, or 1.0 if no match found.
+        EngineResult with text and bboxes (one per physical line).
     """
-    if not hasattr(paragraph, "contents") or not paragraph.contents:
-        return 1.0
+    try:
+        if analysis is None:
+            import cv2
+            import numpy as np
 
-    para_text = paragraph.contents
-    matching_scores = []
+            analyzer = _get_yomitoku_analyzer(device)
 
-    for word in words:
-        if hasattr(word, "content") and hasattr(word, "rec_score"):
-            # Check if word is part of this paragraph
-            if word.content in para_text:
-                matching_scores.append(word.rec_score)
+            # Convert PIL to cv2 format (BGR)
+            img_array = np.array(image.convert("RGB"))
+            cv_img = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
 
-    # Return minimum score (most conservative), or 1.0 if no matches
-    return min(matching_scores) if matching_scores else 1.0
+            # Run OCR
+            analysis, _, _ = analyzer(cv_img)
+
+        return yomitoku_result_from_analysis(analysis)
+    except Exception as e:
+        return EngineResult(engine="yomitoku", items=[], success=False, error=str(e))
 
 
 def run_paddleocr_with_boxes(
@@ -276,25 +172,6 @@ def run_paddleocr_with_boxes(
         return EngineResult(engine="paddleocr", items=[], success=False, error=str(e))
 
 
-def _bbox_points_to_rect(bbox_points: list[list[float]]) -> tuple[int, int, int, int]:
-    """Convert EasyOCR bbox points to bounding rectangle.
-
-    Args:
-        bbox_points: [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-
-    Returns:
-        Tuple of (x_min, y_min, x_max, y_max).
-    """
-    x_coords = [p[0] for p in bbox_points]
-    y_coords = [p[1] for p in bbox_points]
-    return (
-        int(min(x_coords)),
-        int(min(y_coords)),
-        int(max(x_coords)),
-        int(max(y_coords)),
-    )
-
-
 def run_easyocr_with_boxes(
     image: Image.Image,
     lang_list: list[str] | None = None,
@@ -389,6 +266,40 @@ def run_tesseract_with_boxes(
         return EngineResult(engine="tesseract", items=[], success=False, error=str(e))
 
 
+def _engine_runners(
+    engines: list[str],
+    device: str,
+    *,
+    yomitoku_analysis,
+    tesseract_lang: str,
+    easyocr_langs: list[str] | None,
+    paddleocr_lang: str,
+    easyocr_preprocessing: bool,
+) -> _EngineRunners:
+    """Runners for engines, Yomitoku first; unknown engine names are skipped."""
+    selected = _EngineRunners(skip_cache="yomitoku" if yomitoku_analysis is not None else None)
+    if "yomitoku" in engines:
+        selected.runners["yomitoku"] = partial(run_yomitoku_with_boxes, device=device, analysis=yomitoku_analysis)
+        selected.params["yomitoku"] = {"device": device}
+    for engine in engines:
+        if engine == "paddleocr":
+            selected.runners[engine] = partial(run_paddleocr_with_boxes, lang=paddleocr_lang)
+            selected.line_runners[engine] = partial(run_paddleocr_lines, lang=paddleocr_lang)
+            selected.params[engine] = {"lang": paddleocr_lang}
+        elif engine == "easyocr":
+            selected.runners[engine] = partial(
+                run_easyocr_with_boxes, lang_list=easyocr_langs, apply_preprocessing=easyocr_preprocessing
+            )
+            selected.line_runners[engine] = partial(
+                run_easyocr_lines, lang_list=easyocr_langs, apply_preprocessing=easyocr_preprocessing
+            )
+            selected.params[engine] = {"langs": easyocr_langs, "preprocessing": easyocr_preprocessing}
+        elif engine == "tesseract":
+            selected.runners[engine] = partial(run_tesseract_with_boxes, lang=tesseract_lang)
+            selected.params[engine] = {"lang": tesseract_lang}
+    return selected
+
+
 def run_all_engines(
     image: Image.Image,
     engines: list[str] | None = None,
@@ -397,11 +308,26 @@ def run_all_engines(
     easyocr_langs: list[str] | None = None,
     paddleocr_lang: str = "japan",
     easyocr_preprocessing: bool = True,
+    *,
+    yomitoku_analysis=None,
+    max_workers: int | None = None,
+    cache: EngineResultCache | None = None,
+    figure_mode: str = "filter",
+    recognize_lines: bool = False,
+    line_bboxes: Sequence[BBox] | None = None,
 ) -> dict[str, EngineResult]:
-    """Run all specified OCR engines.
+    """Run all specified OCR engines concurrently.
+
+    Engines run in a thread pool (their native inference releases the GIL),
+    so a page takes about as long as the slowest engine. Once all engines
+    have finished, text inside the figures Yomitoku detected is excluded
+    from the other engines' results.
 
-    Yomitoku is run first to detect figures. Text inside figures is excluded
-    from all engine results.
+    With figure_mode "mask" or "crop", Yomitoku runs first and the other
+    engines get the page with its figures masked or cut out (see
+    regions.py), so they spend no detection time on diagrams. With
+    recognize_lines, Yomitoku also runs first and PaddleOCR/EasyOCR only
+    recognize its line boxes (run_paddleocr_lines, run_easyocr_lines).
 
     Args:
         image: PIL Image to process.
@@ -411,38 +337,78 @@ def run_all_engines(
         easyocr_langs: EasyOCR language list.
         paddleocr_lang: PaddleOCR language code.
         easyocr_preprocessing: Apply CLAHE preprocessing to EasyOCR (default: True).
+        yomitoku_analysis: Cached DocumentAnalyzerSchema for this image; reused
+            instead of running Yomitoku again.
+        max_workers: Engines run at the same time (default: all; 1 = sequential).
+        cache: Result cache; engines with a cached result for this image and
+            configuration are not run.
+        figure_mode: How the other engines skip Yomitoku's figures: "filter"
+            (drop items afterwards), "mask" or "crop". Needs Yomitoku in
+            engines; otherwise only filtering applies.
+        recognize_lines: Skip PaddleOCR/EasyOCR text detection and recognize
+            only line boxes. Without Yomitoku's lines (or line_bboxes) they
+            read the full page.
+        line_bboxes: Line boxes for recognize_lines instead of Yomitoku's
+            lines of this call.
 
     Returns:
-        Dict mapping engine name to EngineResult.
+        Dict mapping engine name to EngineResult (Yomitoku first).
+
+    Raises:
+        ValueError: If figure_mode is unknown.
     """
-    if engines is None:
-        engines = ["yomitoku", "paddleocr", "easyocr"]  # Tesseract excluded by default
+    if figure_mode not in FIGURE_MODES:
+        raise ValueError(f"Unknown figure mode: {figure_mode} (choose from {', '.join(FIGURE_MODES)})")
+
+    selected = _engine_runners(
+        engines or DEFAULT_ENGINES,
+        device,
+        yomitoku_analysis=yomitoku_analysis,
+        tesseract_lang=tesseract_lang,
+        easyocr_langs=easyocr_langs,
+        paddleocr_lang=paddleocr_lang,
+        easyocr_preprocessing=easyocr_preprocessing,
+    )
+    if not selected.runners:
+        return {}
+    # Decode once here: engine threads loading a lazily opened image at the same time corrupt the decode
+    image.load()
 
     results: dict[str, EngineResult] = {}
+    engine_image, bands, extra = image, None, None
+    need_lines = recognize_lines and line_bboxes is None and any(e in selected.line_runners for e in selected.runners)
+    if (figure_mode != "filter" or need_lines) and "yomitoku" in selected.runners and len(selected.runners) > 1:
+        # The other engines' input depends on Yomitoku's figures or lines
+        results["yomitoku"] = _yomitoku_first(image, selected, cache, max_workers)
+        if need_lines and results["yomitoku"].success:
+            line_bboxes = [item.bbox for item in results["yomitoku"].items]
+        if figure_mode != "filter":
+            engine_image, bands, extra = _figure_input(image, figure_mode, results["yomitoku"])
+
+    jobs: dict[str, Callable[[], EngineResult]] = {}
+    keys: dict[str, str] = {}
+    if recognize_lines and line_bboxes is not None:
+        jobs, keys = _line_jobs(image, selected, cache, line_bboxes)
+    jobs.update({engine: partial(_run_on, run, engine_image, bands) for engine, run in selected.runners.items()})
+    keys.update(selected.cache_keys(cache, list(selected.runners), engine_image, extra))
+    results.update(_run_engines(jobs, cache, keys, max_workers))
+
+    return filter_figure_items({engine: results[engine] for engine in selected.params})
+
+
+def filter_figure_items(results: dict[str, EngineResult]) -> dict[str, EngineResult]:
+    """Exclude text inside Yomitoku's figure regions from the other engines.
 
-    # Run yomitoku first to get figure regions
-    figure_bboxes: list[tuple[int, int, int, int]] = []
-    if "yomitoku" in engines:
-        results["yomitoku"] = run_yomitoku_with_boxes(image, device)
-        if results["yomitoku"].figures:
-            figure_bboxes = results["yomitoku"].figures
-
-    # Run other engines and filter by figure regions
-    for engine in engines:
-        if engine == "yomitoku":
-            continue  # Already run
-        elif engine == "paddleocr":
-            result = run_paddleocr_with_boxes(image, paddleocr_lang)
-        elif engine == "easyocr":
-            result = run_easyocr_with_boxes(image, easyocr_langs, easyocr_preprocessing)
-        elif engine == "tesseract":
-            result = run_tesseract_with_boxes(image, tesseract_lang)
-        else:
-            continue
-
-        # Filter out items inside figures
-        if figure_bboxes:
-            result = _filter_items_by_figures(result, figure_bboxes)
-        results[engine] = result
+    Args:
+        results: Dict mapping engine name to EngineResult.
 
-    return results
+    Returns:
+        Dict with Yomitoku first and the other engines' results filtered.
+    """
+    ordered = {engine: results[engine] for engine in sorted(results, key=lambda e: e != "yomitoku")}
+    figure_bboxes = ordered["yomitoku"].figures if "yomitoku" in ordered else None
+    if figure_bboxes:
+        for engine, result in ordered.items():
+            if engine != "yomitoku":
+                ordered[engine] = _filter_items_by_figures(result, figure_bboxes)
+    return ordered
@@ -0,0 +1,125 @@
+"""Scheduling the engine jobs of one run_all_engines call.
+
+Engines run concurrently in a thread pool, reading and filling the result
+cache. When the other engines' input depends on Yomitoku (figure masking or
+cropping, line-box recognition), Yomitoku runs first.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from PIL import Image
+
+from .cache import EngineResultCache, image_hash
+from .core import EngineResult
+from .regions import Band, BBox, map_result_to_page, prepare_figure_input
+
+
+def _run_on(run: Callable[[Image.Image], EngineResult], image: Image.Image, bands: list[Band] | None) -> EngineResult:
+    """Run an engine on an image, mapping results on a cropped image back to the page."""
+    result = run(image)
+    return map_result_to_page(result, bands) if bands is not None else result
+
+
+def _run_engines(
+    jobs: dict[str, Callable[[], EngineResult]],
+    cache: EngineResultCache | None,
+    keys: dict[str, str],
+    max_workers: int | None,
+) -> dict[str, EngineResult]:
+    """Run engine jobs concurrently, reading and filling the cache."""
+    results: dict[str, EngineResult] = {}
+    jobs = dict(jobs)
+    if cache is not None:
+        for engine in [e for e in jobs if e in keys]:
+            cached = cache.get(keys[engine])
+            if cached is not None:
+                results[engine] = cached
+                del jobs[engine]
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+            futures = {engine: pool.submit(run) for engine, run in jobs.items()}
+            for engine, future in futures.items():
+                results[engine] = future.result()
+                if cache is not None and engine in keys:
+                    cache.put(keys[engine], results[engine])
+    return results
+
+
+@dataclass
+class _EngineRunners:
+    """Runners of the engines of one run_all_engines call.
+
+    Attributes:
+        runners: Page runners by engine (taken out as they are scheduled).
+        line_runners: Line-box recognizers of the engines that have one.
+        params: Configuration of each engine, part of its cache key.
+        skip_cache: Engine whose result is not cached (Yomitoku built from
+            a cached analysis).
+    """
+
+    runners: dict[str, Callable[[Image.Image], EngineResult]] = field(default_factory=dict)
+    line_runners: dict[str, Callable[[Image.Image, Sequence[BBox]], EngineResult]] = field(default_factory=dict)
+    params: dict[str, dict] = field(default_factory=dict)
+    skip_cache: str | None = None
+
+    def cache_keys(
+        self, cache: EngineResultCache | None, engines: list[str], img: Image.Image, extra: dict | None = None
+    ) -> dict[str, str]:
+        """Cache keys of engines reading img, with extra input configuration."""
+        if cache is None:
+            return {}
+        pixel_hash = image_hash(img)
+        return {
+            e: cache.key(pixel_hash, e, {**self.params[e], **(extra or {})}) for e in engines if e != self.skip_cache
+        }
+
+
+def _yomitoku_first(
+    image: Image.Image, selected: _EngineRunners, cache: EngineResultCache | None, max_workers: int | None
+) -> EngineResult:
+    """Run Yomitoku ahead of the other engines, taking it out of selected."""
+    first = {"yomitoku": partial(selected.runners.pop("yomitoku"), image)}
+    return _run_engines(first, cache, selected.cache_keys(cache, ["yomitoku"], image), max_workers)["yomitoku"]
+
+
+def _figure_input(
+    image: Image.Image, figure_mode: str, yomitoku: EngineResult
+) -> tuple[Image.Image, list[Band] | None, dict | None]:
+    """Page the other engines read with Yomitoku's figures masked or cut out.
+
+    Returns:
+        (engine image, bands mapping a cropped image back to the page or
+        None, extra cache key configuration or None if the page is used
+        as is).
+    """
+    figures = yomitoku.figures if yomitoku.success else None
+    text_bboxes = [item.bbox for item in yomitoku.items]
+    engine_image, bands = prepare_figure_input(image, figure_mode, figures, text_bboxes)
+    if engine_image is image:
+        return image, bands, None
+    # Keyed by the engines' actual input and how results map back
+    return engine_image, bands, {"figure_mode": figure_mode, "bands": bands}
+
+
+def _line_jobs(
+    image: Image.Image, selected: _EngineRunners, cache: EngineResultCache | None, line_bboxes: Sequence[BBox]
+) -> tuple[dict[str, Callable[[], EngineResult]], dict[str, str]]:
+    """Jobs recognizing only line_bboxes, for the engines that can.
+
+    Those engines are taken out of selected.runners.
+
+    Returns:
+        (jobs, cache keys) by engine.
+    """
+    lines = [tuple(bbox) for bbox in line_bboxes]
+    jobs: dict[str, Callable[[], EngineResult]] = {}
+    for engine in [e for e in selected.runners if e in selected.line_runners]:
+        del selected.runners[engine]
+        jobs[engine] = partial(selected.line_runners[engine], image, lines)
+    return jobs, selected.cache_keys(cache, list(jobs), image, {"lines": lines})
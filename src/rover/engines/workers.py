@@ -0,0 +1,318 @@
+"""Multi-process execution backends for OCR engines.
+
+EngineWorkerPool: each engine gets one or more long-lived processes that
+load the model once (through the lazy singletons in core) and then take
+pages from that engine's queue. Engines therefore no longer share one
+process's threads and memory, and pages are pipelined: EasyOCR can work on
+page N while Yomitoku is already on page N+1. Workers are supervised: a
+crash or a page timeout costs only that page, recorded as a failed result.
+
+map_pages: pages are sharded across N processes, each with its own set of
+engines and a fixed intra-op thread count. N is capped so that N engine
+sets fit in the available memory.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import connection
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, TypeVar
+
+from src.preprocessing.pages import PageRef
+
+from .core import EngineResult
+
+T = TypeVar("T")
+
+# Approximate resident memory per loaded engine, in GiB
+ENGINE_MEMORY_GB = {
+    "yomitoku": 3.0,
+    "paddleocr": 1.5,
+    "easyocr": 1.5,
+    "tesseract": 0.3,
+}
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+WARMUP_TIMEOUT = 300.0  # Extra seconds for a worker's first page (model loading)
+
+
+def _worker_main(engine: str, options: dict[str, Any], conn) -> None:
+    """Worker loop: run one engine on pages until a None task arrives."""
+    from .runners import run_all_engines
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        key, page = task
+        try:
+            with page.open() as img:
+                result = run_all_engines(img, engines=[engine], max_workers=1, **options)[engine]
+        except Exception as e:
+            result = EngineResult(engine=engine, items=[], success=False, error=str(e))
+        conn.send((key, result))
+
+
+@dataclass
+class _Worker:
+    """A supervised engine process and the task it is working on."""
+
+    engine: str
+    proc: BaseProcess
+    conn: Connection
+    task: tuple[int, PageRef] | None = None
+    deadline: float = 0.0
+    warm: bool = False
+
+
+class EngineWorkerPool:
+    """Supervised, long-lived worker processes per engine.
+
+    Each worker has its own pipe, so a worker that segfaults, hangs past
+    the page timeout or is killed only loses its current page: the page is
+    recorded as a failed EngineResult and the worker is restarted.
+    Use as a context manager so the workers are always shut down.
+    """
+
+    def __init__(
+        self,
+        engines: list[str],
+        workers_per_engine: int = 1,
+        *,
+        timeout: float | None = None,
+        warmup_timeout: float = WARMUP_TIMEOUT,
+        mp_context: str = "spawn",
+        **options: Any,
+    ):
+        """Start the workers.
+
+        Args:
+            engines: Engine names to start workers for.
+            workers_per_engine: Processes per engine.
+            timeout: Seconds an engine may spend on one page (None: no limit).
+            warmup_timeout: Extra seconds for a worker's first page, which
+                includes loading the model.
+            mp_context: multiprocessing start method ("spawn" avoids
+                inheriting initialized native libraries).
+            **options: Keyword arguments for run_all_engines (device,
+                paddleocr_lang, easyocr_langs, ...).
+        """
+        if workers_per_engine < 1:
+            raise ValueError("workers_per_engine must be at least 1")
+        self.engines = list(engines)
+        self.timeout = timeout
+        self.warmup_timeout = warmup_timeout
+        self.restarts = 0
+        self._ctx = mp.get_context(mp_context)
+        self._options = options
+        self._workers = [self._start(engine) for engine in self.engines for _ in range(workers_per_engine)]
+
+    def __enter__(self) -> EngineWorkerPool:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _start(self, engine: str) -> _Worker:
+        conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(engine, self._options, child_conn),
+            name=f"ocr-{engine}",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        return _Worker(engine=engine, proc=proc, conn=conn)
+
+    def _assign(self, worker: _Worker, task: tuple[int, PageRef]) -> tuple[int, EngineResult] | None:
+        """Send a page to an idle worker; a worker that died while idle fails the page."""
+        worker.task = task
+        if self.timeout is not None:
+            extra = 0.0 if worker.warm else self.warmup_timeout
+            worker.deadline = time.monotonic() + self.timeout + extra
+        try:
+            worker.conn.send(task)
+        except OSError:
+            code = worker.proc.exitcode if not worker.proc.is_alive() else None
+            return self._replace(worker, f"worker crashed (exit code {code})")
+        return None
+
+    def _replace(self, worker: _Worker, error: str) -> tuple[int, EngineResult]:
+        """Kill a failed worker, start a new one and return the lost page as failed."""
+        assert worker.task is not None
+        key, page = worker.task
+        print(f"  {worker.engine}: worker failed on {page.name} ({error}), restarting")
+        if worker.proc.is_alive():
+            worker.proc.kill()
+        worker.proc.join()
+        worker.conn.close()
+        self._workers[self._workers.index(worker)] = self._start(worker.engine)
+        self.restarts += 1
+        return key, EngineResult(engine=worker.engine, items=[], success=False, error=error)
+
+    def _collect(self) -> list[tuple[str, int, EngineResult]]:
+        """Wait for finished, crashed or timed-out pages."""
+        busy = [w for w in self._workers if w.task is not None]
+        if not busy:
+            raise RuntimeError("no engine worker is running a page")
+        wait_for = None
+        if self.timeout is not None:
+            wait_for = max(0.0, min(w.deadline for w in busy) - time.monotonic())
+        ready = connection.wait([w.conn for w in busy], timeout=wait_for)
+
+        finished = []
+        for worker in busy:
+            if worker.conn in ready:
+                try:
+                    key, result = worker.conn.recv()
+                except (EOFError, OSError):
+                    code = worker.proc.exitcode if not worker.proc.is_alive() else None
+                    key, result = self._replace(worker, f"worker crashed (exit code {code})")
+                    finished.append((worker.engine, key, result))
+                    continue
+                worker.task, worker.warm = None, True
+                finished.append((worker.engine, key, result))
+            elif self.timeout is not None and time.monotonic() >= worker.deadline:
+                key, result = self._replace(worker, f"timed out after {self.timeout:g}s")
+                finished.append((worker.engine, key, result))
+        return finished
+
+    def run(self, jobs: Iterable[tuple[PageRef, list[str]]]) -> Iterator[tuple[int, dict[str, EngineResult]]]:
+        """Run engines on pages, yielding each page's results in input order.
+
+        Pages are handed to idle workers of each engine as soon as they are
+        free, so every engine works through the book at its own pace.
+
+        Args:
+            jobs: (page, engines to run on it) pairs. Engines must be a
+                subset of the pool's engines.
+
+        Yields:
+            (job index, {engine: EngineResult}) in job order.
+        """
+        expected: list[set[str]] = []
+        pending: dict[str, deque[tuple[int, PageRef]]] = {engine: deque() for engine in self.engines}
+        for key, (page, engines) in enumerate(jobs):
+            expected.append(set(engines))
+            for engine in engines:
+                pending[engine].append((key, page))
+
+        done: dict[int, dict[str, EngineResult]] = {}
+        next_key = 0
+        while next_key < len(expected):
+            if expected[next_key] <= done.get(next_key, {}).keys():
+                yield next_key, done.pop(next_key, {})
+                next_key += 1
+                continue
+            for worker in self._workers:
+                if worker.task is None and pending[worker.engine]:
+                    failed = self._assign(worker, pending[worker.engine].popleft())
+                    if failed is not None:
+                        key, result = failed
+                        done.setdefault(key, {})[worker.engine] = result
+            if any(worker.task is not None for worker in self._workers):
+                for engine, key, result in self._collect():
+                    done.setdefault(key, {})[engine] = result
+
+    def close(self) -> None:
+        """Stop all workers."""
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.proc.join(timeout=10)
+            if worker.proc.is_alive():
+                worker.proc.kill()
+                worker.proc.join()
+            worker.conn.close()
+        self._workers = []
+
+
+def available_memory_gb() -> float | None:
+    """Memory available for new processes in GiB, or None if unknown."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024**2
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024**3
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def plan_jobs(jobs: int, engines: Sequence[str], memory_budget_gb: float | None = None) -> int:
+    """Cap the number of page jobs so that each job's engine set fits in memory.
+
+    Args:
+        jobs: Requested number of jobs.
+        engines: Engines loaded by every job.
+        memory_budget_gb: Memory for all jobs (default: currently available).
+
+    Returns:
+        Number of jobs to run (at least 1).
+    """
+    per_job = sum(ENGINE_MEMORY_GB.get(engine, 1.0) for engine in engines)
+    budget = memory_budget_gb if memory_budget_gb is not None else available_memory_gb()
+    if budget is None or per_job <= 0:
+        return max(1, jobs)
+    return max(1, min(jobs, int(budget // per_job)))
+
+
+def set_thread_limits(threads: int) -> None:
+    """Limit intra-op threads of torch/paddle/OpenMP in this process.
+
+    Must run before the engines are imported to affect OpenMP pools.
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def map_pages(
+    func: Callable[..., T],
+    pages: Sequence[PageRef],
+    jobs: int,
+    threads: int | None = None,
+    *,
+    mp_context: str = "spawn",
+) -> Iterator[T]:
+    """Apply func to pages in jobs worker processes, yielding results in page order.
+
+    Args:
+        func: Picklable function of one page; each worker keeps its own
+            engine singletons across pages.
+        pages: Pages to process.
+        jobs: Number of worker processes.
+        threads: Intra-op threads per worker (default: CPU count / jobs).
+        mp_context: multiprocessing start method.
+
+    Yields:
+        func(page) for each page, in order.
+    """
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=mp.get_context(mp_context),
+        initializer=set_thread_limits,
+        initargs=(threads,),
+    ) as pool:
+        yield from pool.map(func, pages)
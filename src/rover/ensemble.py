@@ -11,13 +11,23 @@ Strategy:
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from PIL import Image
 
+from src.preprocessing.pages import PageRef, list_pages
 from src.rover.alignment import align_texts_character_level, vote_aligned_text
-from src.rover.engines import EngineResult, run_all_engines
+from src.rover.engines import (
+    DEFAULT_ENGINES,
+    EngineResult,
+    map_pages,
+    plan_jobs,
+    run_all_engines,
+)
 from src.rover.line_processing import (
     AlignedLine,
     OCRLine,
@@ -26,7 +36,8 @@ from src.rover.line_processing import (
     is_garbage,
     normalize_confidence,
 )
-from src.rover.output import ROVEROutput
+from src.rover.output import Checkpoint, ROVEROutput
+from src.rover.page_engines import BatchOptions, engine_results_pooled, ocr_page
 
 # Engine priority weights for voting (Tesseract excluded from ROVER)
 ENGINE_WEIGHTS = {
@@ -206,85 +217,167 @@ def run_rover_ocr(
     )
 
 
+def _page_results(
+    pages: list[PageRef], engines: list[str], options: BatchOptions, pooled: bool
+) -> Iterator[tuple[PageRef, dict[str, EngineResult], bool]]:
+    """Run the engines on pages with the backend options select.
+
+    Args:
+        pages: Pages to process.
+        engines: Engine names.
+        options: Batch options.
+        pooled: Use per-engine worker processes (options.uses_engine_workers
+            for the whole batch).
+
+    Yields:
+        (page, engine results, whether Yomitoku's analysis was cached), in
+        page order.
+    """
+    run_page = partial(ocr_page, engines=engines, options=options)
+    if options.daemon is not None:
+        print(f"Using OCR daemon at {options.daemon.socket_path}")
+        return map(run_page, pages)
+    if not pooled and options.jobs > 1 and len(pages) > 1:
+        planned = min(plan_jobs(options.jobs, engines, options.memory_budget_gb), len(pages))
+        if planned < options.jobs:
+            print(f"Jobs: {planned} (capped from {options.jobs} by memory budget and page count)")
+        else:
+            print(f"Jobs: {planned}")
+        return map_pages(run_page, pages, planned, options.threads)
+    if pooled and pages:
+        print(f"Engine workers: {max(options.engine_workers, 1)} per engine")
+        if options.figure_mode != "filter":
+            print(f"Figure mode {options.figure_mode} is not available with engine workers; filtering figures instead")
+        if options.adaptive_confidence is not None:
+            print("Adaptive engines are not available with engine workers; running every engine on every page")
+        if options.recognize_lines:
+            print("Line recognition is not available with engine workers; detecting text on the full page")
+        return engine_results_pooled(pages, engines, options)
+    return map(run_page, pages)
+
+
+def _skip_finished(pages: list[PageRef], checkpoint: Checkpoint) -> list[PageRef]:
+    """Pages the checkpoint does not record as finished from their current input."""
+    unfinished = [p for p in pages if not checkpoint.is_finished(p)]
+    if len(unfinished) < len(pages):
+        print(f"Resuming: skipping {len(pages) - len(unfinished)} finished pages")
+    return unfinished
+
+
+def _merged_pages(
+    page_results: Iterator[tuple[PageRef, dict[str, EngineResult], bool]],
+    output: ROVEROutput,
+    primary_engine: str,
+    min_agreement: int,
+) -> Iterator[tuple[PageRef, ROVERResult]]:
+    """ROVER-merge each page's engine results, writing and reporting its outputs."""
+    for page, engine_results, cached in page_results:
+        page_name = page.stem
+        print(f"\nProcessing {page.name}...")
+        if cached:
+            print("  yomitoku: using cached layout analysis")
+
+        # Save raw outputs and extract headings from yomitoku
+        for engine, result in engine_results.items():
+            if result.success:
+                output.save_raw(engine, page_name, result.text)
+                print(f"  {engine}: {len(result.items)} items")
+                # Save headings from yomitoku
+                if engine == "yomitoku" and result.headings:
+                    output.save_headings(page_name, result.headings)
+                    print(f"    headings: {result.headings}")
+            else:
+                print(f"  {engine}: FAILED - {result.error}")
+
+        # ROVER merge
+        rover_result = rover_merge(
+            engine_results,
+            primary_engine=primary_engine,
+            min_agreement=min_agreement,
+        )
+
+        # Save ROVER output
+        output.save_rover(page_name, rover_result.text)
+
+        # Report
+        contrib_str = ", ".join(f"{e}:{c}" for e, c in rover_result.engine_contributions.items() if c > 0)
+        print(f"  ROVER: {len(rover_result.lines)} lines, gaps_filled={rover_result.gaps_filled}")
+        print(f"  Contributions: {contrib_str}")
+
+        yield page, rover_result
+
+
 def run_rover_batch(
     pages_dir: str,
     output_dir: str,
     engines: list[str] | None = None,
     primary_engine: str = "yomitoku",
-    device: str = "cpu",
     min_agreement: int = 2,
+    options: BatchOptions | None = None,
     *,
     limit: int | None = None,
 ) -> list[tuple[str, ROVERResult]]:
     """Run ROVER OCR on all pages in a directory.
 
+    Outputs are written in page order whichever backend runs the engines:
+    the OCR daemon, page jobs, engine workers or this process (see
+    BatchOptions).
+
     Args:
         pages_dir: Directory containing page images.
         output_dir: Directory for output files.
         engines: List of engine names to use.
         primary_engine: Primary engine.
-        device: Device for Yomitoku.
         min_agreement: Minimum engines that must agree.
+        options: Engine, execution and reuse options: device, layout_dir,
+            figure_mode, adaptive_confidence, recognize_lines, engine_workers,
+            jobs, threads, memory_budget_gb, engine_timeout, daemon, cache and
+            resume (default: BatchOptions()). Engine workers run each engine
+            on its own, so they always filter figures, run every engine on
+            every page and detect text on the full page.
         limit: Process only first N files (for testing).
 
     Returns:
-        List of (page_name, ROVERResult) tuples.
+        List of (page_name, ROVERResult) tuples for the pages processed in
+        this run.
     """
-    import sys
-
-    pages_path = Path(pages_dir)
+    options = options or BatchOptions()
+    engine_list = engines or DEFAULT_ENGINES
     output = ROVEROutput(output_dir)
 
-    pages = sorted(pages_path.glob("*.png"))
+    pages = list_pages(Path(pages_dir))
     if limit:
         print(f"Processing first {limit} of {len(pages)} files", file=sys.stderr)
         pages = pages[:limit]
-    all_results: list[tuple[str, ROVERResult]] = []
+
+    # Pages are checkpointed once all their outputs are written. The backend
+    # is decided before resuming so the checkpoint records the configuration
+    # pages are actually processed with.
+    pooled = options.uses_engine_workers(len(pages))
+    checkpoint = Checkpoint(
+        output,
+        {
+            "engines": engine_list,
+            "primary_engine": primary_engine,
+            "min_agreement": min_agreement,
+            **(options.for_engine_workers() if pooled else options).engine_config(),
+        },
+        resume=options.resume,
+    )
+    if options.resume:
+        pages = _skip_finished(pages, checkpoint)
+    checkpoint.save()
 
     print(f"Running ROVER OCR on {len(pages)} pages...")
     if engines:
         print(f"Engines: {', '.join(engines)}")
 
-    for page_path in pages:
-        page_name = page_path.stem
-        print(f"\nProcessing {page_path.name}...")
-
-        with Image.open(page_path) as img:
-            # Run all engines
-            engine_results = run_all_engines(
-                img,
-                engines=engines,
-                device=device,
-            )
-
-            # Save raw outputs and extract headings from yomitoku
-            for engine, result in engine_results.items():
-                if result.success:
-                    output.save_raw(engine, page_name, result.text)
-                    print(f"  {engine}: {len(result.items)} items")
-                    # Save headings from yomitoku
-                    if engine == "yomitoku" and result.headings:
-                        output.save_headings(page_name, result.headings)
-                        print(f"    headings: {result.headings}")
-                else:
-                    print(f"  {engine}: FAILED - {result.error}")
-
-            # ROVER merge
-            rover_result = rover_merge(
-                engine_results,
-                primary_engine=primary_engine,
-                min_agreement=min_agreement,
-            )
-
-            # Save ROVER output
-            output.save_rover(page_name, rover_result.text)
-
-            # Report
-            contrib_str = ", ".join(f"{e}:{c}" for e, c in rover_result.engine_contributions.items() if c > 0)
-            print(f"  ROVER: {len(rover_result.lines)} lines, gaps_filled={rover_result.gaps_filled}")
-            print(f"  Contributions: {contrib_str}")
-
-            all_results.append((page_name, rover_result))
+    all_results: list[tuple[str, ROVERResult]] = []
+    for page, rover_result in _merged_pages(
+        _page_results(pages, engine_list, options, pooled), output, primary_engine, min_agreement
+    ):
+        checkpoint.mark_finished(page)
+        all_results.append((page.stem, rover_result))
 
     print("\n✅ ROVER OCR complete")
     print(f"  Raw outputs: {output.raw_dir}")
@@ -331,8 +424,8 @@ def main() -> None:
         output_dir=args.output,
         engines=engines,
         primary_engine=args.primary,
-        device=args.device,
         min_agreement=args.min_agreement,
+        options=BatchOptions(device=args.device),
     )
 
 
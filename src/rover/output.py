@@ -4,13 +4,46 @@ Manages directory structure and file outputs for:
 - Raw engine outputs (before ROVER processing)
 - ROVER-processed outputs (after補完)
 - Metadata (headings, figures, etc.)
+- Checkpoint manifest of completed pages (for resumed runs)
+
+All files are written atomically (temp file + rename), so a crash never
+leaves a truncated output behind.
 """
 
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
+from src.preprocessing.hash import sha256_file
+from src.preprocessing.pages import PageRef
+
+CHECKPOINT_VERSION = 1
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text to path through a temp file and rename."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def page_input_hash(page: PageRef, source_hashes: dict[Path, str] | None = None) -> str:
+    """Identity of a page's input: source file hash plus crop box.
+
+    Args:
+        page: Page to identify.
+        source_hashes: Memo of source file hashes, so pages sharing a
+            source (spread halves) hash it once.
+    """
+    box = ",".join(map(str, page.box)) if page.box else "full"
+    if source_hashes is None:
+        return f"{sha256_file(page.source)}:{box}"
+    if page.source not in source_hashes:
+        source_hashes[page.source] = sha256_file(page.source)
+    return f"{source_hashes[page.source]}:{box}"
+
 
 class ROVEROutput:
     """ROVER output directory manager."""
@@ -43,8 +76,7 @@ class ROVEROutput:
         """
         engine_dir = self.raw_dir / engine
         engine_dir.mkdir(parents=True, exist_ok=True)
-        output_file = engine_dir / f"{page}.txt"
-        output_file.write_text(text, encoding="utf-8")
+        _write_atomic(engine_dir / f"{page}.txt", text)
 
     def save_rover(self, page: str, text: str) -> None:
         """Save ROVER-processed output.
@@ -54,8 +86,7 @@ class ROVEROutput:
             text: ROVER-補完ed text.
         """
         self.rover_dir.mkdir(parents=True, exist_ok=True)
-        output_file = self.rover_dir / f"{page}.txt"
-        output_file.write_text(text, encoding="utf-8")
+        _write_atomic(self.rover_dir / f"{page}.txt", text)
 
     def get_raw_text(self, engine: str, page: str) -> str:
         """Read raw engine output.
@@ -101,10 +132,8 @@ class ROVEROutput:
 
         # Update and save
         data[page] = headings
-        self.headings_file.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.headings_file, json.dumps(data, ensure_ascii=False, indent=2))
 
     def get_all_headings(self) -> dict[str, list[str]]:
         """Read all headings from metadata file.
@@ -115,3 +144,81 @@ class ROVEROutput:
         if not self.headings_file.exists():
             return {}
         return json.loads(self.headings_file.read_text(encoding="utf-8"))
+
+    @property
+    def checkpoint_file(self) -> Path:
+        """Path to the manifest of completed pages."""
+        return self.base_dir / "checkpoint.json"
+
+    def load_checkpoint(self, config: dict | None = None) -> dict[str, str]:
+        """Read completed pages.
+
+        Args:
+            config: Engine configuration the pages must have been processed
+                with; a checkpoint written with another one is ignored.
+                None accepts any configuration.
+
+        Returns:
+            Dict mapping page identifiers to the input hash they were
+            processed from (empty if there is no valid checkpoint).
+        """
+        try:
+            data = json.loads(self.checkpoint_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CHECKPOINT_VERSION:
+            return {}
+        if config is not None and data.get("config") != config:
+            return {}
+        return {page: entry["input"] for page, entry in data.get("pages", {}).items()}
+
+    def save_checkpoint(self, pages: dict[str, str], config: dict | None = None) -> None:
+        """Write the manifest of completed pages.
+
+        Args:
+            pages: Dict mapping page identifiers to their input hash.
+            config: Engine configuration the pages were processed with.
+        """
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "config": config,
+            "pages": {page: {"input": input_hash} for page, input_hash in sorted(pages.items())},
+        }
+        _write_atomic(self.checkpoint_file, json.dumps(data, indent=2))
+
+
+class Checkpoint:
+    """Completed pages of a batch, saved after each one.
+
+    A page counts as finished only if it was processed from the same input
+    (page_input_hash) under the same engine configuration.
+    """
+
+    def __init__(self, output: ROVEROutput, config: dict, resume: bool = False):
+        """Start a checkpoint, keeping the saved one only when resuming.
+
+        Args:
+            output: Output directory manager.
+            config: Engine configuration of this batch.
+            resume: Keep pages the saved checkpoint records for config.
+        """
+        self.output = output
+        self.config = config
+        # Memo of source hashes, so spread halves hash their source once
+        self.source_hashes: dict[Path, str] = {}
+        self.completed = output.load_checkpoint(config) if resume else {}
+
+    def is_finished(self, page: PageRef) -> bool:
+        """Whether page was completed from its current input."""
+        # Only pages listed as completed are hashed up front
+        return page.stem in self.completed and self.completed[page.stem] == page_input_hash(page, self.source_hashes)
+
+    def save(self) -> None:
+        """Write the completed pages."""
+        self.output.save_checkpoint(self.completed, self.config)
+
+    def mark_finished(self, page: PageRef) -> None:
+        """Record page as completed and save."""
+        self.completed[page.stem] = page_input_hash(page, self.source_hashes)
+        self.save()
@@ -0,0 +1,276 @@
+"""Running the OCR engines on the pages of a ROVER batch.
+
+- BatchOptions: how a batch runs its engines and what it may reuse.
+- ocr_page: one page in this process, a page job or the OCR daemon,
+  reusing detect-layout's cached Yomitoku analysis when it is current.
+- run_adaptive_engines: Yomitoku first, then the secondary engines only
+  on the lines it is unsure of.
+- engine_results_pooled: pages pipelined through persistent per-engine
+  worker processes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from PIL import Image
+
+from src.layout.detector import load_yomitoku_box, load_yomitoku_results
+from src.preprocessing.pages import PageRef
+from src.rover.engines import (
+    DEFAULT_ENGINES,
+    EngineResult,
+    EngineResultCache,
+    EngineWorkerPool,
+    OCRDaemonClient,
+    TextWithBox,
+    filter_figure_items,
+    run_all_engines,
+    yomitoku_result_from_analysis,
+)
+from src.rover.engines.regions import line_bands, map_result_to_page, stack_bands
+from src.rover.line_processing import is_garbage, normalize_confidence
+
+ADAPTIVE_MIN_CONFIDENCE = 0.6  # Normalized Yomitoku confidence below which a line is re-read
+ADAPTIVE_MIN_LINES = 3  # Yomitoku lines below which the whole page is re-read
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    """How a ROVER batch runs the OCR engines on its pages.
+
+    Attributes:
+        device: Device for Yomitoku.
+        layout_dir: detect-layout output directory. Yomitoku analyses cached
+            there are reused instead of running Yomitoku again.
+        figure_mode: How the secondary engines skip Yomitoku's figures:
+            "filter", "mask" or "crop" (see run_all_engines).
+        adaptive_confidence: Run the secondary engines only on Yomitoku
+            lines below this normalized confidence or flagged as garbage
+            (see run_adaptive_engines). None runs every engine on every page.
+        recognize_lines: Have the secondary engines' recognizers read
+            Yomitoku's line boxes instead of detecting text themselves.
+        engine_workers: Persistent worker processes per engine; pages are
+            pipelined across engines. 0 runs engines in this process.
+        jobs: Worker processes pages are sharded across, each with its own
+            engines; capped by memory_budget_gb.
+        threads: Intra-op threads per job (default: CPU count / jobs).
+        memory_budget_gb: Memory for all jobs (default: currently available).
+        engine_timeout: Seconds an engine may spend on one page. Implies
+            engine workers (at least one per engine); a page that times out
+            or crashes its worker is recorded as a failed engine result.
+        daemon: Client of a running OCR daemon; engines run there (with
+            models already loaded) instead of in this process.
+        cache: Engine result cache; engines are only run on pages whose
+            pixels and engine configuration have not been seen before.
+        resume: Skip pages that the output checkpoint records as finished
+            from the same input and engine configuration; without it the
+            checkpoint starts over.
+    """
+
+    # Engines
+    device: str = "cpu"
+    layout_dir: str | None = None
+    figure_mode: str = "filter"
+    adaptive_confidence: float | None = None
+    recognize_lines: bool = False
+
+    # Execution
+    engine_workers: int = 0
+    jobs: int = 1
+    threads: int | None = None
+    memory_budget_gb: float | None = None
+    engine_timeout: float | None = None
+    daemon: OCRDaemonClient | None = None
+
+    # Reuse
+    cache: EngineResultCache | None = None
+    resume: bool = False
+
+    def uses_engine_workers(self, page_count: int) -> bool:
+        """Whether pages go through per-engine worker processes.
+
+        Page jobs (with more than one page) and the daemon take precedence.
+        """
+        if self.daemon is not None or (self.jobs > 1 and page_count > 1):
+            return False
+        return self.engine_workers > 0 or bool(self.engine_timeout)
+
+    def engine_config(self) -> dict:
+        """Options that change the engines' output, for the checkpoint."""
+        return {
+            "figure_mode": self.figure_mode,
+            "adaptive_confidence": self.adaptive_confidence,
+            "recognize_lines": self.recognize_lines,
+        }
+
+    def for_engine_workers(self) -> BatchOptions:
+        """These options as engine workers apply them.
+
+        Engine workers run each engine on its own, so the Yomitoku-guided
+        options are off: figures are filtered and every engine reads the
+        whole page.
+        """
+        return replace(
+            self,
+            engine_workers=max(self.engine_workers, 1),
+            figure_mode="filter",
+            adaptive_confidence=None,
+            recognize_lines=False,
+        )
+
+
+def load_cached_analysis(layout_dir: str | Path, page: PageRef):
+    """Load the Yomitoku analysis detect-layout cached for a page.
+
+    Args:
+        layout_dir: detect-layout output directory (contains yomitoku_cache/).
+        page: Page to look up.
+
+    Returns:
+        DocumentAnalyzerSchema, or None if there is no cache entry, it is
+        older than the page image or it was analyzed for another crop box
+        (a virtual page re-split with a new trim or gutter).
+    """
+    cache_file = Path(layout_dir) / "yomitoku_cache" / f"{page.stem}.pkl"
+    try:
+        if cache_file.stat().st_mtime_ns < page.source.stat().st_mtime_ns:
+            return None
+        page_box = tuple(page.box) if page.box is not None else None
+        if load_yomitoku_box(str(layout_dir), page.stem) != page_box:
+            return None
+        return load_yomitoku_results(str(layout_dir), page.stem)
+    except Exception:
+        # Missing or unreadable cache: fall back to running Yomitoku
+        return None
+
+
+def uncertain_lines(result: EngineResult, min_confidence: float = ADAPTIVE_MIN_CONFIDENCE) -> list[TextWithBox]:
+    """Lines of a result that other engines should read again.
+
+    Args:
+        result: Engine result (normally Yomitoku's).
+        min_confidence: Minimum normalized confidence of a trusted line.
+
+    Returns:
+        Items that are garbage (is_garbage) or below min_confidence.
+    """
+    return [
+        item
+        for item in result.items
+        if is_garbage(item.text, item.confidence)
+        or normalize_confidence(item.confidence, result.engine) < min_confidence
+    ]
+
+
+def run_adaptive_engines(
+    image: Image.Image,
+    engines: list[str] | None = None,
+    min_confidence: float = ADAPTIVE_MIN_CONFIDENCE,
+    **options,
+) -> dict[str, EngineResult]:
+    """Run Yomitoku, then the other engines only on lines it is unsure of.
+
+    The uncertain lines (uncertain_lines) are cut out of the page and stacked
+    into one image, so each secondary engine reads all of them in a single
+    call; their bboxes are mapped back to page coordinates. With
+    recognize_lines, the engines' recognizers read just those line boxes
+    instead. On a page with no uncertain lines only Yomitoku runs.
+
+    Text Yomitoku did not detect at all is never re-read this way, so if
+    Yomitoku fails or finds fewer than ADAPTIVE_MIN_LINES lines (a page it
+    may have largely missed), the other engines read the whole page.
+
+    Args:
+        image: Page image.
+        engines: Engine names (default: DEFAULT_ENGINES).
+        min_confidence: Minimum normalized Yomitoku confidence of a line
+            that is not re-read.
+        **options: Keyword arguments for run_all_engines.
+
+    Returns:
+        Dict mapping engine name to EngineResult (Yomitoku first); engines
+        that did not need to run are absent.
+    """
+    engines = engines or DEFAULT_ENGINES
+    secondary = [e for e in engines if e != "yomitoku"]
+    if "yomitoku" not in engines or not secondary:
+        return run_all_engines(image, engines=engines, **options)
+
+    results = run_all_engines(image, engines=["yomitoku"], **options)
+    if not results["yomitoku"].success or len(results["yomitoku"].items) < ADAPTIVE_MIN_LINES:
+        results.update(run_all_engines(image, engines=secondary, **options))
+        return filter_figure_items(results)
+
+    lines = uncertain_lines(results["yomitoku"], min_confidence)
+    if lines:
+        bboxes = [line.bbox for line in lines]
+        options = {**options, "figure_mode": "filter", "yomitoku_analysis": None}
+        if options.get("recognize_lines"):
+            results.update(run_all_engines(image, engines=secondary, line_bboxes=bboxes, **options))
+        else:
+            bands = line_bands(image.height, bboxes)
+            for engine, result in run_all_engines(stack_bands(image, bands), engines=secondary, **options).items():
+                results[engine] = map_result_to_page(result, bands)
+    return filter_figure_items(results)
+
+
+def _cached_yomitoku(pages: list[PageRef], engines: list[str], layout_dir: str | None) -> dict[int, EngineResult]:
+    """Yomitoku results built from detect-layout's cache, by page index."""
+    if not layout_dir or "yomitoku" not in engines:
+        return {}
+    cached: dict[int, EngineResult] = {}
+    for i, page in enumerate(pages):
+        analysis = load_cached_analysis(layout_dir, page)
+        if analysis is not None:
+            cached[i] = yomitoku_result_from_analysis(analysis)
+    return cached
+
+
+def ocr_page(page: PageRef, engines: list[str], options: BatchOptions) -> tuple[PageRef, dict[str, EngineResult], bool]:
+    """Run engines on one page (module level so page jobs can pickle it).
+
+    Engines run in options.daemon if it is set, otherwise in this process.
+    """
+    layout_dir = options.layout_dir
+    analysis = load_cached_analysis(layout_dir, page) if layout_dir and "yomitoku" in engines else None
+    kwargs = {
+        "engines": engines,
+        "device": options.device,
+        "yomitoku_analysis": analysis,
+        "cache": options.cache,
+        "figure_mode": options.figure_mode,
+        "recognize_lines": options.recognize_lines,
+    }
+    if options.daemon is not None:
+        if options.adaptive_confidence is not None:
+            kwargs["adaptive_confidence"] = options.adaptive_confidence
+        return page, options.daemon.run_page(page, **kwargs), analysis is not None
+    with page.open() as img:
+        if options.adaptive_confidence is not None:
+            results = run_adaptive_engines(img, min_confidence=options.adaptive_confidence, **kwargs)
+        else:
+            results = run_all_engines(img, **kwargs)
+    return page, results, analysis is not None
+
+
+def engine_results_pooled(
+    pages: list[PageRef], engines: list[str], options: BatchOptions
+) -> Iterator[tuple[PageRef, dict[str, EngineResult], bool]]:
+    """Run engines in persistent per-engine worker processes, pipelining pages."""
+    cached = _cached_yomitoku(pages, engines, options.layout_dir)
+    jobs = [(page, [e for e in engines if not (e == "yomitoku" and i in cached)]) for i, page in enumerate(pages)]
+    pool_engines = [e for e in engines if any(e in job_engines for _, job_engines in jobs)]
+    with EngineWorkerPool(
+        pool_engines,
+        max(options.engine_workers, 1),
+        timeout=options.engine_timeout,
+        device=options.device,
+        cache=options.cache,
+    ) as pool:
+        for i, results in pool.run(jobs):
+            if i in cached:
+                results["yomitoku"] = cached[i]
+            yield pages[i], filter_figure_items(results), i in cached
@@ -0,0 +1,88 @@
+"""Tests for CLI estimate_trim."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.cli.estimate_trim import write_config
+
+CONFIG = """\
+# Global trim (分割前に適用)
+global_trim_top: 0.0       # 上端トリム率（0.0-0.5）
+global_trim_bottom: 0.0    # 下端トリム率（0.0-0.5）
+global_trim_left: 0.0
+spread_mode: single        # 処理モード
+"""
+
+
+class TestWriteConfig:
+    """write_config のテスト"""
+
+    def test_replaces_values_keeping_comments(self, tmp_path):
+        """値のみ置換し、コメント位置を保つ"""
+        config = tmp_path / "config.yaml"
+        config.write_text(CONFIG, encoding="utf-8")
+
+        write_config(config, {"global_trim_top": 0.125, "global_trim_left": 0.05})
+
+        lines = config.read_text(encoding="utf-8").splitlines()
+        assert lines[1] == "global_trim_top: 0.125     # 上端トリム率（0.0-0.5）"
+        assert lines[2] == "global_trim_bottom: 0.0    # 下端トリム率（0.0-0.5）"
+        assert lines[3] == "global_trim_left: 0.05"
+        assert lines[4] == "spread_mode: single        # 処理モード"
+
+    def test_missing_key_raises(self, tmp_path):
+        """存在しないキーは KeyError"""
+        config = tmp_path / "config.yaml"
+        config.write_text(CONFIG, encoding="utf-8")
+        with pytest.raises(KeyError):
+            write_config(config, {"global_trim_right": 0.1})
+
+
+class TestEstimateTrimCLI:
+    """CLI 実行のテスト"""
+
+    def test_prints_values(self, tmp_path):
+        """推定値と信頼度を表示する"""
+        for i in range(3):
+            img = Image.new("L", (400, 400), color=235)
+            ImageDraw.Draw(img).rectangle([100, 80, 300, 320], fill=30)
+            img.save(tmp_path / f"frame_{i:04d}.png")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "src.cli.estimate_trim", str(tmp_path)],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "confidence 1.00" in result.stdout
+        assert "global_trim_left:" in result.stdout
+
+    def test_missing_dir_fails(self, tmp_path):
+        """入力ディレクトリがなければエラー"""
+        result = subprocess.run(
+            [sys.executable, "-m", "src.cli.estimate_trim", str(tmp_path / "missing")],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "Error:" in result.stderr
+
+    def test_single_sample(self, tmp_path):
+        """-k 1 では中央のページだけで推定する"""
+        for i in range(3):
+            img = Image.new("L", (400, 400), color=235)
+            ImageDraw.Draw(img).rectangle([100, 80, 300, 320], fill=30)
+            img.save(tmp_path / f"frame_{i:04d}.png")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "src.cli.estimate_trim", str(tmp_path), "-k", "1"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Sampled 1 pages" in result.stdout
@@ -83,3 +83,26 @@ class TestExtractFramesCLI:
         assert result.returncode != 0
         # argparse shows usage on missing required args
         assert "usage" in result.stderr.lower() or "required" in result.stderr.lower()
+
+    def test_workers_rejected_with_scene_or_stream(self, tmp_path: Path):
+        """Verify --workers is rejected with --mode scene and --stream."""
+        video = tmp_path / "video.mp4"
+        video.touch()
+        for option in (["--mode", "scene"], ["--stream"]):
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "src.cli.extract_frames",
+                    str(video),
+                    "-o",
+                    str(tmp_path / "output"),
+                    "--workers",
+                    "2",
+                    *option,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            assert result.returncode == 1
+            assert "--workers cannot be combined" in result.stderr
@@ -92,3 +92,43 @@ class TestRunOcrCLI:
         )
         assert result.returncode != 0
         assert "usage" in result.stderr.lower() or "required" in result.stderr.lower()
+
+    def test_jobs_and_engine_workers_conflict(self, tmp_path: Path):
+        """Verify --jobs and --engine-workers cannot be combined."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.cli.run_ocr",
+                str(tmp_path),
+                "-o",
+                str(tmp_path / "out"),
+                "--jobs",
+                "2",
+                "--engine-workers",
+                "1",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "cannot be combined" in result.stderr
+
+    def test_adaptive_confidence_range(self, tmp_path: Path):
+        """Verify --adaptive rejects confidences outside 0..1."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.cli.run_ocr",
+                str(tmp_path),
+                "-o",
+                str(tmp_path / "out"),
+                "--adaptive",
+                "1.5",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "--adaptive must be between 0 and 1" in result.stderr
@@ -0,0 +1,84 @@
+"""Tests for parallel, segmented frame extraction."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.preprocessing.frames import SEGMENTS_DIRNAME, extract_frames, plan_segments
+
+
+def _write_frames(seg_dir: Path, colors: list[int]) -> None:
+    for i, c in enumerate(colors, 1):
+        Image.new("RGB", (20, 20), color=(c, c, c)).save(seg_dir / f"frame_{i:04d}.png")
+
+
+class TestPlanSegments:
+    """時間区間の分割。"""
+
+    def test_segments_cover_video_on_sampling_grid(self) -> None:
+        """区間の開始位置が抽出間隔の倍数になる。"""
+        segments = plan_segments(100.0, 1.5, 4)
+
+        assert len(segments) == 4
+        assert segments[0][0] == 0.0
+        for start, _ in segments:
+            assert abs(start / 1.5 - round(start / 1.5)) < 1e-9
+        for (start, length), (next_start, _) in zip(segments, segments[1:]):
+            assert abs(start + length - next_start) < 1e-9
+        assert segments[-1][1] is None
+
+    def test_boundaries_snap_to_keyframes(self) -> None:
+        """境界はキーフレーム近傍に寄せられる。"""
+        segments = plan_segments(100.0, 1.0, 2, keyframes=[0.0, 10.0, 47.0, 90.0])
+
+        assert segments[1][0] == 47.0
+
+    def test_short_video_limits_workers(self) -> None:
+        """フレーム数より多いワーカーは使わない。"""
+        segments = plan_segments(2.0, 1.0, 8)
+        assert len(segments) == 2
+
+
+class TestExtractFramesParallel:
+    """並列抽出の結合。"""
+
+    def test_merges_segments_in_order_and_drops_boundary_duplicates(self, tmp_path: Path) -> None:
+        """区間出力が連番に結合され、境界の重複フレームが除去される。"""
+        out = tmp_path / "frames"
+        seg_colors = [[10, 20, 30], [30, 40], [50, 60]]
+
+        def fake_run(cmd: list[str]) -> None:
+            seg_dir = Path(cmd[-1]).parent
+            index = int(seg_dir.name.split("_")[1])
+            _write_frames(seg_dir, seg_colors[index])
+
+        with (
+            patch("src.preprocessing.frames.probe_duration", return_value=12.0),
+            patch("src.preprocessing.frames.probe_keyframes", return_value=[]),
+            patch("src.preprocessing.frames._run_ffmpeg", side_effect=fake_run),
+        ):
+            frames = extract_frames("in.mp4", str(out), 1.5, workers=3)
+
+        assert [f.name for f in frames] == [f"frame_{i:04d}.png" for i in range(1, 7)]
+        values = [Image.open(f).getpixel((0, 0))[0] for f in frames]
+        assert values == [10, 20, 30, 40, 50, 60]
+        assert not (out / SEGMENTS_DIRNAME).exists()
+
+    def test_single_worker_uses_one_process(self, tmp_path: Path) -> None:
+        """workers=1 では従来どおり単一の FFmpeg を実行する。"""
+        out = tmp_path / "frames"
+        calls: list[list[str]] = []
+
+        def fake_run(cmd: list[str]) -> None:
+            calls.append(cmd)
+            _write_frames(out, [1, 2])
+
+        with patch("src.preprocessing.frames._run_ffmpeg", side_effect=fake_run):
+            frames = extract_frames("in.mp4", str(out), 1.5)
+
+        assert len(calls) == 1
+        assert "-ss" not in calls[0]
+        assert len(frames) == 2
@@ -0,0 +1,106 @@
+"""Tests for automatic gutter detection."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.preprocessing import gutter
+from src.preprocessing.gutter import GUTTER_CACHE, estimate_gutter, find_gutter
+from src.preprocessing.pages import list_pages, sample_pages
+from src.preprocessing.split_spread import SpreadMode, split_spread_pages
+
+
+def _make_spread(gutter_x: int, width: int = 1200, height: int = 800, shadow: bool = False) -> Image.Image:
+    """Spread with text-like blocks on both pages and a blank gutter at gutter_x."""
+    rng = random.Random(gutter_x)
+    img = Image.new("L", (width, height), color=235)
+    draw = ImageDraw.Draw(img)
+    for left, right in ((40, gutter_x - 30), (gutter_x + 30, width - 40)):
+        for y in range(40, height - 40, 24):
+            x = left
+            while x < right - 20:
+                w = rng.randint(8, 20)
+                draw.rectangle([x, y, min(x + w, right), y + 12], fill=30)
+                x += w + rng.randint(3, 8)
+    if shadow:
+        for dx in range(-6, 7):
+            draw.line([(gutter_x + dx, 0), (gutter_x + dx, height)], fill=235 - 15 * (7 - abs(dx)))
+    return img
+
+
+class TestFindGutter:
+    """列プロファイルによる綴じ目検出。"""
+
+    def test_off_center_gutter(self) -> None:
+        """中央からずれた綴じ目を検出する。"""
+        ratio = find_gutter(np.asarray(_make_spread(660)))
+        assert ratio is not None
+        assert abs(ratio * 1200 - 660) <= 8
+
+    def test_shadow_gutter(self) -> None:
+        """影のある綴じ目では最も暗い列を選ぶ。"""
+        ratio = find_gutter(np.asarray(_make_spread(560, shadow=True)))
+        assert ratio is not None
+        assert abs(ratio * 1200 - 560) <= 3
+
+    def test_no_gutter_returns_none(self) -> None:
+        """中央帯が一様な文字領域なら検出しない。"""
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 255, size=(400, 600), dtype=np.uint8)
+        assert find_gutter(noise) is None
+
+
+class TestEstimateGutter:
+    """サンプルページでの推定とキャッシュ。"""
+
+    def test_sample_pages_spread_over_book(self, tmp_path: Path) -> None:
+        """サンプルは先頭から末尾まで均等に選ばれる。"""
+        pages = list(range(100))
+        assert sample_pages(pages, 5) == [0, 25, 50, 74, 99]
+
+    def test_estimate_is_cached(self, tmp_path: Path) -> None:
+        """2回目はキャッシュを使い、画像を解析しない。"""
+        for i in range(3):
+            _make_spread(640 + i).save(tmp_path / f"page_{i + 1:04d}.png")
+        pages = list_pages(tmp_path)
+
+        first = estimate_gutter(pages, tmp_path)
+        with patch.object(gutter, "find_gutter") as mock_find:
+            second = estimate_gutter(pages, tmp_path)
+
+        mock_find.assert_not_called()
+        assert (tmp_path / GUTTER_CACHE).exists()
+        assert first == second
+        assert first is not None and abs(first * 1200 - 641) <= 8
+
+    def test_split_spread_pages_uses_gutter(self, tmp_path: Path) -> None:
+        """auto_gutter では検出位置で左右に分割する。"""
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        for i in range(2):
+            _make_spread(700).convert("RGB").save(pages_dir / f"page_{i + 1:04d}.png")
+
+        split_spread_pages(str(pages_dir), mode=SpreadMode.SPREAD, auto_gutter=True)
+
+        with Image.open(pages_dir / "page_0001_L.png") as left, Image.open(pages_dir / "page_0001_R.png") as right:
+            assert abs(left.width - 700) <= 8
+            assert left.width + right.width == 1200
+        assert (tmp_path / "originals" / GUTTER_CACHE).exists()
+
+    def test_virtual_pages_use_gutter(self, tmp_path: Path) -> None:
+        """仮想ページでも検出位置で左右に分割する。"""
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        for i in range(2):
+            _make_spread(700).convert("RGB").save(pages_dir / f"page_{i + 1:04d}.png")
+
+        split_spread_pages(str(pages_dir), mode=SpreadMode.SPREAD, auto_gutter=True, virtual=True)
+
+        left, right = list_pages(pages_dir)[:2]
+        assert abs(left.size()[0] - 700) <= 8
+        assert left.size()[0] + right.size()[0] == 1200
@@ -0,0 +1,167 @@
+"""Tests for cached, mmap-backed video hashing."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.preprocessing import hash as video_hash
+
+
+def _make_video(path: Path, size: int) -> Path:
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+class TestSha256File:
+    """mmap 経由のハッシュ計算。"""
+
+    def test_matches_hashlib_across_chunks(self, tmp_path: Path) -> None:
+        """チャンク境界をまたいでも hashlib と一致する。"""
+        video = _make_video(tmp_path / "a.mp4", 2500)
+        with patch.object(video_hash, "CHUNK_SIZE", 1024):
+            digest = video_hash.sha256_file(video)
+        assert digest == hashlib.sha256(video.read_bytes()).hexdigest()
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """空ファイルも扱える（mmap 不可）。"""
+        video = tmp_path / "empty.mp4"
+        video.write_bytes(b"")
+        assert video_hash.sha256_file(video) == hashlib.sha256(b"").hexdigest()
+
+
+class TestHashCache:
+    """(path, size, mtime, inode) キーのハッシュキャッシュ。"""
+
+    def test_second_call_reads_nothing(self, tmp_path: Path) -> None:
+        """2回目はファイルを読まずにキャッシュから返す。"""
+        video = _make_video(tmp_path / "a.mp4", 4096)
+        cache = tmp_path / "cache.json"
+
+        first = video_hash.compute_video_hash(str(video), cache_path=cache)
+        with patch.object(video_hash, "sha256_file") as mock_hash:
+            second = video_hash.compute_video_hash(str(video), cache_path=cache)
+
+        mock_hash.assert_not_called()
+        assert first == second == hashlib.sha256(video.read_bytes()).hexdigest()[:16]
+
+    def test_modified_file_is_rehashed(self, tmp_path: Path) -> None:
+        """サイズや mtime が変われば再計算する。"""
+        video = _make_video(tmp_path / "a.mp4", 4096)
+        cache = tmp_path / "cache.json"
+        video_hash.compute_full_hash(str(video), cache_path=cache)
+
+        _make_video(video, 5000)
+        assert video_hash.lookup_cached_hash(video, cache_path=cache) is None
+        expected = hashlib.sha256(video.read_bytes()).hexdigest()
+        assert video_hash.compute_full_hash(str(video), cache_path=cache) == expected
+
+    def test_no_cache_does_not_write(self, tmp_path: Path) -> None:
+        """use_cache=False ではキャッシュを作らない。"""
+        video = _make_video(tmp_path / "a.mp4", 100)
+        cache = tmp_path / "cache.json"
+        video_hash.compute_full_hash(str(video), use_cache=False, cache_path=cache)
+        assert not cache.exists()
+
+    def test_corrupt_cache_is_ignored(self, tmp_path: Path) -> None:
+        """壊れたキャッシュは無視して再計算する。"""
+        video = _make_video(tmp_path / "a.mp4", 100)
+        cache = tmp_path / "cache.json"
+        cache.write_text("{not json", encoding="utf-8")
+
+        digest = video_hash.compute_full_hash(str(video), cache_path=cache)
+
+        assert digest == hashlib.sha256(video.read_bytes()).hexdigest()
+        assert video_hash.lookup_cached_hash(video, cache_path=cache) == digest
+
+
+class TestFastFingerprint:
+    """サンプリング指紋。"""
+
+    def test_small_file_hashes_everything(self, tmp_path: Path) -> None:
+        """小さいファイルは全体が指紋に反映される。"""
+        video = _make_video(tmp_path / "a.mp4", 1000)
+        before = video_hash.compute_fast_fingerprint(video, block_size=64, samples=16)
+        data = bytearray(video.read_bytes())
+        data[500] ^= 0xFF
+        video.write_bytes(bytes(data))
+        assert video_hash.compute_fast_fingerprint(video, block_size=64, samples=16) != before
+
+    def test_reads_only_sampled_blocks(self, tmp_path: Path) -> None:
+        """大きいファイルでは先頭・末尾・等間隔ブロックのみで決まる。"""
+        video = _make_video(tmp_path / "a.mp4", 10_000)
+        before = video_hash.compute_fast_fingerprint(video, block_size=10, samples=4)
+
+        data = bytearray(video.read_bytes())
+        data[100] ^= 0xFF  # Outside offsets 0, 3330, 6660, 9990
+        video.write_bytes(bytes(data))
+        assert video_hash.compute_fast_fingerprint(video, block_size=10, samples=4) == before
+
+        data[9995] ^= 0xFF  # Inside the tail block
+        video.write_bytes(bytes(data))
+        assert video_hash.compute_fast_fingerprint(video, block_size=10, samples=4) != before
+
+    def test_size_is_part_of_fingerprint(self, tmp_path: Path) -> None:
+        """サイズが違えば指紋も変わる。"""
+        a = tmp_path / "a.mp4"
+        b = tmp_path / "b.mp4"
+        a.write_bytes(b"\0" * 100)
+        b.write_bytes(b"\0" * 101)
+        assert video_hash.compute_fast_fingerprint(a) != video_hash.compute_fast_fingerprint(b)
+
+    def test_single_sample_rejected(self, tmp_path: Path) -> None:
+        """先頭と末尾を読めない samples は ValueError。"""
+        video = _make_video(tmp_path / "a.mp4", 10_000)
+        with pytest.raises(ValueError, match="samples"):
+            video_hash.compute_fast_fingerprint(video, block_size=10, samples=1)
+
+
+class TestSourceInfo:
+    """source_info.json の遅延検証。"""
+
+    def test_pending_then_verified(self, tmp_path: Path) -> None:
+        """指紋のみで書き出し、検証後に SHA-256 が記録される。"""
+        video = _make_video(tmp_path / "a.mp4", 2048)
+        out = tmp_path / "out"
+        fingerprint = video_hash.compute_fast_fingerprint(video)
+
+        info_path = video_hash.write_source_info(str(out), str(video), None, fingerprint=fingerprint)
+        info = json.loads(info_path.read_text(encoding="utf-8"))
+        assert info["sha256"] is None
+        assert info["sha256_verified"] is False
+
+        with patch.object(video_hash, "DEFAULT_CACHE_PATH", tmp_path / "cache.json"):
+            video_hash.verify_source_info(str(out), str(video))
+
+        info = json.loads(info_path.read_text(encoding="utf-8"))
+        assert info["sha256"] == hashlib.sha256(video.read_bytes()).hexdigest()
+        assert info["sha256_verified"] is True
+        assert info["fast_fingerprint"] == fingerprint
+
+    def test_mismatch_detected_after_fast_rewrite(self, tmp_path: Path, capsys) -> None:
+        """指紋での再書き出し後も、以前の SHA-256 と異なれば警告する。"""
+        video = _make_video(tmp_path / "a.mp4", 2048)
+        out = tmp_path / "out"
+        video_hash.write_source_info(str(out), str(video), "0" * 64, fingerprint="abc")
+
+        info_path = video_hash.write_source_info(str(out), str(video), None, fingerprint="abc")
+        assert json.loads(info_path.read_text(encoding="utf-8"))["previous_sha256"] == "0" * 64
+
+        with patch.object(video_hash, "DEFAULT_CACHE_PATH", tmp_path / "cache.json"):
+            video_hash.verify_source_info(str(out), str(video))
+
+        assert "does not match" in capsys.readouterr().err
+
+    def test_background_verify_runs_detached(self, tmp_path: Path) -> None:
+        """バックグラウンド検証は別セッションのプロセスで起動する。"""
+        with patch.object(video_hash.subprocess, "Popen") as mock_popen:
+            video_hash.start_background_verify(str(tmp_path / "out"), "a.mp4")
+
+        cmd = mock_popen.call_args.args[0]
+        assert cmd[-3:] == ["a.mp4", "--verify", str(tmp_path / "out")]
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
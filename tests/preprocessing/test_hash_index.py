@@ -0,0 +1,180 @@
+"""Tests for the persistent frame-hash index."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from src.preprocessing.deduplicate import deduplicate_frames
+from src.preprocessing.hash_index import (
+    INDEX_HASHES,
+    INDEX_TABLE,
+    frame_features,
+    frame_hashes,
+    group_runs,
+    load_hash_index,
+    preview_thresholds,
+    select_unique,
+)
+from src.preprocessing.phash import phash_files_with_sharpness
+
+
+def _make_frames(frame_dir: Path, seeds: list[int]) -> list[Path]:
+    frame_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, seed in enumerate(seeds, 1):
+        img = Image.new("RGB", (120, 90), color=(255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for k in range(6):
+            x = (seed * 37 + k * 23) % 100
+            y = (seed * 19 + k * 31) % 70
+            draw.rectangle([x, y, x + 15, y + 15], fill=(0, 0, 0))
+        path = frame_dir / f"frame_{i:04d}.png"
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+class TestFrameHashes:
+    """インデックスの作成と再利用。"""
+
+    def test_index_written_on_first_run(self, tmp_path: Path) -> None:
+        """初回実行でインデックスファイルが作成される。"""
+        frames = _make_frames(tmp_path / "frames", [1, 2, 3])
+
+        frame_hashes(frames)
+
+        assert (tmp_path / "frames" / INDEX_HASHES).exists()
+        assert (tmp_path / "frames" / INDEX_TABLE).exists()
+        assert set(load_hash_index(tmp_path / "frames")) == {f.name for f in frames}
+
+    def test_second_run_decodes_nothing(self, tmp_path: Path) -> None:
+        """2回目以降は画像をデコードしない。"""
+        frames = _make_frames(tmp_path / "frames", [1, 2, 3])
+        first = frame_hashes(frames)
+
+        with patch("src.preprocessing.hash_index.phash_files_with_sharpness") as mock_hash:
+            second = frame_hashes(frames)
+
+        mock_hash.assert_not_called()
+        assert list(first) == list(second)
+
+    def test_modified_frame_is_rehashed(self, tmp_path: Path) -> None:
+        """サイズ/mtime が変わったフレームのみ再計算される。"""
+        frames = _make_frames(tmp_path / "frames", [1, 2, 3])
+        frame_hashes(frames)
+
+        Image.new("RGB", (50, 50), color=(0, 0, 0)).save(frames[1])
+        target = "src.preprocessing.hash_index.phash_files_with_sharpness"
+        with patch(target, wraps=phash_files_with_sharpness) as mock_hash:
+            frame_hashes(frames)
+
+        assert mock_hash.call_args[0][0] == [frames[1]]
+
+    def test_limit_keeps_other_entries(self, tmp_path: Path) -> None:
+        """一部のフレームのみ処理しても他の有効なエントリは保持される。"""
+        frames = _make_frames(tmp_path / "frames", [1, 2, 3, 4])
+        frame_hashes(frames)
+        Image.new("RGB", (50, 50), color=(0, 0, 0)).save(frames[0])
+        os.utime(frames[3], ns=(0, 0))
+
+        frame_hashes(frames[:2])
+
+        assert set(load_hash_index(tmp_path / "frames")) == {f.name for f in frames[:3]}
+
+
+class TestSelectUnique:
+    """しきい値による選択。"""
+
+    def test_matches_previous_unique_rule(self) -> None:
+        """直前に採用したハッシュとの距離で判定する。"""
+        hashes = [0b0, 0b1, 0b11, 0b1111_1111, 0b1111_1110]
+        assert select_unique(hashes, 2) == [0, 2, 3]
+        assert select_unique(hashes, 1) == [0, 1, 2, 3, 4]
+
+    def test_group_runs(self) -> None:
+        """連続する近似フレームを1グループにまとめる。"""
+        hashes = [0b0, 0b1, 0b11, 0b1111_1111, 0b1111_1110]
+        assert group_runs(hashes, 2) == [[0, 1], [2], [3, 4]]
+
+    def test_sharpest_per_run(self) -> None:
+        """鮮明度を渡すと各グループで最も鮮明なフレームを選ぶ。"""
+        hashes = [0b0, 0b1, 0b11, 0b1111_1111, 0b1111_1110]
+        sharpness = [1.0, 5.0, 2.0, 3.0, 0.5]
+        assert select_unique(hashes, 2, sharpness) == [1, 2, 3]
+
+    def test_preview_counts_per_threshold(self, tmp_path: Path) -> None:
+        """しきい値ごとの採用ページ数を返す。"""
+        _make_frames(tmp_path / "frames", [1, 1, 2, 2, 3])
+
+        counts = preview_thresholds(str(tmp_path / "frames"), [1, 64])
+
+        assert counts == {1: 3, 64: 1}
+
+    def test_deduplicate_matches_preview(self, tmp_path: Path) -> None:
+        """deduplicate_frames の結果とプレビューの件数が一致する。"""
+        _make_frames(tmp_path / "frames", [1, 1, 2, 5, 5, 3])
+
+        counts = preview_thresholds(str(tmp_path / "frames"), [8])
+        result = deduplicate_frames(str(tmp_path / "frames"), str(tmp_path / "pages"), 8)
+
+        assert counts[8] == len(result)
+
+    def test_deduplicate_keeps_sharpest_frame(self, tmp_path: Path) -> None:
+        """重複グループからはぼけていないフレームが残り、ページ数は変わらない。"""
+        frames = _make_frames(tmp_path / "frames", [1, 1, 1])
+        with Image.open(frames[1]) as img:
+            sharp = img.copy()
+        for frame in (frames[0], frames[2]):
+            sharp.filter(ImageFilter.GaussianBlur(1)).save(frame)
+
+        _, sharpness = frame_features(frames)
+        first = deduplicate_frames(str(tmp_path / "frames"), str(tmp_path / "first"), 8, select="first")
+        best = deduplicate_frames(str(tmp_path / "frames"), str(tmp_path / "best"), 8, select="sharpest")
+
+        assert int(np.argmax(sharpness)) == 1
+        assert len(first) == len(best) == 1
+        assert best[0].read_bytes() != first[0].read_bytes()
+        with Image.open(best[0]) as img:
+            assert np.array_equal(np.asarray(img), np.asarray(sharp))
+
+    def test_invalid_select_raises(self, tmp_path: Path) -> None:
+        """不正な select はエラーになる。"""
+        _make_frames(tmp_path / "frames", [1])
+        with pytest.raises(ValueError, match="select"):
+            deduplicate_frames(str(tmp_path / "frames"), str(tmp_path / "pages"), select="last")
+
+
+class TestPreviewThresholdCLI:
+    """preview_threshold CLI。"""
+
+    def test_prints_counts(self, tmp_path: Path) -> None:
+        """しきい値ごとの件数を表示する。"""
+        _make_frames(tmp_path / "frames", [1, 1, 2])
+
+        result = subprocess.run(
+            [sys.executable, "-m", "src.cli.preview_threshold", str(tmp_path / "frames"), "-t", "1,64"],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0
+        assert "threshold" in result.stdout
+        assert len(result.stdout.strip().splitlines()) == 3
+
+    def test_missing_input_shows_error(self, tmp_path: Path) -> None:
+        """入力ディレクトリがない場合はエラー。"""
+        result = subprocess.run(
+            [sys.executable, "-m", "src.cli.preview_threshold", str(tmp_path / "missing")],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "error" in result.stderr.lower()
@@ -0,0 +1,210 @@
+"""Tests for page materialization modes and the page manifest."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.preprocessing.deduplicate import MATERIALIZE_MODES, deduplicate_frames, materialize_page
+from src.preprocessing.pages import MANIFEST_NAME, PageRef, list_pages, read_manifest, sample_pages, write_manifest
+from src.preprocessing.split_spread import SpreadMode, TrimConfig, renumber_pages, split_spread_pages
+
+
+def _make_frames(frame_dir: Path, count: int) -> list[Path]:
+    frame_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(1, count + 1):
+        img = Image.new("RGB", (200, 100), color=(255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for k in range(6):
+            x = (i * 53 + k * 29) % 180
+            y = (i * 17 + k * 13) % 80
+            draw.rectangle([x, y, x + 15, y + 15], fill=(0, 0, 0))
+        path = frame_dir / f"frame_{i:04d}.png"
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+class TestMaterializePage:
+    """ページファイルの保存方法。"""
+
+    @pytest.mark.parametrize("mode", ["encode", "copy", "hardlink", "reflink"])
+    def test_modes_preserve_pixels(self, tmp_path: Path, mode: str) -> None:
+        """どの方式でも画素が一致する。"""
+        (src,) = _make_frames(tmp_path / "frames", 1)
+        dst = tmp_path / "page_0001.png"
+
+        materialize_page(src, dst, mode)
+
+        with Image.open(src) as a, Image.open(dst) as b:
+            assert a.tobytes() == b.tobytes()
+
+    def test_hardlink_shares_inode(self, tmp_path: Path) -> None:
+        """hardlink は同一 inode を共有する。"""
+        (src,) = _make_frames(tmp_path / "frames", 1)
+        dst = tmp_path / "page_0001.png"
+
+        materialize_page(src, dst, "hardlink")
+
+        assert os.stat(src).st_ino == os.stat(dst).st_ino
+
+    def test_copy_is_byte_identical(self, tmp_path: Path) -> None:
+        """copy はバイト単位で同一。"""
+        (src,) = _make_frames(tmp_path / "frames", 1)
+        dst = tmp_path / "page_0001.png"
+
+        materialize_page(src, dst, "copy")
+
+        assert src.read_bytes() == dst.read_bytes()
+
+    def test_manifest_is_not_a_file_mode(self, tmp_path: Path) -> None:
+        """manifest はファイル保存方式として無効。"""
+        (src,) = _make_frames(tmp_path / "frames", 1)
+        with pytest.raises(ValueError):
+            materialize_page(src, tmp_path / "page_0001.png", "manifest")
+
+
+class TestDeduplicateMaterialize:
+    """deduplicate_frames の materialize オプション。"""
+
+    def test_all_modes_listed(self) -> None:
+        """全モードが定義されている。"""
+        assert set(MATERIALIZE_MODES) == {"encode", "copy", "hardlink", "reflink", "manifest"}
+
+    def test_manifest_mode_writes_no_images(self, tmp_path: Path) -> None:
+        """manifest モードでは画像を書き出さず pages.json のみ作成する。"""
+        frames = _make_frames(tmp_path / "frames", 3)
+        pages_dir = tmp_path / "pages"
+
+        result = deduplicate_frames(str(tmp_path / "frames"), str(pages_dir), materialize="manifest")
+
+        assert [p.name for p in result] == ["page_0001.png", "page_0002.png", "page_0003.png"]
+        assert not list(pages_dir.glob("*.png"))
+        refs = list_pages(pages_dir)
+        assert [r.source for r in refs] == [f.resolve() for f in frames]
+
+    def test_file_mode_removes_stale_manifest(self, tmp_path: Path) -> None:
+        """ファイル保存モードでは古い manifest を削除する。"""
+        _make_frames(tmp_path / "frames", 2)
+        pages_dir = tmp_path / "pages"
+        deduplicate_frames(str(tmp_path / "frames"), str(pages_dir), materialize="manifest")
+
+        deduplicate_frames(str(tmp_path / "frames"), str(pages_dir), materialize="copy")
+
+        assert not (pages_dir / MANIFEST_NAME).exists()
+        assert len(list(pages_dir.glob("page_*.png"))) == 2
+
+    def test_invalid_mode_raises(self, tmp_path: Path) -> None:
+        """不正なモードは ValueError。"""
+        _make_frames(tmp_path / "frames", 1)
+        with pytest.raises(ValueError):
+            deduplicate_frames(str(tmp_path / "frames"), str(tmp_path / "pages"), materialize="zip")
+
+
+class TestManifestReaders:
+    """manifest 経由でのページ読み込み。"""
+
+    def test_manifest_sources_are_relative(self, tmp_path: Path) -> None:
+        """manifest のパスは相対パスで保存され、ディレクトリ移動後も解決できる。"""
+        frames = _make_frames(tmp_path / "job" / "frames", 1)
+        pages_dir = tmp_path / "job" / "pages"
+        write_manifest(pages_dir, list_pages(frames[0].parent, "frame_*.png"))
+
+        moved = tmp_path / "moved"
+        (tmp_path / "job").rename(moved)
+
+        refs = read_manifest(moved / "pages")
+        assert refs is not None
+        assert refs[0].source == (moved / "frames" / "frame_0001.png").resolve()
+        with refs[0].open() as img:
+            assert img.size == (200, 100)
+
+    def test_split_spread_reads_manifest_pages(self, tmp_path: Path) -> None:
+        """split_spread_pages は manifest のページを分割できる。"""
+        _make_frames(tmp_path / "frames", 2)
+        pages_dir = tmp_path / "pages"
+        deduplicate_frames(str(tmp_path / "frames"), str(pages_dir), materialize="manifest")
+
+        result = split_spread_pages(str(pages_dir), mode=SpreadMode.SPREAD)
+
+        assert [p.name for p in result] == [
+            "page_0001_L.png",
+            "page_0001_R.png",
+            "page_0002_L.png",
+            "page_0002_R.png",
+        ]
+        assert (tmp_path / "originals" / MANIFEST_NAME).exists()
+        assert not (pages_dir / MANIFEST_NAME).exists()
+        assert len(list((tmp_path / "frames").glob("frame_*.png"))) == 2
+
+        # Re-run uses originals/ manifest
+        result = split_spread_pages(str(pages_dir), mode=SpreadMode.SINGLE)
+        assert [p.name for p in result] == ["page_0001.png", "page_0002.png"]
+
+
+class TestVirtualPages:
+    """切り出し範囲のみを持つ仮想ページ。"""
+
+    def test_virtual_pages_match_encoded_pixels(self, tmp_path: Path) -> None:
+        """仮想ページの読み込み結果は実ファイル分割と画素が一致する。"""
+        trim = TrimConfig(global_top=0.1, global_left=0.05, left_page_inner=0.02, right_page_outer=0.1)
+        for name in ("real", "virtual"):
+            _make_frames(tmp_path / name / "frames", 2)
+            pages_dir = tmp_path / name / "pages"
+            deduplicate_frames(str(tmp_path / name / "frames"), str(pages_dir), materialize="copy")
+            split_spread_pages(str(pages_dir), mode=SpreadMode.SPREAD, trim_config=trim, virtual=(name == "virtual"))
+            renumber_pages(str(pages_dir))
+
+        real = list_pages(tmp_path / "real" / "pages")
+        virtual = list_pages(tmp_path / "virtual" / "pages")
+
+        assert not list((tmp_path / "virtual" / "pages").glob("*.png"))
+        assert [p.name for p in virtual] == [p.name for p in real] == [f"page_{i:04d}.png" for i in range(1, 5)]
+        for r, v in zip(real, virtual):
+            assert v.box is not None
+            with r.open() as a, v.open() as b:
+                assert a.size == b.size == v.size()
+                assert a.tobytes() == b.tobytes()
+
+    def test_rerun_recomputes_boxes_without_encoding(self, tmp_path: Path) -> None:
+        """トリム変更時の再実行は manifest のみを書き換える。"""
+        _make_frames(tmp_path / "frames", 1)
+        pages_dir = tmp_path / "pages"
+        deduplicate_frames(str(tmp_path / "frames"), str(pages_dir), materialize="manifest")
+
+        split_spread_pages(str(pages_dir), mode=SpreadMode.SINGLE, virtual=True)
+        first = read_manifest(pages_dir)
+        split_spread_pages(str(pages_dir), mode=SpreadMode.SINGLE, trim_config=TrimConfig(global_top=0.2), virtual=True)
+        second = read_manifest(pages_dir)
+
+        assert first is not None and second is not None
+        assert first[0].box is None
+        assert second[0].box == (0, 20, 200, 100)
+        assert second[0].source == (tmp_path / "frames" / "frame_0001.png").resolve()
+
+    def test_crop_composes_offsets(self, tmp_path: Path) -> None:
+        """入れ子の切り出しは元画像座標に合成される。"""
+        (src,) = _make_frames(tmp_path / "frames", 1)
+        page = PageRef(name="page_0001.png", source=src, box=(10, 20, 110, 80))
+
+        child = page.crop("page_0001_L.png", (5, 5, 50, 30))
+
+        assert child.box == (15, 25, 60, 50)
+        with Image.open(src) as img, child.open() as cropped:
+            assert cropped.tobytes() == img.crop((15, 25, 60, 50)).tobytes()
+
+
+class TestSamplePages:
+    """ページの均等サンプリング。"""
+
+    def test_single_sample_is_middle_page(self) -> None:
+        """サンプル数 1 では中央のページを選ぶ。"""
+        assert sample_pages(list(range(9)), 1) == [4]
+
+    def test_fewer_pages_than_samples(self) -> None:
+        """ページ数がサンプル数以下なら全ページ。"""
+        assert sample_pages([0, 1], 5) == [0, 1]
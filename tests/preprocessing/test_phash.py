@@ -0,0 +1,109 @@
+"""Tests for batched perceptual hashing."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import imagehash
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from src.preprocessing.phash import (
+    hamming_distance,
+    laplacian_variance,
+    phash_files,
+    phash_files_with_sharpness,
+    phash_image,
+    phash_pixels,
+    phash_thumbnail,
+)
+
+
+def _random_image(rng: random.Random) -> Image.Image:
+    img = Image.new("RGB", (rng.randint(40, 300), rng.randint(40, 300)), (rng.randint(0, 255),) * 3)
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(0, 20)):
+        x, y = rng.randint(0, 280), rng.randint(0, 280)
+        fill = tuple(rng.randint(0, 255) for _ in range(3))
+        draw.rectangle([x, y, x + rng.randint(1, 50), y + rng.randint(1, 50)], fill=fill)
+    return img
+
+
+def _reference(img: Image.Image) -> int:
+    return int(str(imagehash.phash(img)), 16)
+
+
+class TestPhashMatchesImagehash:
+    """imagehash.phash とのビット一致。"""
+
+    def test_single_image_matches(self) -> None:
+        """単一画像のハッシュが imagehash と一致する。"""
+        rng = random.Random(1)
+        for _ in range(50):
+            img = _random_image(rng)
+            assert phash_image(img) == _reference(img)
+
+    def test_batch_matches(self) -> None:
+        """バッチ計算の結果が imagehash と一致する。"""
+        rng = random.Random(2)
+        images = [_random_image(rng) for _ in range(64)]
+        hashes = phash_pixels(np.stack([phash_thumbnail(img) for img in images]))
+
+        assert hashes.dtype == np.uint64
+        assert [int(h) for h in hashes] == [_reference(img) for img in images]
+
+    def test_hamming_distance_matches_imagehash(self) -> None:
+        """ハミング距離が ImageHash の差分と一致する。"""
+        rng = random.Random(3)
+        a, b = _random_image(rng), _random_image(rng)
+        assert hamming_distance(phash_image(a), phash_image(b)) == imagehash.phash(a) - imagehash.phash(b)
+
+
+class TestPhashFiles:
+    """ファイルからのバッチハッシュ。"""
+
+    def test_preserves_order_across_batches(self, tmp_path: Path) -> None:
+        """バッチ境界をまたいでも入力順が保持される。"""
+        rng = random.Random(4)
+        paths = []
+        for i in range(7):
+            path = tmp_path / f"frame_{i:04d}.png"
+            _random_image(rng).save(path)
+            paths.append(path)
+
+        hashes = phash_files(paths, workers=3, batch_size=3)
+
+        assert [int(h) for h in hashes] == [_reference(Image.open(p)) for p in paths]
+
+    def test_empty_input(self) -> None:
+        """空入力では空配列を返す。"""
+        assert len(phash_files([])) == 0
+
+
+class TestSharpness:
+    """ラプラシアン分散による鮮明度。"""
+
+    def test_blurred_image_scores_lower(self) -> None:
+        """ぼかした画像の方が鮮明度が低い。"""
+        img = _random_image(random.Random(5)).convert("L")
+        blurred = img.filter(ImageFilter.GaussianBlur(3))
+
+        sharp_score = laplacian_variance(np.asarray(img, dtype=np.float32))
+        blurred_score = laplacian_variance(np.asarray(blurred, dtype=np.float32))
+
+        assert sharp_score > blurred_score
+
+    def test_hashes_match_phash_files(self, tmp_path: Path) -> None:
+        """鮮明度付きでもハッシュは phash_files と一致する。"""
+        rng = random.Random(6)
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"frame_{i:04d}.png"
+            _random_image(rng).save(path)
+            paths.append(path)
+
+        hashes, sharpness = phash_files_with_sharpness(paths, workers=2, batch_size=2)
+
+        assert np.array_equal(hashes, phash_files(paths))
+        assert sharpness.shape == (5,)
@@ -0,0 +1,124 @@
+"""Tests for the preview frame cache and incremental rendering."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.cli.preview_trim_grid import process_images
+from src.cli.split_spreads import preview_trim
+from src.preprocessing import preview_cache
+from src.preprocessing.preview_cache import CACHE_DIRNAME, load_preview, render_incremental
+from src.preprocessing.split_spread import SpreadMode, TrimConfig
+
+
+def _make_preview(preview_dir: Path, count: int, size: tuple[int, int] = (400, 200)) -> Path:
+    frames_dir = preview_dir / "frames"
+    frames_dir.mkdir(parents=True)
+    for i in range(1, count + 1):
+        Image.new("RGB", size, color=(i * 50, 0, 0)).save(frames_dir / f"frame_{i:04d}.png")
+    return frames_dir
+
+
+class TestLoadPreview:
+    """デコード済みフレームのキャッシュ。"""
+
+    def test_decodes_once(self, tmp_path: Path) -> None:
+        """2回目以降は縮小版も含め元画像をデコードしない。"""
+        frames_dir = _make_preview(tmp_path, 1)
+        frame = frames_dir / "frame_0001.png"
+        cache_dir = frames_dir / CACHE_DIRNAME
+
+        first = load_preview(frame, cache_dir)
+        with patch.object(preview_cache.Image, "open") as mock_open:
+            second = load_preview(frame, cache_dir, max_side=100)
+
+        mock_open.assert_not_called()
+        assert first.size == (400, 200)
+        assert second.size == (100, 50)
+
+    def test_full_resolution_by_default(self, tmp_path: Path) -> None:
+        """既定では大きいフレームも原寸のままで、縮小版は作らない。"""
+        frames_dir = _make_preview(tmp_path, 1, size=(4000, 1000))
+        preview = load_preview(frames_dir / "frame_0001.png", frames_dir / CACHE_DIRNAME)
+
+        assert preview.size == (4000, 1000)
+        assert [p.name.split(".")[-2] for p in (frames_dir / CACHE_DIRNAME).glob("*.npy")] == ["full"]
+
+    def test_small_frames_are_not_upscaled(self, tmp_path: Path) -> None:
+        """max_side より小さいフレームは拡大しない。"""
+        frames_dir = _make_preview(tmp_path, 1)
+        preview = load_preview(frames_dir / "frame_0001.png", frames_dir / CACHE_DIRNAME, max_side=1024)
+        assert preview.size == (400, 200)
+
+    def test_modified_frame_is_redecoded(self, tmp_path: Path) -> None:
+        """フレームが更新されたらキャッシュを作り直す。"""
+        frames_dir = _make_preview(tmp_path, 1)
+        frame = frames_dir / "frame_0001.png"
+        load_preview(frame, frames_dir / CACHE_DIRNAME)
+
+        Image.new("RGB", (300, 300), color=(0, 0, 255)).save(frame)
+        os.utime(frame, ns=(1, 1))
+
+        assert load_preview(frame, frames_dir / CACHE_DIRNAME).getpixel((0, 0)) == (0, 0, 255)
+
+
+class TestRenderIncremental:
+    """変更のある出力のみ再描画する。"""
+
+    def test_unchanged_jobs_are_skipped(self, tmp_path: Path) -> None:
+        """キーが同じ出力は再描画せず、不要になった出力は削除する。"""
+
+        def render() -> Image.Image:
+            return Image.new("RGB", (10, 10))
+
+        _, rendered = render_incremental(tmp_path, [("a.png", "k1", render), ("b.png", "k1", render)])
+        assert rendered == 2
+
+        outputs, rendered = render_incremental(tmp_path, [("a.png", "k1", render), ("c.png", "k1", render)])
+        assert rendered == 1
+        assert [p.name for p in outputs] == ["a.png", "c.png"]
+        assert not (tmp_path / "b.png").exists()
+
+    def test_preview_trim_rerenders_only_on_change(self, tmp_path: Path, capsys) -> None:
+        """トリム値が同じ再実行では何も描画しない。"""
+        _make_preview(tmp_path, 2)
+
+        preview_trim(str(tmp_path), mode=SpreadMode.SPREAD, trim_config=TrimConfig(global_top=0.1))
+        preview_trim(str(tmp_path), mode=SpreadMode.SPREAD, trim_config=TrimConfig(global_top=0.1))
+        assert "Rendered 0 of 4 preview pages" in capsys.readouterr().out
+
+        preview_trim(str(tmp_path), mode=SpreadMode.SINGLE, trim_config=TrimConfig(global_top=0.2))
+        assert "Rendered 2 of 2 preview pages" in capsys.readouterr().out
+        assert sorted(p.name for p in (tmp_path / "trimmed").glob("*.png")) == ["page_0001.png", "page_0002.png"]
+        with Image.open(tmp_path / "trimmed" / "page_0001.png") as img:
+            assert img.size == (400, 160)
+
+    def test_grid_rerenders_on_step_change(self, tmp_path: Path, capsys) -> None:
+        """--step を変えた場合のみ再描画する。"""
+        frames_dir = _make_preview(tmp_path, 2)
+
+        process_images(frames_dir, tmp_path / "grid", 0.1, 0.2)
+        process_images(frames_dir, tmp_path / "grid", 0.1, 0.2)
+        assert "Rendered 0 of 2 grid images" in capsys.readouterr().out
+
+        process_images(frames_dir, tmp_path / "grid", 0.05, 0.2)
+        assert "Rendered 2 of 2 grid images" in capsys.readouterr().out
+
+    def test_max_side_is_opt_in(self, tmp_path: Path) -> None:
+        """max_side 指定時のみ縮小して描画する。"""
+        frames_dir = _make_preview(tmp_path, 1, size=(2000, 1000))
+
+        process_images(frames_dir, tmp_path / "grid", 0.1, 0.2)
+        process_images(frames_dir, tmp_path / "small_grid", 0.1, 0.2, max_side=1000)
+        preview_trim(str(tmp_path), mode=SpreadMode.SINGLE, max_side=500)
+
+        with Image.open(tmp_path / "grid" / "frame_0001.png") as img:
+            assert img.size == (2000, 1000)
+        with Image.open(tmp_path / "small_grid" / "frame_0001.png") as img:
+            assert img.size == (1000, 500)
+        with Image.open(tmp_path / "trimmed" / "page_0001.png") as img:
+            assert img.size == (500, 250)
@@ -0,0 +1,105 @@
+"""Tests for scene-change driven frame sampling."""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+from src.preprocessing.scene import extract_scene_frames, select_settled_frames
+
+
+def _page(seed: int) -> Image.Image:
+    img = Image.new("RGB", (160, 120), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for i in range(8):
+        x = (seed * 41 + i * 17) % 130
+        y = (seed * 23 + i * 29) % 90
+        draw.rectangle([x, y, x + 25, y + 25], fill=(0, 0, 0))
+    return img
+
+
+def _flip(a: Image.Image, b: Image.Image) -> Image.Image:
+    """Mid-turn frame: half of each page."""
+    img = a.copy()
+    img.paste(b.crop((80, 0, 160, 120)), (80, 0))
+    return img
+
+
+class TestSelectSettledFrames:
+    """静止判定によるフレーム選択。"""
+
+    def test_still_page_emits_once(self) -> None:
+        """静止したページは1枚だけ出力される。"""
+        page = _page(1)
+        selected = list(select_settled_frames(iter([page] * 20)))
+        assert len(selected) == 1
+
+    def test_emits_after_settling_on_new_page(self) -> None:
+        """ページ送り後、静止してから新しいページを出力する。"""
+        a, b = _page(1), _page(5)
+        frames = [a, a, a, a, _flip(a, b), b, b, b, b]
+
+        selected = list(select_settled_frames(iter(frames)))
+
+        assert len(selected) == 2
+        assert selected[0] is a
+        assert selected[1] is b
+
+    def test_transition_frames_are_not_emitted(self) -> None:
+        """動いている途中のフレームは出力されない。"""
+        a, b = _page(1), _page(5)
+        moving = [_flip(a, _page(i)) for i in range(10, 16)]
+        selected = list(select_settled_frames(iter([a, a, a, *moving, b, b, b])))
+
+        assert all(img not in moving for img in selected)
+
+
+class TestExtractSceneFrames:
+    """frames/ 出力契約。"""
+
+    def test_writes_frame_sequence(self, tmp_path: Path) -> None:
+        """frame_NNNN.png の連番で出力される。"""
+        a, b = _page(1), _page(5)
+        data = io.BytesIO()
+        for img in [a, a, a, b, b, b]:
+            img.save(data, format="BMP")
+
+        class _Proc:
+            stdout = io.BytesIO(data.getvalue())
+            stderr = io.BytesIO(b"")
+
+            def poll(self) -> int:
+                return 0
+
+            def kill(self) -> None:
+                pass
+
+            def wait(self) -> int:
+                return 0
+
+        with patch("src.preprocessing.scene.subprocess.Popen", return_value=_Proc()):
+            frames = extract_scene_frames("in.mp4", str(tmp_path / "frames"))
+
+        assert [f.name for f in frames] == ["frame_0001.png", "frame_0002.png"]
+
+    def test_verbose_ffmpeg_does_not_block(self, tmp_path: Path) -> None:
+        """stderr を大量に出力しても読み込みが止まらない。"""
+        stream = tmp_path / "frames.bmp"
+        with stream.open("wb") as f:
+            for img in [_page(1)] * 3:
+                img.save(f, format="BMP")
+        # Stand-in for FFmpeg: fills the stderr pipe buffer before writing frames
+        script = (
+            "import signal, sys; signal.alarm(20); "
+            "sys.stderr.write('x' * 1_000_000); sys.stderr.flush(); "
+            f"sys.stdout.buffer.write(open({str(stream)!r}, 'rb').read())"
+        )
+
+        with patch("src.preprocessing.scene.build_pipe_command", return_value=[sys.executable, "-c", script]):
+            frames = extract_scene_frames("in.mp4", str(tmp_path / "frames"))
+
+        assert [f.name for f in frames] == ["frame_0001.png"]
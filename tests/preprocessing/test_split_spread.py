@@ -174,6 +174,36 @@ class TestModeSpread:
         right.close()
 
 
+class TestWorkers:
+    """Parallel processing with a process pool."""
+
+    def test_workers_match_serial_output(self, tmp_path: Path) -> None:
+        """workers > 1 writes the same files and pixels as serial processing."""
+        results = {}
+        for workers in (1, 3):
+            pages_dir = tmp_path / f"w{workers}" / "pages"
+            pages_dir.mkdir(parents=True)
+            for i in range(5):
+                img = Image.new("RGB", (200, 100), color=(i * 40, 0, 0))
+                img.save(pages_dir / f"page_{i + 1:04d}.png")
+            result = split_spread_pages(
+                str(pages_dir), mode=SpreadMode.SPREAD, trim_config=TrimConfig(global_top=0.1), workers=workers
+            )
+            results[workers] = [(p.name, Image.open(p).tobytes()) for p in result]
+
+        assert [name for name, _ in results[3]][:2] == ["page_0001_L.png", "page_0001_R.png"]
+        assert results[1] == results[3]
+
+    def test_workers_rerun_uses_originals(self, mixed_images_path: Path) -> None:
+        """Re-running with workers > 1 re-splits from originals/."""
+        split_spread_pages(str(mixed_images_path), mode=SpreadMode.SPREAD, workers=2)
+        result = split_spread_pages(str(mixed_images_path), mode=SpreadMode.SINGLE, workers=2)
+
+        assert [p.name for p in result] == ["page_0001.png", "page_0002.png"]
+        assert not list(mixed_images_path.glob("*_L.png"))
+        assert (mixed_images_path.parent / "originals" / "page_0001.png").exists()
+
+
 # ===========================================================================
 # T010: default mode is single
 # ===========================================================================
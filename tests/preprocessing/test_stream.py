@@ -0,0 +1,138 @@
+"""Tests for streaming frame extraction with in-memory deduplication."""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from PIL import Image, ImageDraw
+
+from src.preprocessing.stream import (
+    build_pipe_command,
+    iter_unique_pages,
+    read_bmp_frames,
+    stream_unique_pages,
+)
+
+
+def _bmp_bytes(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="BMP")
+    return buf.getvalue()
+
+
+def _pattern(seed: int) -> Image.Image:
+    img = Image.new("RGB", (160, 120), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    for i in range(6):
+        x = (seed * 37 + i * 23) % 140
+        y = (seed * 19 + i * 31) % 100
+        draw.rectangle([x, y, x + 15, y + 15], fill=(0, 0, 0))
+    return img
+
+
+class _FakeProcess:
+    """Minimal stand-in for subprocess.Popen with a BMP stdout stream."""
+
+    def __init__(self, frames: list[Image.Image], returncode: int = 0) -> None:
+        self.stdout = io.BytesIO(b"".join(_bmp_bytes(f) for f in frames))
+        self.stderr = io.BytesIO(b"")
+        self.returncode = returncode
+
+    def poll(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+    def wait(self) -> int:
+        return self.returncode
+
+
+class TestReadBmpFrames:
+    """BMP ストリームの分割。"""
+
+    def test_splits_concatenated_frames(self) -> None:
+        """連結された BMP を個々の画像に分割する。"""
+        frames = [Image.new("RGB", (40, 30), color=(i * 40, 0, 0)) for i in range(3)]
+        stream = io.BytesIO(b"".join(_bmp_bytes(f) for f in frames))
+
+        decoded = list(read_bmp_frames(stream))
+
+        assert len(decoded) == 3
+        assert [img.getpixel((0, 0))[0] for img in decoded] == [0, 40, 80]
+
+    def test_truncated_stream_raises(self) -> None:
+        """途中で切れたストリームはエラー。"""
+        data = _bmp_bytes(Image.new("RGB", (40, 30)))
+        with pytest.raises(RuntimeError):
+            list(read_bmp_frames(io.BytesIO(data[:-10])))
+
+    def test_pipe_command_writes_to_stdout(self) -> None:
+        """FFmpeg コマンドが stdout へ BMP を出力する。"""
+        cmd = build_pipe_command("in.mp4", 2.0)
+        assert cmd[-1] == "-"
+        assert "image2pipe" in cmd
+        assert "fps=0.5" in cmd
+
+
+class TestStreamUniquePages:
+    """ストリーミング重複除去。"""
+
+    def test_keeps_only_unique_pages(self, tmp_path: Path) -> None:
+        """同一フレームの連続は1ページにまとめられる。"""
+        a, b = _pattern(1), _pattern(7)
+        proc = _FakeProcess([a, a, a, b, b])
+
+        with patch("src.preprocessing.stream.subprocess.Popen", return_value=proc):
+            result = stream_unique_pages("in.mp4", str(tmp_path / "pages"))
+
+        assert [p.name for p in result] == ["page_0001.png", "page_0002.png"]
+        assert all(p.exists() for p in result)
+        assert not (tmp_path / "frames").exists()
+
+    def test_yields_pages_incrementally(self, tmp_path: Path) -> None:
+        """ページは書き出し直後に yield される。"""
+        proc = _FakeProcess([_pattern(1), _pattern(7)])
+
+        with patch("src.preprocessing.stream.subprocess.Popen", return_value=proc):
+            pages = iter_unique_pages("in.mp4", str(tmp_path / "pages"))
+            first = next(pages)
+            assert first.exists()
+            pages.close()
+
+    def test_limit_stops_reading(self, tmp_path: Path) -> None:
+        """limit 指定時は先頭 N フレームのみ処理。"""
+        proc = _FakeProcess([_pattern(1), _pattern(7), _pattern(13)])
+
+        with patch("src.preprocessing.stream.subprocess.Popen", return_value=proc):
+            result = stream_unique_pages("in.mp4", str(tmp_path / "pages"), limit=2)
+
+        assert len(result) == 2
+
+    def test_ffmpeg_failure_raises(self, tmp_path: Path) -> None:
+        """FFmpeg が失敗した場合は RuntimeError。"""
+        proc = _FakeProcess([], returncode=1)
+
+        with patch("src.preprocessing.stream.subprocess.Popen", return_value=proc):
+            with pytest.raises(RuntimeError):
+                stream_unique_pages("in.mp4", str(tmp_path / "pages"))
+
+    def test_verbose_ffmpeg_does_not_block(self, tmp_path: Path) -> None:
+        """stderr を大量に出力しても読み込みが止まらない。"""
+        frame = tmp_path / "frame.bmp"
+        frame.write_bytes(_bmp_bytes(_pattern(1)))
+        # Stand-in for FFmpeg: fills the stderr pipe buffer before writing the frame
+        script = (
+            "import signal, sys; signal.alarm(20); "
+            "sys.stderr.write('x' * 1_000_000); sys.stderr.flush(); "
+            f"sys.stdout.buffer.write(open({str(frame)!r}, 'rb').read())"
+        )
+
+        with patch("src.preprocessing.stream.build_pipe_command", return_value=[sys.executable, "-c", script]):
+            result = stream_unique_pages("in.mp4", str(tmp_path / "pages"))
+
+        assert [p.name for p in result] == ["page_0001.png"]
@@ -0,0 +1,100 @@
+"""Tests for global trim estimation."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from src.preprocessing.pages import list_pages
+from src.preprocessing.split_spread import TrimConfig
+from src.preprocessing.trim_estimate import SIDES, content_bounds, estimate_trim
+
+
+def _make_page(
+    seed: int,
+    text_box: tuple[int, int, int, int] = (120, 100, 680, 900),
+    size: tuple[int, int] = (800, 1000),
+    border: int = 40,
+) -> Image.Image:
+    """Page with text-like blocks inside text_box and dark screen borders left and right."""
+    rng = random.Random(seed)
+    img = Image.new("L", size, color=235)
+    draw = ImageDraw.Draw(img)
+    left, top, right, bottom = text_box
+    for y in range(top, bottom - 12, 24):
+        x = left
+        while x < right - 20:
+            w = rng.randint(8, 20)
+            draw.rectangle([x, y, min(x + w, right), y + 12], fill=30)
+            x += w + rng.randint(3, 8)
+    draw.rectangle([0, 0, border, size[1]], fill=10)
+    draw.rectangle([size[0] - border, 0, size[0], size[1]], fill=10)
+    return img
+
+
+def _write_pages(tmp_path: Path, images: list[Image.Image]) -> Path:
+    for i, img in enumerate(images, start=1):
+        img.save(tmp_path / f"page_{i:04d}.png")
+    return tmp_path
+
+
+class TestContentBounds:
+    """content_bounds のテスト"""
+
+    def test_detects_text_box_ignoring_borders(self):
+        """黒い枠を除外し本文領域の端を返す"""
+        stack = np.stack([np.asarray(_make_page(1).resize((512, 512)))])
+        top, bottom, left, right = content_bounds(stack)[0]
+        assert top == pytest.approx(0.1, abs=0.01)
+        assert bottom == pytest.approx(0.1, abs=0.02)
+        assert left == pytest.approx(0.15, abs=0.01)
+        assert right == pytest.approx(0.15, abs=0.01)
+
+    def test_blank_page_is_nan(self):
+        """インクのないページは NaN"""
+        stack = np.full((1, 64, 64), 235, dtype=np.uint8)
+        assert np.isnan(content_bounds(stack)).all()
+
+
+class TestEstimateTrim:
+    """estimate_trim のテスト"""
+
+    def test_consistent_pages_high_confidence(self, tmp_path):
+        """同じレイアウトのページでは本文を残す値を高い信頼度で返す"""
+        pages = list_pages(_write_pages(tmp_path, [_make_page(i) for i in range(6)]))
+        estimate = estimate_trim(pages)
+
+        assert estimate.pages == 6
+        assert estimate.confidence == 1.0
+        assert 0.07 <= estimate.top <= 0.1
+        assert 0.12 <= estimate.left <= 0.15
+        # Proposal is accepted by TrimConfig
+        TrimConfig(**{f"global_{side}": getattr(estimate, side) for side in SIDES})
+
+    def test_keeps_content_of_every_page(self, tmp_path):
+        """本文が広いページがあっても切り取らない"""
+        images = [_make_page(i) for i in range(5)] + [_make_page(9, text_box=(60, 30, 740, 970))]
+        estimate = estimate_trim(list_pages(_write_pages(tmp_path, images)))
+
+        assert estimate.top < 0.03
+        assert estimate.left < 0.075
+        assert estimate.confidence < 1.0
+
+    def test_samples_limit_pages_read(self, tmp_path):
+        """samples 枚だけ読み込む"""
+        pages = list_pages(_write_pages(tmp_path, [_make_page(i) for i in range(10)]))
+        assert estimate_trim(pages, samples=3).pages == 3
+
+    def test_blank_pages_no_trim(self, tmp_path):
+        """本文が見つからなければトリムしない"""
+        pages = list_pages(_write_pages(tmp_path, [Image.new("L", (200, 300), color=235)] * 2))
+        estimate = estimate_trim(pages)
+
+        assert estimate.config_values() == dict.fromkeys(
+            ["global_trim_top", "global_trim_bottom", "global_trim_left", "global_trim_right"], 0.0
+        )
+        assert estimate.confidence == 0.0
@@ -0,0 +1,93 @@
+"""Tests for the content-addressed engine result cache."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.rover.engines import EngineResult, EngineResultCache, TextWithBox, run_all_engines
+from src.rover.engines.cache import image_hash
+
+
+def _result(engine: str = "paddleocr", text: str = "本文") -> EngineResult:
+    return EngineResult(
+        engine=engine,
+        items=[TextWithBox(text=text, bbox=(1, 2, 30, 40), confidence=0.875)],
+        success=True,
+        figures=[(0, 0, 10, 10)],
+        headings=["第1章"],
+    )
+
+
+class TestEngineResultCache:
+    """EngineResultCache のテスト"""
+
+    def test_roundtrip(self, tmp_path):
+        """保存した結果をそのまま復元する"""
+        cache = EngineResultCache(tmp_path)
+        key = cache.key("abc", "paddleocr", {"lang": "japan"})
+        cache.put(key, _result())
+
+        assert cache.get(key) == _result()
+
+    def test_key_depends_on_pixels_engine_and_params(self, tmp_path):
+        """画素・エンジン・パラメータが違えば別キー"""
+        cache = EngineResultCache(tmp_path)
+        base = cache.key("abc", "easyocr", {"preprocessing": True})
+
+        assert base == cache.key("abc", "easyocr", {"preprocessing": True})
+        assert base != cache.key("abd", "easyocr", {"preprocessing": True})
+        assert base != cache.key("abc", "paddleocr", {"preprocessing": True})
+        assert base != cache.key("abc", "easyocr", {"preprocessing": False})
+
+    def test_image_hash_ignores_encoding(self, tmp_path):
+        """ファイル形式ではなく画素で同一性を判定する"""
+        img = Image.new("RGB", (20, 10), color=(10, 20, 30))
+        img.save(tmp_path / "a.png")
+        img.save(tmp_path / "b.png", compress_level=9)
+
+        with Image.open(tmp_path / "a.png") as a, Image.open(tmp_path / "b.png") as b:
+            assert image_hash(a) == image_hash(b)
+        assert image_hash(img) != image_hash(Image.new("RGB", (20, 10)))
+
+    def test_failures_not_cached(self, tmp_path):
+        """失敗した結果はキャッシュしない"""
+        cache = EngineResultCache(tmp_path)
+        cache.put("k", EngineResult(engine="easyocr", items=[], success=False, error="boom"))
+
+        assert cache.get("k") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """上限を超えると最も古く使われたエントリから削除する"""
+        cache = EngineResultCache(tmp_path, max_bytes=10**9)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, _result(text="x" * 200 + key))
+            os.utime(tmp_path / f"{key}.json.gz", ns=(i * 10**9, i * 10**9))
+        cache.get("a")  # "a" becomes the most recently used
+
+        entry_size = (tmp_path / "a.json.gz").stat().st_size
+        cache.max_bytes = entry_size * 2
+        assert cache.evict() == 2
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is None
+
+
+class TestRunAllEnginesCache:
+    """run_all_engines のキャッシュ利用テスト"""
+
+    def test_cached_engines_not_rerun(self, tmp_path):
+        """同一画像の2回目はエンジンを実行しない"""
+        cache = EngineResultCache(tmp_path)
+        img = Image.new("RGB", (100, 80), color=(200, 200, 200))
+        with patch("src.rover.engines.runners.run_paddleocr_with_boxes", return_value=_result()) as mock_run:
+            first = run_all_engines(img, engines=["paddleocr"], cache=cache)
+            second = run_all_engines(img.copy(), engines=["paddleocr"], cache=cache)
+            other = run_all_engines(img, engines=["paddleocr"], paddleocr_lang="en", cache=cache)
+
+        assert mock_run.call_count == 2
+        assert first == second
+        assert other["paddleocr"].text == "本文"
@@ -0,0 +1,98 @@
+"""Tests for the OCR daemon and its client."""
+
+from __future__ import annotations
+
+import stat
+import threading
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.preprocessing.pages import list_pages
+from src.rover.engines import EngineResult, OCRDaemon, OCRDaemonClient, TextWithBox
+
+
+def _fake_paddle(image, *args, **kwargs) -> EngineResult:
+    item = TextWithBox(text=f"幅{image.width}", bbox=(0, 0, 10, 10), confidence=0.9)
+    return EngineResult(engine="paddleocr", items=[item], success=True)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Daemon serving from a background thread with a fake PaddleOCR."""
+    with patch("src.rover.engines.runners.run_paddleocr_with_boxes", side_effect=_fake_paddle):
+        server = OCRDaemon(tmp_path / "ocr.sock", engines=["paddleocr"])
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class TestOCRDaemon:
+    """OCRDaemon / OCRDaemonClient のテスト"""
+
+    def test_ping(self, daemon, tmp_path):
+        """起動中のデーモンに接続でき、ソケットは所有者のみアクセス可能"""
+        assert OCRDaemonClient(daemon.socket_path).ping() is True
+        assert stat.S_IMODE(daemon.socket_path.stat().st_mode) & 0o077 == 0
+        assert OCRDaemonClient(tmp_path / "missing.sock").ping() is False
+
+    def test_run_page(self, daemon, tmp_path):
+        """デーモン側でページを読み込み、エンジン結果を返す"""
+        Image.new("RGB", (120, 80), color=(200, 200, 200)).save(tmp_path / "page_0001.png")
+        page = list_pages(tmp_path)[0]
+
+        results = OCRDaemonClient(daemon.socket_path).run_page(page, engines=["paddleocr"])
+
+        assert results["paddleocr"].text == "幅120"
+
+    def test_page_source_sent_as_absolute_path(self, tmp_path, monkeypatch):
+        """相対パスのページも絶対パスでデーモンに渡す"""
+        Image.new("RGB", (120, 80)).save(tmp_path / "page_0001.png")
+        monkeypatch.chdir(tmp_path)
+        page = list_pages(".")[0]
+        assert not page.source.is_absolute()
+
+        client = OCRDaemonClient(tmp_path / "ocr.sock")
+        with patch.object(client, "_call", return_value={"results": {}}) as mock_call:
+            client.run_page(page, engines=["paddleocr"])
+
+        assert mock_call.call_args.args[0]["page"].source == tmp_path / "page_0001.png"
+
+    def test_errors_are_raised_on_client(self, daemon, tmp_path):
+        """デーモン側のエラーはクライアントで例外になる"""
+        Image.new("RGB", (120, 80)).save(tmp_path / "page_0001.png")
+        page = list_pages(tmp_path)[0]
+
+        with pytest.raises(RuntimeError, match="OCR daemon error"):
+            OCRDaemonClient(daemon.socket_path).run_page(page, engines=["paddleocr"], unknown_option=1)
+
+    def test_run_rover_batch_through_daemon(self, daemon, tmp_path):
+        """run_rover_batch がデーモン経由で処理する"""
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        for i in range(2):
+            Image.new("RGB", (100 + i, 80)).save(pages_dir / f"page_{i + 1:04d}.png")
+
+        with patch("src.rover.page_engines.run_all_engines") as local_run:
+            results = run_rover_batch(
+                str(pages_dir),
+                str(tmp_path / "ocr"),
+                engines=["paddleocr"],
+                options=BatchOptions(daemon=OCRDaemonClient(daemon.socket_path)),
+            )
+
+        local_run.assert_not_called()
+        assert [r.text for _, r in results] == ["幅100", "幅101"]
+
+    def test_socket_removed_on_close(self, tmp_path):
+        """終了時にソケットファイルを削除する"""
+        server = OCRDaemon(tmp_path / "ocr.sock")
+        server.server_close()
+        assert not (tmp_path / "ocr.sock").exists()
@@ -149,6 +149,23 @@ class TestYomitokuWordsConfidence:
         assert result.success is False
         assert result.error == "Connection failed"
 
+    @patch("src.rover.engines.runners._get_yomitoku_analyzer")
+    def test_yomitoku_with_cached_analysis_skips_analyzer(self, mock_get_analyzer):
+        """キャッシュ済み解析結果があればアナライザを実行しない"""
+        from src.rover.engines import run_yomitoku_with_boxes
+
+        word = Mock(content="キャッシュ", rec_score=0.9, points=[[10, 20], [60, 20], [60, 40], [10, 40]])
+        heading = Mock(role="section_headings", contents="第1章\n概要")
+        analysis = Mock(words=[word], paragraphs=[heading], figures=[])
+
+        img = Image.new("RGB", (100, 80), color=(200, 200, 200))
+        result = run_yomitoku_with_boxes(img, analysis=analysis)
+
+        mock_get_analyzer.assert_not_called()
+        assert result.success is True
+        assert result.text == "キャッシュ"
+        assert result.headings == ["第1章 概要"]
+
 
 # =============================================================================
 # T048: easyocr CLAHE適用テスト
@@ -356,3 +373,161 @@ class TestRunAllEngines:
         assert "paddleocr" in results
         assert "easyocr" in results
         assert "tesseract" not in results
+
+    def test_run_all_engines_runs_engines_concurrently(self):
+        """エンジンが並行実行され、図領域のフィルタは全エンジン終了後に適用される"""
+        import threading
+
+        from src.rover.engines import EngineResult, TextWithBox, run_all_engines
+
+        barrier = threading.Barrier(2, timeout=5)
+        inside = TextWithBox(text="図中", bbox=(10, 10, 20, 20), confidence=0.9)
+        outside = TextWithBox(text="本文", bbox=(10, 60, 20, 70), confidence=0.9)
+
+        def yomitoku(*args, **kwargs):
+            barrier.wait()
+            return EngineResult(engine="yomitoku", items=[outside], success=True, figures=[(0, 0, 50, 50)])
+
+        def paddle(*args, **kwargs):
+            barrier.wait()
+            return EngineResult(engine="paddleocr", items=[inside, outside], success=True)
+
+        img = Image.new("RGB", (100, 80), color=(200, 200, 200))
+        with (
+            patch("src.rover.engines.runners.run_yomitoku_with_boxes", side_effect=yomitoku),
+            patch("src.rover.engines.runners.run_paddleocr_with_boxes", side_effect=paddle),
+        ):
+            results = run_all_engines(img, engines=["paddleocr", "yomitoku"])
+
+        assert list(results) == ["yomitoku", "paddleocr"]
+        assert [item.text for item in results["paddleocr"].items] == ["本文"]
+
+    def test_run_all_engines_sequential(self):
+        """max_workers=1 では逐次実行される"""
+        from src.rover.engines import EngineResult, run_all_engines
+
+        img = Image.new("RGB", (100, 80), color=(200, 200, 200))
+        with (
+            patch(
+                "src.rover.engines.runners.run_paddleocr_with_boxes",
+                return_value=EngineResult(engine="paddleocr", items=[], success=True),
+            ),
+            patch(
+                "src.rover.engines.runners.run_easyocr_with_boxes",
+                return_value=EngineResult(engine="easyocr", items=[], success=True),
+            ),
+        ):
+            results = run_all_engines(img, engines=["paddleocr", "easyocr"], max_workers=1)
+
+        assert list(results) == ["paddleocr", "easyocr"]
+
+
+# =============================================================================
+# 行単位の認識のみ（検出なし）のテスト
+# =============================================================================
+
+
+class TestLineRecognition:
+    """Test recognition-only runners on Yomitoku line boxes."""
+
+    LINES = [(10, 10, 190, 40), (10, 60, 100, 80)]
+
+    @patch("src.rover.engines.line_runners._get_paddleocr_recognizer")
+    def test_paddleocr_lines_batched_in_page_coordinates(self, mock_get_recognizer):
+        """行の切り出しを同じ高さ・幅でまとめて認識し、行の座標で返す"""
+        from src.rover.engines import run_paddleocr_lines
+
+        shapes = []
+
+        def predict(crops, batch_size):
+            shapes.extend(crop.shape for crop in crops)
+            # Crops are sorted by width: the short second line comes first
+            return [{"rec_text": "短い行", "rec_score": 0.9}, {"rec_text": "長い行", "rec_score": 0.8}]
+
+        mock_get_recognizer.return_value.predict.side_effect = predict
+        img = Image.new("RGB", (200, 100), color=(255, 255, 255))
+
+        result = run_paddleocr_lines(img, self.LINES)
+
+        assert result.success is True
+        assert len(set(shapes)) == 1
+        assert shapes[0][0] == 48
+        assert [(item.text, item.bbox) for item in result.items] == [
+            ("長い行", (10, 10, 190, 40)),
+            ("短い行", (10, 60, 100, 80)),
+        ]
+
+    @patch("src.rover.engines.line_runners._get_easyocr_reader")
+    def test_easyocr_lines_skip_detection(self, mock_get_reader):
+        """EasyOCR は readtext ではなく recognize に行領域を渡す"""
+        from src.rover.engines import run_easyocr_lines
+
+        reader = mock_get_reader.return_value
+        reader.recognize.return_value = [([[10, 10], [190, 10], [190, 40], [10, 40]], "本文", 0.7)]
+        img = Image.new("RGB", (200, 100), color=(255, 255, 255))
+
+        result = run_easyocr_lines(img, self.LINES[:1], apply_preprocessing=False)
+
+        reader.readtext.assert_not_called()
+        assert reader.recognize.call_args.kwargs["horizontal_list"] == [[10, 190, 10, 40]]
+        assert [(item.text, item.bbox) for item in result.items] == [("本文", (10, 10, 190, 40))]
+
+    def test_no_lines_loads_no_model(self):
+        """行がなければモデルを読み込まない"""
+        from src.rover.engines import run_paddleocr_lines
+
+        img = Image.new("RGB", (200, 100), color=(255, 255, 255))
+        with patch("src.rover.engines.line_runners._get_paddleocr_recognizer") as mock_get_recognizer:
+            result = run_paddleocr_lines(img, [])
+
+        mock_get_recognizer.assert_not_called()
+        assert result.success is True
+        assert result.items == []
+
+    def test_run_all_engines_recognize_lines(self):
+        """recognize_lines では Yomitoku の行を副エンジンの認識器に渡す"""
+        from src.rover.engines import EngineResult, TextWithBox, run_all_engines
+
+        line = TextWithBox(text="本文", bbox=(10, 10, 190, 40), confidence=0.9)
+        yomitoku = EngineResult(engine="yomitoku", items=[line], success=True)
+        paddle = EngineResult(engine="paddleocr", items=[line], success=True)
+        img = Image.new("RGB", (200, 100), color=(255, 255, 255))
+        with (
+            patch("src.rover.engines.runners.run_yomitoku_with_boxes", return_value=yomitoku),
+            patch("src.rover.engines.runners.run_paddleocr_with_boxes") as mock_full,
+            patch("src.rover.engines.runners.run_paddleocr_lines", return_value=paddle) as mock_lines,
+        ):
+            results = run_all_engines(img, engines=["yomitoku", "paddleocr"], recognize_lines=True)
+
+        mock_full.assert_not_called()
+        assert mock_lines.call_args.args[1] == [(10, 10, 190, 40)]
+        assert list(results) == ["yomitoku", "paddleocr"]
+
+
+class TestRunAllEnginesLazyImage:
+    """Test run_all_engines on lazily opened image files."""
+
+    def test_lazy_image_decoded_once_before_threads(self, tmp_path):
+        """遅延読み込みの画像でも並行実行したエンジンが画素を正しく読める"""
+        from src.rover.engines import EngineResult, run_all_engines
+
+        rng = np.random.default_rng(0)
+        Image.fromarray(rng.integers(0, 255, (400, 300, 3), dtype=np.uint8)).save(tmp_path / "page.png")
+        expected = np.array(Image.open(tmp_path / "page.png"))
+
+        def read_pixels(engine):
+            def run(image, **kwargs):
+                ok = np.array_equal(np.array(image), expected)
+                return EngineResult(engine=engine, items=[], success=ok)
+
+            return run
+
+        for _ in range(10):
+            with (
+                Image.open(tmp_path / "page.png") as img,
+                patch("src.rover.engines.runners.run_paddleocr_with_boxes", side_effect=read_pixels("paddleocr")),
+                patch("src.rover.engines.runners.run_easyocr_with_boxes", side_effect=read_pixels("easyocr")),
+                patch("src.rover.engines.runners.run_tesseract_with_boxes", side_effect=read_pixels("tesseract")),
+            ):
+                results = run_all_engines(img, engines=["paddleocr", "easyocr", "tesseract"])
+            assert all(result.success for result in results.values())
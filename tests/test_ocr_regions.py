@@ -0,0 +1,167 @@
+"""Tests for figure-aware input regions of the secondary engines."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.rover.engines import EngineResult, EngineResultCache, TextWithBox, run_all_engines
+from src.rover.engines.regions import (
+    BAND_GAP,
+    Band,
+    crop_figure_bands,
+    figure_bands,
+    line_crops,
+    map_result_to_page,
+    prepare_figure_input,
+)
+
+FIGURE = (0, 100, 200, 300)
+
+
+def _page() -> Image.Image:
+    """白地に黒い図（y=100..300）と本文行を持つページ"""
+    img = Image.new("RGB", (200, 400), "white")
+    img.paste((0, 0, 0), (20, 120, 180, 280))
+    img.paste((50, 50, 50), (10, 20, 190, 40))
+    img.paste((50, 50, 50), (10, 340, 190, 360))
+    return img
+
+
+def _yomitoku() -> EngineResult:
+    return EngineResult(
+        engine="yomitoku",
+        items=[
+            TextWithBox(text="上の行", bbox=(10, 20, 190, 40), confidence=0.9),
+            TextWithBox(text="下の行", bbox=(10, 340, 190, 360), confidence=0.9),
+        ],
+        success=True,
+        figures=[FIGURE],
+    )
+
+
+class TestFigureBands:
+    """図の帯の切り取りと座標の復元のテスト"""
+
+    def test_figure_rows_are_cut(self):
+        """図だけの行範囲を除いた帯を返す"""
+        bands = figure_bands(400, [FIGURE])
+
+        assert bands == [Band(0, 100, 0), Band(301, 400, 100 + BAND_GAP)]
+
+    def test_rows_shared_with_text_are_kept(self):
+        """図の横に本文行がある範囲は切り取らない"""
+        bands = figure_bands(400, [FIGURE], [(0, 180, 50, 220)])
+
+        assert [(b.top, b.bottom) for b in bands] == [(0, 100), (180, 221), (301, 400)]
+
+    def test_short_figures_are_not_cut(self):
+        """低い図は切り取らず1つの帯のまま"""
+        assert figure_bands(400, [(0, 100, 200, 110)]) == [Band(0, 400, 0)]
+
+    def test_crop_removes_figure_pixels(self):
+        """切り取った画像に図の画素が残らない"""
+        cropped, bands = crop_figure_bands(_page(), [FIGURE])
+
+        assert cropped.height == 100 + BAND_GAP + 99
+        assert cropped.convert("L").getextrema()[0] > 0  # No black figure pixels
+        assert len(bands) == 2
+
+    def test_map_result_to_page(self):
+        """切り取り画像上の座標をページ座標に戻す"""
+        bands = figure_bands(400, [FIGURE])
+        result = EngineResult(
+            engine="paddleocr",
+            items=[
+                TextWithBox(text="上", bbox=(10, 20, 190, 40), confidence=0.8),
+                TextWithBox(text="下", bbox=(10, 155, 190, 175), confidence=0.8),
+            ],
+            success=True,
+        )
+
+        mapped = map_result_to_page(result, bands)
+
+        assert [item.bbox for item in mapped.items] == [(10, 20, 190, 40), (10, 340, 190, 360)]
+
+    def test_mask_keeps_coordinates(self):
+        """mask は図を白く塗り、座標変換は不要"""
+        masked, bands = prepare_figure_input(_page(), "mask", [FIGURE])
+
+        assert bands is None
+        assert masked.size == (200, 400)
+        assert masked.getpixel((100, 200)) == (255, 255, 255)
+
+    def test_unknown_mode(self):
+        """未知のモードは ValueError"""
+        with pytest.raises(ValueError):
+            prepare_figure_input(_page(), "blur", [FIGURE])
+
+
+class TestRunAllEnginesFigureMode:
+    """run_all_engines の figure_mode のテスト"""
+
+    def _run(self, mode: str, **kwargs):
+        seen: list[Image.Image] = []
+
+        def paddle(image, lang="japan"):
+            seen.append(image)
+            # Text found on the second band of the cropped image (or at page position)
+            y = 340 if image.height == 400 else 100 + BAND_GAP + 39
+            return EngineResult(
+                engine="paddleocr",
+                items=[TextWithBox(text="下の行", bbox=(10, y, 190, y + 20), confidence=0.8)],
+                success=True,
+            )
+
+        with (
+            patch("src.rover.engines.runners.run_yomitoku_with_boxes", return_value=_yomitoku()),
+            patch("src.rover.engines.runners.run_paddleocr_with_boxes", side_effect=paddle),
+        ):
+            results = run_all_engines(_page(), engines=["yomitoku", "paddleocr"], figure_mode=mode, **kwargs)
+        return results, seen
+
+    def test_filter_passes_full_page(self):
+        """filter ではページ全体をそのまま渡す"""
+        results, seen = self._run("filter")
+
+        assert seen[0].getpixel((100, 200)) == (0, 0, 0)
+        assert results["paddleocr"].items[0].bbox == (10, 340, 190, 360)
+
+    def test_crop_maps_boxes_to_page(self):
+        """crop では図を除いた画像を渡し、座標はページに戻す"""
+        results, seen = self._run("crop")
+
+        assert seen[0].height < 400
+        assert results["paddleocr"].items[0].bbox == (10, 340, 190, 360)
+        assert list(results) == ["yomitoku", "paddleocr"]
+
+    def test_crop_results_cached_by_input(self, tmp_path):
+        """crop の結果は filter とは別のキャッシュエントリになる"""
+        cache = EngineResultCache(tmp_path)
+        self._run("filter", cache=cache)
+        _, seen = self._run("crop", cache=cache)
+        _, seen_again = self._run("crop", cache=cache)
+
+        assert len(seen) == 1
+        assert seen_again == []
+
+
+class TestLineCrops:
+    """行の切り出しとバッチ化のテスト"""
+
+    def test_uniform_height_and_batch_width(self):
+        """切り出しは同じ高さで、バッチ内は同じ幅に揃える"""
+        lines = [(0, 0, 190, 20), (0, 30, 50, 40), (0, 50, 100, 60)]
+
+        batches = line_crops(_page(), lines, height=32, batch_size=2)
+
+        assert [[i for i, _ in batch] for batch in batches] == [[1, 2], [0]]
+        for batch in batches:
+            assert len({crop.size for _, crop in batch}) == 1
+            assert all(crop.height == 32 for _, crop in batch)
+
+    def test_empty_boxes_skipped(self):
+        """面積のない行は切り出さない"""
+        assert line_crops(_page(), [(10, 10, 10, 30)]) == []
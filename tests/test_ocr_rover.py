@@ -13,6 +13,7 @@ Test coverage:
 from __future__ import annotations
 
 import pytest
+from PIL import Image
 
 from src.rover.engines import EngineResult, TextWithBox
 from src.rover.ensemble import (
@@ -1380,3 +1381,340 @@ class TestRoverMergeNoDuplicates:
         for aligned in result.aligned:
             engines_present = [e for e, line_val in aligned.lines.items() if line_val is not None]
             assert len(engines_present) == 2, f"期待: 2エンジン, 実際: {engines_present}"
+
+
+# =============================================================================
+# detect-layout の Yomitoku キャッシュ再利用テスト
+# =============================================================================
+
+
+class TestCachedYomitokuAnalysis:
+    """Test reuse of yomitoku_cache/ from detect-layout."""
+
+    @staticmethod
+    def _setup(tmp_path):
+        import pickle
+        from types import SimpleNamespace
+
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        Image.new("RGB", (100, 80), color=(200, 200, 200)).save(pages_dir / "page_0001.png")
+        cache_dir = tmp_path / "layout" / "yomitoku_cache"
+        cache_dir.mkdir(parents=True)
+        analysis = SimpleNamespace(words=[], paragraphs=[], figures=[])
+        (cache_dir / "page_0001.pkl").write_bytes(pickle.dumps(analysis))
+        return pages_dir, tmp_path / "layout"
+
+    def test_load_cached_analysis(self, tmp_path):
+        """ページより新しいキャッシュを読み込む"""
+        from src.preprocessing.pages import list_pages
+        from src.rover.page_engines import load_cached_analysis
+
+        pages_dir, layout_dir = self._setup(tmp_path)
+        page = list_pages(pages_dir)[0]
+
+        assert load_cached_analysis(layout_dir, page).words == []
+
+    def test_stale_or_missing_cache_ignored(self, tmp_path):
+        """ページより古いキャッシュや存在しないキャッシュは使わない"""
+        import os
+
+        from src.preprocessing.pages import list_pages
+        from src.rover.page_engines import load_cached_analysis
+
+        pages_dir, layout_dir = self._setup(tmp_path)
+        page = list_pages(pages_dir)[0]
+        cache_file = layout_dir / "yomitoku_cache" / "page_0001.pkl"
+        mtime = page.source.stat().st_mtime_ns
+        os.utime(cache_file, ns=(mtime - 10**9, mtime - 10**9))
+
+        assert load_cached_analysis(layout_dir, page) is None
+        assert load_cached_analysis(tmp_path / "missing", page) is None
+
+    def test_cache_for_other_crop_box_ignored(self, tmp_path):
+        """仮想ページの切り出し範囲が変わったらキャッシュを使わない"""
+        import json
+
+        from src.preprocessing.pages import PageRef
+        from src.rover.page_engines import load_cached_analysis
+
+        pages_dir, layout_dir = self._setup(tmp_path)
+        source = pages_dir / "page_0001.png"
+        box_file = layout_dir / "yomitoku_cache" / "page_0001.box.json"
+        box_file.write_text(json.dumps({"box": [0, 0, 50, 80]}), encoding="utf-8")
+
+        assert load_cached_analysis(layout_dir, PageRef("page_0001.png", source, (0, 0, 50, 80))) is not None
+        assert load_cached_analysis(layout_dir, PageRef("page_0001.png", source, (0, 0, 45, 80))) is None
+        assert load_cached_analysis(layout_dir, PageRef("page_0001.png", source)) is None
+
+    def test_run_rover_batch_passes_cached_analysis(self, tmp_path):
+        """layout_dir 指定時にキャッシュを run_all_engines へ渡す"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir, layout_dir = self._setup(tmp_path)
+        result = {"yomitoku": EngineResult(engine="yomitoku", items=[], success=True)}
+        with patch("src.rover.page_engines.run_all_engines", return_value=result) as mock_run:
+            run_rover_batch(str(pages_dir), str(tmp_path / "ocr"), options=BatchOptions(layout_dir=str(layout_dir)))
+
+        assert mock_run.call_args.kwargs["yomitoku_analysis"].figures == []
+
+
+# =============================================================================
+# チェックポイントと再開 (--resume) テスト
+# =============================================================================
+
+
+class TestResumableRoverBatch:
+    """Test checkpointing and resume in run_rover_batch."""
+
+    @staticmethod
+    def _pages(tmp_path, count=3):
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        for i in range(count):
+            Image.new("RGB", (100 + i, 80), color=(200, 200, 200)).save(pages_dir / f"page_{i + 1:04d}.png")
+        return pages_dir
+
+    @staticmethod
+    def _engines(image, **kwargs):
+        item = TextWithBox(text=f"幅{image.width}", bbox=(0, 0, 10, 10), confidence=0.9)
+        return {"yomitoku": EngineResult(engine="yomitoku", items=[item], success=True)}
+
+    def test_crash_then_resume(self, tmp_path):
+        """途中で失敗しても、再開時は完了済みページを飛ばす"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.output import ROVEROutput
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = self._pages(tmp_path)
+        out = tmp_path / "ocr"
+
+        def crash_on_second(image, **kwargs):
+            if image.width == 101:
+                raise RuntimeError("engine died")
+            return self._engines(image)
+
+        with patch("src.rover.page_engines.run_all_engines", side_effect=crash_on_second):
+            with pytest.raises(RuntimeError):
+                run_rover_batch(str(pages_dir), str(out))
+        assert list(ROVEROutput(out).load_checkpoint()) == ["page_0001"]
+
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines) as mock_run:
+            results = run_rover_batch(str(pages_dir), str(out), options=BatchOptions(resume=True))
+
+        assert mock_run.call_count == 2
+        assert [name for name, _ in results] == ["page_0002", "page_0003"]
+        assert sorted(ROVEROutput(out).load_checkpoint()) == ["page_0001", "page_0002", "page_0003"]
+        assert (out / "rover" / "page_0003.txt").read_text(encoding="utf-8") == "幅102"
+        assert not list(out.rglob("*.tmp"))
+
+    def test_changed_page_is_reprocessed(self, tmp_path):
+        """入力が変わったページは再処理する"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = self._pages(tmp_path, count=2)
+        out = tmp_path / "ocr"
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines):
+            run_rover_batch(str(pages_dir), str(out))
+
+        Image.new("RGB", (150, 80), color=(200, 200, 200)).save(pages_dir / "page_0002.png")
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines) as mock_run:
+            results = run_rover_batch(str(pages_dir), str(out), options=BatchOptions(resume=True))
+
+        assert mock_run.call_count == 1
+        assert [name for name, _ in results] == ["page_0002"]
+        assert (out / "rover" / "page_0002.txt").read_text(encoding="utf-8") == "幅150"
+
+    def test_changed_engine_config_reprocesses_all_pages(self, tmp_path):
+        """エンジン設定が変わったら完了済みページも再処理する"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = self._pages(tmp_path, count=2)
+        out = tmp_path / "ocr"
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines):
+            run_rover_batch(str(pages_dir), str(out))
+
+        changed = BatchOptions(figure_mode="mask", resume=True)
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines) as mock_run:
+            results = run_rover_batch(str(pages_dir), str(out), options=changed)
+            run_rover_batch(str(pages_dir), str(out), options=changed)
+
+        assert mock_run.call_count == 2
+        assert [name for name, _ in results] == ["page_0001", "page_0002"]
+
+    def test_without_resume_all_pages_run(self, tmp_path):
+        """--resume なしでは全ページを処理する"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+
+        pages_dir = self._pages(tmp_path, count=2)
+        out = tmp_path / "ocr"
+        with patch("src.rover.page_engines.run_all_engines", side_effect=self._engines) as mock_run:
+            run_rover_batch(str(pages_dir), str(out))
+            run_rover_batch(str(pages_dir), str(out))
+
+        assert mock_run.call_count == 4
+
+    def test_pages_hashed_after_processing_without_resume(self, tmp_path):
+        """--resume なしでは処理前にハッシュを計算しない"""
+        from unittest.mock import patch
+
+        from src.preprocessing.hash import sha256_file
+        from src.rover.ensemble import run_rover_batch
+
+        pages_dir = self._pages(tmp_path, count=2)
+        calls: list[str] = []
+
+        def engines(image, **kwargs):
+            calls.append("ocr")
+            return self._engines(image)
+
+        def hash_file(path):
+            calls.append("hash")
+            return sha256_file(path)
+
+        with (
+            patch("src.rover.page_engines.run_all_engines", side_effect=engines),
+            patch("src.rover.output.sha256_file", side_effect=hash_file),
+        ):
+            run_rover_batch(str(pages_dir), str(tmp_path / "ocr"))
+
+        assert calls == ["ocr", "hash", "ocr", "hash"]
+
+    def test_shared_source_hashed_once(self, tmp_path):
+        """見開きの左右ページは元画像を1回だけハッシュする"""
+        from unittest.mock import patch
+
+        from src.preprocessing.hash import sha256_file
+        from src.preprocessing.pages import PageRef
+        from src.rover.output import page_input_hash
+
+        source = self._pages(tmp_path, count=1) / "page_0001.png"
+        left = PageRef("page_0001.png", source, (0, 0, 50, 80))
+        right = PageRef("page_0002.png", source, (50, 0, 100, 80))
+        memo: dict = {}
+
+        with patch("src.rover.output.sha256_file", side_effect=sha256_file) as mock_hash:
+            hashes = [page_input_hash(left, memo), page_input_hash(right, memo)]
+
+        assert mock_hash.call_count == 1
+        assert hashes[0] != hashes[1]
+
+
+# =============================================================================
+# 信頼度に応じた副エンジンの遅延実行テスト
+# =============================================================================
+
+
+class TestAdaptiveEngines:
+    """Test confidence-gated secondary engines (run_adaptive_engines)."""
+
+    @staticmethod
+    def _yomitoku(*confidences):
+        items = [
+            TextWithBox(text=f"{i}行目の本文です", bbox=(10, 40 + 60 * i, 190, 70 + 60 * i), confidence=conf)
+            for i, conf in enumerate(confidences)
+        ]
+        return EngineResult(engine="yomitoku", items=items, success=True)
+
+    @staticmethod
+    def _run(yomitoku):
+        from unittest.mock import patch
+
+        from src.rover.page_engines import run_adaptive_engines
+
+        seen = []
+
+        def paddle(image, lang="japan"):
+            seen.append(image)
+            # One item per stacked band, in stacked-image coordinates
+            item = TextWithBox(text="再認識", bbox=(10, 6, 190, 36), confidence=0.95)
+            return EngineResult(engine="paddleocr", items=[item], success=True)
+
+        with (
+            patch("src.rover.engines.runners.run_yomitoku_with_boxes", return_value=yomitoku),
+            patch("src.rover.engines.runners.run_paddleocr_with_boxes", side_effect=paddle),
+        ):
+            results = run_adaptive_engines(Image.new("RGB", (200, 400), "white"), engines=["yomitoku", "paddleocr"])
+        return results, seen
+
+    def test_uncertain_lines(self):
+        """信頼度の低い行とゴミ行を再認識対象にする"""
+        from src.rover.page_engines import uncertain_lines
+
+        result = self._yomitoku(0.95, 0.5, 0.9)
+        result.items.append(TextWithBox(text="ab", bbox=(0, 300, 10, 310), confidence=0.99))
+
+        assert [item.text for item in uncertain_lines(result)] == ["1行目の本文です", "ab"]
+
+    def test_clean_page_runs_yomitoku_only(self):
+        """全行の信頼度が高いページでは副エンジンを実行しない"""
+        results, seen = self._run(self._yomitoku(0.95, 0.99, 0.97))
+
+        assert seen == []
+        assert list(results) == ["yomitoku"]
+
+    def test_sparse_page_read_in_full(self):
+        """Yomitoku の検出行が少ないページは副エンジンがページ全体を読む"""
+        results, seen = self._run(self._yomitoku(0.95))
+
+        assert [image.size for image in seen] == [(200, 400)]
+        assert list(results) == ["yomitoku", "paddleocr"]
+
+    def test_uncertain_lines_cropped_and_mapped(self):
+        """信頼度の低い行だけを切り出して認識し、座標をページに戻す"""
+        results, seen = self._run(self._yomitoku(0.95, 0.5, 0.95))
+
+        assert len(seen) == 1
+        assert seen[0].height == 30 + 1 + 2 * 6
+        assert [item.bbox for item in results["paddleocr"].items] == [(10, 100, 190, 130)]
+
+    def test_rover_batch_uses_adaptive_engines(self, tmp_path):
+        """adaptive_confidence 指定時は run_adaptive_engines を使う"""
+        from unittest.mock import patch
+
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        Image.new("RGB", (100, 80), color=(200, 200, 200)).save(pages_dir / "page_0001.png")
+        result = {"yomitoku": EngineResult(engine="yomitoku", items=[], success=True)}
+        with (
+            patch("src.rover.page_engines.run_adaptive_engines", return_value=result) as mock_adaptive,
+            patch("src.rover.page_engines.run_all_engines") as mock_all,
+        ):
+            run_rover_batch(str(pages_dir), str(tmp_path / "ocr"), options=BatchOptions(adaptive_confidence=0.7))
+
+        assert mock_adaptive.call_args.kwargs["min_confidence"] == 0.7
+        mock_all.assert_not_called()
+
+    def test_uncertain_lines_recognized_without_detection(self):
+        """recognize_lines では信頼度の低い行の領域だけを認識器に渡す"""
+        from unittest.mock import patch
+
+        from src.rover.page_engines import run_adaptive_engines
+
+        paddle = EngineResult(engine="paddleocr", items=[], success=True)
+        with (
+            patch("src.rover.engines.runners.run_yomitoku_with_boxes", return_value=self._yomitoku(0.95, 0.5, 0.95)),
+            patch("src.rover.engines.runners.run_paddleocr_lines", return_value=paddle) as mock_lines,
+        ):
+            results = run_adaptive_engines(
+                Image.new("RGB", (200, 400), "white"), engines=["yomitoku", "paddleocr"], recognize_lines=True
+            )
+
+        assert mock_lines.call_args.args[1] == [(10, 100, 190, 130)]
+        assert list(results) == ["yomitoku", "paddleocr"]
@@ -0,0 +1,190 @@
+"""Tests for persistent per-engine OCR worker processes."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.preprocessing.pages import list_pages
+from src.rover.engines import EngineResult, EngineWorkerPool, TextWithBox, map_pages, plan_jobs
+
+
+def _fake_engine(name: str, image, *args, **kwargs) -> EngineResult:
+    """Return the image width and worker pid as the recognized text."""
+    item = TextWithBox(text=f"{image.width}:{os.getpid()}", bbox=(0, 0, 10, 10), confidence=0.9)
+    return EngineResult(engine=name, items=[item], success=True)
+
+
+def _page_width_and_threads(page) -> tuple[int, str | None]:
+    with page.open() as img:
+        return img.width, os.environ.get("OMP_NUM_THREADS")
+
+
+def _patched_engines():
+    return (
+        patch("src.rover.engines.runners.run_paddleocr_with_boxes", partial(_fake_engine, "paddleocr")),
+        patch("src.rover.engines.runners.run_easyocr_with_boxes", partial(_fake_engine, "easyocr")),
+    )
+
+
+def _make_pages(tmp_path, count: int):
+    for i in range(count):
+        Image.new("RGB", (100 + i, 80), color=(200, 200, 200)).save(tmp_path / f"page_{i + 1:04d}.png")
+    return list_pages(tmp_path)
+
+
+class TestEngineWorkerPool:
+    """EngineWorkerPool のテスト"""
+
+    def test_results_in_page_order(self, tmp_path):
+        """ページ順に結果を返し、エンジンごとに別プロセスで実行する"""
+        pages = _make_pages(tmp_path, 4)
+        paddle, easy = _patched_engines()
+        with paddle, easy, EngineWorkerPool(["paddleocr", "easyocr"], mp_context="fork") as pool:
+            results = list(pool.run((page, ["paddleocr", "easyocr"]) for page in pages))
+
+        assert [i for i, _ in results] == [0, 1, 2, 3]
+        for i, engine_results in results:
+            widths = {r.items[0].text.split(":")[0] for r in engine_results.values()}
+            assert widths == {str(100 + i)}
+        pids = {r.items[0].text.split(":")[1] for _, er in results for r in er.values()}
+        assert len(pids) == 2
+        assert str(os.getpid()) not in pids
+
+    def test_per_page_engine_subset(self, tmp_path):
+        """ページごとに実行するエンジンを絞れる"""
+        pages = _make_pages(tmp_path, 2)
+        paddle, easy = _patched_engines()
+        with paddle, easy, EngineWorkerPool(["paddleocr", "easyocr"], mp_context="fork") as pool:
+            results = dict(pool.run([(pages[0], ["paddleocr"]), (pages[1], ["paddleocr", "easyocr"])]))
+
+        assert list(results[0]) == ["paddleocr"]
+        assert set(results[1]) == {"paddleocr", "easyocr"}
+
+
+class TestRunRoverBatchWithWorkers:
+    """run_rover_batch の engine_workers モードのテスト"""
+
+    def test_uses_workers_and_cached_yomitoku(self, tmp_path):
+        """ワーカーで実行し、キャッシュ済み yomitoku はワーカーに送らない"""
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        pages_dir = tmp_path / "pages"
+        pages_dir.mkdir()
+        _make_pages(pages_dir, 2)
+        cache_dir = tmp_path / "layout" / "yomitoku_cache"
+        cache_dir.mkdir(parents=True)
+        for stem in ("page_0001", "page_0002"):
+            analysis = SimpleNamespace(words=[], paragraphs=[], figures=[])
+            (cache_dir / f"{stem}.pkl").write_bytes(pickle.dumps(analysis))
+
+        pools = []
+
+        def make_pool(engines, workers, **options):
+            pools.append(engines)
+            return EngineWorkerPool(engines, workers, mp_context="fork", **options)
+
+        paddle, easy = _patched_engines()
+        with paddle, easy, patch("src.rover.page_engines.EngineWorkerPool", make_pool):
+            results = run_rover_batch(
+                str(pages_dir),
+                str(tmp_path / "ocr"),
+                options=BatchOptions(layout_dir=str(tmp_path / "layout"), engine_workers=1),
+            )
+
+        assert pools == [["paddleocr", "easyocr"]]
+        assert [name for name, _ in results] == ["page_0001", "page_0002"]
+        assert (tmp_path / "ocr" / "raw" / "easyocr" / "page_0002.txt").read_text(encoding="utf-8").startswith("101:")
+
+
+class TestPageJobs:
+    """ページ単位の並列実行 (map_pages / plan_jobs) のテスト"""
+
+    def test_plan_jobs_capped_by_memory(self):
+        """エンジンセットのメモリ量でジョブ数を制限する"""
+        engines = ["yomitoku", "paddleocr", "easyocr"]  # 6 GiB per job
+        assert plan_jobs(8, engines, memory_budget_gb=20) == 3
+        assert plan_jobs(2, engines, memory_budget_gb=64) == 2
+        assert plan_jobs(4, engines, memory_budget_gb=1) == 1
+
+    def test_map_pages_in_order_with_thread_limit(self, tmp_path):
+        """ページ順に結果を返し、各プロセスのスレッド数を設定する"""
+        pages = _make_pages(tmp_path, 5)
+        results = list(map_pages(_page_width_and_threads, pages, jobs=2, threads=3, mp_context="fork"))
+
+        assert results == [(100 + i, "3") for i in range(5)]
+
+    def test_run_rover_batch_with_jobs(self, tmp_path):
+        """jobs 指定時も出力はページ順"""
+        from src.rover.ensemble import run_rover_batch
+        from src.rover.page_engines import BatchOptions
+
+        _make_pages(tmp_path, 3)
+        paddle, easy = _patched_engines()
+        with paddle, easy, patch("src.rover.ensemble.map_pages", partial(map_pages, mp_context="fork")):
+            results = run_rover_batch(
+                str(tmp_path),
+                str(tmp_path / "ocr"),
+                engines=["paddleocr", "easyocr"],
+                options=BatchOptions(jobs=2, memory_budget_gb=64),
+            )
+
+        assert [name for name, _ in results] == ["page_0001", "page_0002", "page_0003"]
+        rover = (tmp_path / "ocr" / "rover" / "page_0003.txt").read_text(encoding="utf-8")
+        assert rover.startswith("102:")
+
+
+def _flaky_engine(name: str, image, *args, **kwargs) -> EngineResult:
+    """Crash on width 101, hang on width 102, otherwise succeed."""
+    import signal
+    import time
+
+    if image.width == 101:
+        os.kill(os.getpid(), signal.SIGSEGV)
+    if image.width == 102:
+        time.sleep(60)
+    return _fake_engine(name, image)
+
+
+class TestWorkerSupervision:
+    """ワーカーのクラッシュ・タイムアウト時の挙動テスト"""
+
+    def test_crash_and_timeout_fail_only_that_page(self, tmp_path):
+        """クラッシュやタイムアウトしたページのみ失敗とし、ワーカーを再起動して続行する"""
+        pages = _make_pages(tmp_path, 4)
+        with (
+            patch("src.rover.engines.runners.run_paddleocr_with_boxes", partial(_flaky_engine, "paddleocr")),
+            EngineWorkerPool(["paddleocr"], timeout=2, warmup_timeout=0, mp_context="fork") as pool,
+        ):
+            results = dict(pool.run((page, ["paddleocr"]) for page in pages))
+            restarts = pool.restarts
+
+        assert results[0]["paddleocr"].success is True
+        assert results[1]["paddleocr"].success is False
+        assert "crashed" in results[1]["paddleocr"].error
+        assert results[2]["paddleocr"].success is False
+        assert "timed out" in results[2]["paddleocr"].error
+        assert results[3]["paddleocr"].items[0].text.startswith("103:")
+        assert restarts == 2
+
+    def test_idle_worker_death_fails_only_next_page(self, tmp_path):
+        """待機中に落ちたワーカーは次のページのみ失敗とし、再起動して続行する"""
+        pages = _make_pages(tmp_path, 2)
+        paddle, _ = _patched_engines()
+        with paddle, EngineWorkerPool(["paddleocr"], mp_context="fork") as pool:
+            worker = pool._workers[0]
+            worker.proc.kill()
+            worker.proc.join()
+            results = dict(pool.run((page, ["paddleocr"]) for page in pages))
+            restarts = pool.restarts
+
+        assert results[0]["paddleocr"].success is False
+        assert "crashed" in results[0]["paddleocr"].error
+        assert results[1]["paddleocr"].items[0].text.startswith("101:")
+        assert restarts == 1